@@ -63,7 +63,7 @@ ADDITIONAL_SIMPLE_TYPES = getattr(settings, 'DJANGO_DD_ADDITIONAL_SIMPLE_TYPES',
 # List of additional intermediate types defined as strings that do not need to be recursively inspected.
 ADDITIONAL_INTERMEDIATE_TYPES = getattr(settings, 'DJANGO_DD_ADDITIONAL_INTERMEDIATE_TYPES', [])
 # Max recursion depth to go while processing the dumped variable.
-# Deep recursion will cause DD to take forever on complex structures.
+# Deep recursion will cause DD to take forever on complex structures. See also the MAX_RENDER_* budgets.
 MAX_RECURSION_DEPTH = getattr(settings, 'DJANGO_DD_MAX_RECURSION_DEPTH', 5)
 # Max number of entries in an iterable to process further with recursion.
 # After reaching an entry beyond this length, it will just print the unique
@@ -91,3 +91,65 @@ FUNCTIONS_START_EXPANDED = getattr(settings, 'DJANGO_DD_FUNCTIONS_START_EXPANDED
 INCLUDE_PRIVATE_METHODS = getattr(settings, 'DJANGO_DD_INCLUDE_PRIVATE_MEMBERS', False)
 # Whether the output should include magic methods.
 INCLUDE_MAGIC_METHODS = getattr(settings, 'DJANGO_DD_INCLUDE_MAGIC_METHODS', False)
+# Number of classes to cache function info (params, docs, etc) for. Reused for every instance of that class.
+# Setting the value to 0 disables caching.
+MEMBER_CACHE_SIZE = getattr(settings, 'DJANGO_DD_MEMBER_CACHE_SIZE', 256)
+# Number of dump call sites (and source files, and dumped object names) to cache the dumped object name for.
+# Once reached, the least recently used entry is discarded. Setting the value to 0 disables caching.
+CALL_SITE_CACHE_SIZE = getattr(settings, 'DJANGO_DD_CALL_SITE_CACHE_SIZE', 1024)
+# Max number of dumped root objects to track uniques for, within a single render.
+# Once reached, the oldest root is discarded. A value of None means no limit.
+UNIQUE_TRACKER_SIZE = getattr(settings, 'DJANGO_DD_UNIQUE_TRACKER_SIZE', 1000)
+# Whether model instance relations should be output, even when they are not already loaded.
+# Loading a relation for output triggers a database query, so dumping many instances can trigger many queries.
+EXPAND_MODEL_RELATIONS = getattr(settings, 'DJANGO_DD_EXPAND_MODEL_RELATIONS', False)
+# Whether dump() should defer all object processing until the response is rendered.
+# Keeps dump() cheap, but objects then display as they are at render time, unless deepcopy is used.
+LAZY_DUMP = getattr(settings, 'DJANGO_DD_LAZY_DUMP', False)
+# How objects are preserved when dumped with deepcopy.
+# Either 'full' for a full deepcopy, or 'snapshot' to only copy what is output.
+DEEPCOPY_MODE = getattr(settings, 'DJANGO_DD_DEEPCOPY_MODE', 'full')
+# Depth at which dumped object contents are no longer rendered up front, and are instead fetched when expanded.
+# A value of None means all contents are rendered up front.
+LAZY_EXPAND_DEPTH = getattr(settings, 'DJANGO_DD_LAZY_EXPAND_DEPTH', None)
+# Url that lazily expanded contents are fetched from. Handled by the middleware.
+LAZY_EXPAND_URL = getattr(settings, 'DJANGO_DD_LAZY_EXPAND_URL', '/__dump_die__/expand/')
+# Max number of values kept for lazy expansion, per browser session. Once reached, the oldest values are discarded.
+LAZY_STORE_SIZE = getattr(settings, 'DJANGO_DD_LAZY_STORE_SIZE', 10000)
+# Max number of browser sessions that values are kept for lazy expansion for. Once reached, the values of the least
+# recently used session are discarded. A value of None means no limit.
+LAZY_SESSION_LIMIT = getattr(settings, 'DJANGO_DD_LAZY_SESSION_LIMIT', 100)
+# Number of seconds that values are kept for lazy expansion.
+LAZY_STORE_TTL = getattr(settings, 'DJANGO_DD_LAZY_STORE_TTL', 600)
+# Max number of values output within a single render (such as a dd page). Once reached, remaining values are
+# output as a "truncated" marker instead. A value of None means no limit.
+MAX_RENDER_NODES = getattr(settings, 'DJANGO_DD_MAX_RENDER_NODES', 100000)
+# Max total length of value output (reprs, names, docs, etc) within a single render. A value of None means no limit.
+MAX_RENDER_BYTES = getattr(settings, 'DJANGO_DD_MAX_RENDER_BYTES', 50000000)
+# Max number of milliseconds to spend within a single render. A value of None means no limit.
+MAX_RENDER_TIME = getattr(settings, 'DJANGO_DD_MAX_RENDER_TIME', 30000)
+# Max number of milliseconds an attribute (such as a property) may take to evaluate. Once exceeded, that attribute is
+# not evaluated again within the same render, and is instead loaded on click. A value of None means no limit.
+ATTRIBUTE_TIME_LIMIT = getattr(settings, 'DJANGO_DD_ATTRIBUTE_TIME_LIMIT', None)
+# List of descriptor types defined as strings (such as 'cached_property') whose attribute values are not evaluated.
+DESCRIPTOR_DENYLIST = getattr(settings, 'DJANGO_DD_DESCRIPTOR_DENYLIST', [])
+# List of descriptor types defined as strings whose attribute values are evaluated. If set, all others are not.
+DESCRIPTOR_ALLOWLIST = getattr(settings, 'DJANGO_DD_DESCRIPTOR_ALLOWLIST', None)
+# Whether attribute access is guarded at all, based on the above settings.
+ATTRIBUTE_GUARD_ENABLED = bool(
+    ATTRIBUTE_TIME_LIMIT is not None or DESCRIPTOR_DENYLIST or DESCRIPTOR_ALLOWLIST is not None
+)
+# Where dump() writes output to, when called outside of a request (such as from management commands or tasks).
+# Either 'stderr', 'logger' (the "django_dump_die" logger), or None to discard the dump.
+CONSOLE_OUTPUT = getattr(settings, 'DJANGO_DD_CONSOLE_OUTPUT', 'stderr')
+# Whether console output is colored. A value of None means only when stderr is a terminal.
+CONSOLE_COLORS = getattr(settings, 'DJANGO_DD_CONSOLE_COLORS', None)
+# Whether dump() also sends a JSON record of each dumped object to the "django_dump_die" logger.
+# Applies even when DEBUG is False.
+LOG_DUMPS = getattr(settings, 'DJANGO_DD_LOG_DUMPS', False)
+# Fraction of dumps (between 0 and 1) to log, when logging dumps.
+LOG_SAMPLE_RATE = getattr(settings, 'DJANGO_DD_LOG_SAMPLE_RATE', 1.0)
+# Max number of characters of each logged dump record.
+LOG_MAX_SIZE = getattr(settings, 'DJANGO_DD_LOG_MAX_SIZE', 10000)
+# Max number of logged dump records waiting to be output. Once reached, further records are dropped.
+LOG_QUEUE_SIZE = getattr(settings, 'DJANGO_DD_LOG_QUEUE_SIZE', 1000)
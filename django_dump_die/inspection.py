@@ -0,0 +1,323 @@
+"""Inspection pass for DumpDie.
+
+Walks a dumped object once and produces a compact tree of nodes, recording what should be displayed for each value.
+Output renderers then consume this tree, without needing to walk or inspect the original object again.
+"""
+
+# Internal Imports.
+from django_dump_die.templatetags.dump_die import dump_object, ensure_render_scope
+
+
+class DumpedObject:
+    """Single dump()/dd() call. Holds dump location info and the root node of the dumped object."""
+    __slots__ = ('filename', 'linenumber', 'name', 'function_doc', 'node')
+
+    def __init__(self, filename, linenumber, name, function_doc, node):
+        self.filename = filename
+        self.linenumber = linenumber
+        self.name = name
+        self.function_doc = function_doc
+        self.node = node
+
+
+class DumpNode:
+    """Single displayed value within a dumped object.
+
+    There are four node kinds:
+      * simple - Direct value output only. Uses ``css_class`` and ``value``.
+      * complex - Expandable object, with ``attributes`` and ``functions`` children.
+        Deferred objects have a ``lazy_token`` instead, and their children are built once expanded.
+      * skipped - Already output elsewhere, or past max depth/iteration thresholds. See ``skipped_reason``.
+      * unevaluated - Attribute that was not evaluated. Uses ``value`` for the elapsed milliseconds (if known),
+        ``skipped_reason`` for the responsible setting, and ``lazy_token`` to load the attribute with.
+    """
+    __slots__ = (
+        'kind',
+        'type',
+        'unique',
+        'root_count',
+        'css_class',
+        'value',
+        'intermediate',
+        'sql',
+        'query_note',
+        'braces',
+        'length',
+        'depth',
+        'attributes',
+        'functions',
+        'skipped_reason',
+        'lazy_token',
+    )
+
+    SIMPLE = 'simple'
+    COMPLEX = 'complex'
+    SKIPPED = 'skipped'
+    UNEVALUATED = 'unevaluated'
+
+    def __init__(
+        self,
+        kind,
+        obj_type,
+        unique='',
+        root_count='',
+        css_class='',
+        value=None,
+        intermediate=None,
+        sql=None,
+        query_note=None,
+        braces='',
+        length=None,
+        depth=0,
+        attributes=None,
+        functions=None,
+        skipped_reason=None,
+        lazy_token=None,
+    ):
+        self.kind = kind
+        self.type = obj_type
+        self.unique = unique
+        self.root_count = root_count
+        self.css_class = css_class
+        self.value = value
+        self.intermediate = intermediate
+        self.sql = sql
+        self.query_note = query_note
+        self.braces = braces
+        self.length = length
+        self.depth = depth
+        self.attributes = attributes
+        self.functions = functions
+        self.skipped_reason = skipped_reason
+        self.lazy_token = lazy_token
+
+    def __repr__(self):
+        return f'<DumpNode {self.kind} {self.type} {self.unique}{self.root_count}>'
+
+
+class DumpAttribute:
+    """Single attribute entry (attribute, index, key, etc) of a complex node."""
+    __slots__ = ('name', 'access_modifier', 'css_class', 'title', 'node')
+
+    def __init__(self, name, access_modifier, css_class, title, node):
+        self.name = name
+        self.access_modifier = access_modifier
+        self.css_class = css_class
+        self.title = title
+        self.node = node
+
+
+class DumpFunction:
+    """Single function entry of a complex node."""
+    __slots__ = ('name', 'params', 'doc', 'access_modifier')
+
+    def __init__(self, name, params, doc, access_modifier):
+        self.name = name
+        self.params = params
+        self.doc = doc
+        self.access_modifier = access_modifier
+
+
+def build_dump_trees(objects):
+    """Build node trees for a list of dumped object info tuples.
+
+    :param objects: List of object info tuples, as returned by ``get_dumped_object_info()``.
+    :return: List of DumpedObject instances, in the same order.
+    """
+    # All objects share unique tracking, so that repeat dumps are still distinguished.
+    with ensure_render_scope():
+        return [build_dump_tree(object_info) for object_info in objects]
+
+
+def build_dump_tree(object_info):
+    """Build the node tree for a single dumped object info tuple.
+
+    :param object_info: Object info tuple, as returned by ``get_dumped_object_info()``.
+    :return: DumpedObject instance. Dumped functions have no node, only function docs.
+    """
+    (
+        filename, linenumber, obj_name, obj, function_doc, root_index_start, root_index_end, original_obj,
+    ) = object_info
+
+    node = None
+    if not function_doc:
+        with ensure_render_scope():
+            node = _build_node(obj, obj, None, 0, 0, root_index_start, root_index_end, original_obj, False)
+
+    return DumpedObject(filename, linenumber, obj_name, function_doc, node)
+
+
+def build_context_node(context):
+    """Build the node for an already determined ``dump_object()`` context, and all of its displayed children.
+
+    Used to build the contents of deferred objects, once expanded.
+
+    :param context: Context dict, as returned by ``dump_object()``.
+    """
+    node, children = _build_context_node(context)
+    with ensure_render_scope():
+        for dump_object_args, attribute in children:
+            attribute.node = _build_node(*dump_object_args)
+    return node
+
+
+def _build_node(*dump_object_args):
+    """Build the node for a single value, and all of its displayed children.
+
+    Walks children with an explicit work stack instead of recursion, so that deep objects never get close to the
+    interpreter recursion limit. Children are still visited in the same (depth-first) order as the templates.
+
+    :param dump_object_args: Positional arguments for ``dump_object()``, for the value to build.
+    """
+    # Placeholder attribute to hold the final root node.
+    root = DumpAttribute(None, None, None, None, None)
+
+    # Each stack entry is the dump_object() args for a value, and the attribute to attach the built node to.
+    stack = [(dump_object_args, root)]
+    while stack:
+        args, attribute = stack.pop()
+        attribute.node, children = _build_single_node(*args)
+
+        # Add in reverse, so that children are popped (and processed) in display order.
+        stack.extend(reversed(children))
+
+    return root.node
+
+
+def _build_single_node(
+    obj,
+    root_obj,
+    skip_set,
+    current_iteration,
+    current_depth,
+    root_index_start,
+    root_index_end,
+    original_obj,
+    parent_is_intermediate,
+):
+    """Build the node for a single value, without building any of its children.
+
+    :return: Tuple of (node, children). Children is a list of (dump_object args, attribute) pairs, where each
+        attribute is already attached to the node, but still needs its child node built.
+    """
+    return _build_context_node(dump_object(
+        obj,
+        root_obj,
+        skip_set,
+        current_iteration,
+        current_depth,
+        root_index_start,
+        root_index_end,
+        original_obj,
+        parent_is_intermediate,
+    ))
+
+
+def _build_context_node(context):
+    """Build the node for an already determined ``dump_object()`` context, without building any of its children.
+
+    :return: Tuple of (node, children), the same as ``_build_single_node()``.
+    """
+    # Handle simple output.
+    if context.get('simple'):
+        return DumpNode(
+            DumpNode.SIMPLE,
+            context['type'],
+            css_class=context['css_class'],
+            value=context['simple'],
+        ), []
+
+    # Handle attributes that were not evaluated.
+    if context.get('unevaluated'):
+        return DumpNode(
+            DumpNode.UNEVALUATED,
+            context['type'],
+            value=context['elapsed'],
+            skipped_reason=context['setting'],
+            lazy_token=context['load_token'],
+        ), []
+
+    # Handle already processed or past thresholds.
+    if context.get('object') is None:
+        return DumpNode(
+            DumpNode.SKIPPED,
+            context.get('type', ''),
+            unique=context.get('unique', ''),
+            root_count=context.get('root_count', ''),
+            intermediate=context.get('intermediate'),
+            skipped_reason=context.get('skipped_reason'),
+        ), []
+
+    # Handle complex (and intermediate) output.
+    length = None
+    sql = None
+    query_note = None
+    query_info = context.get('query')
+    if query_info:
+        # Queries only fetch displayed rows, so use the separately counted total.
+        length = '?' if query_info['total'] is None else query_info['total']
+        sql = query_info['sql']
+        query_note = query_info.get('note')
+    elif context['is_iterable'] or context.get('is_dict'):
+        length = _length(context['object'])
+
+    node = DumpNode(
+        DumpNode.COMPLEX,
+        context['type'],
+        unique=context['unique'],
+        root_count=context['root_count'],
+        intermediate=context.get('intermediate'),
+        sql=sql,
+        query_note=query_note,
+        braces=context['braces'],
+        length=length,
+        depth=context['depth'],
+        lazy_token=context.get('lazy_token'),
+    )
+
+    children = []
+    if context['include_attributes']:
+        node.attributes = []
+        new_depth = context['depth'] + 1
+        for index, (attr, value, access_modifier, css_class, title) in enumerate(context['attributes']):
+
+            # Determine child iteration values, the same as the attributes template.
+            if context.get('intermediate'):
+                child_iteration, child_parent_is_intermediate = 0, True
+            elif context['is_iterable']:
+                child_iteration, child_parent_is_intermediate = index, False
+            else:
+                child_iteration, child_parent_is_intermediate = 0, False
+
+            attribute = DumpAttribute(attr, access_modifier, css_class, title, None)
+            node.attributes.append(attribute)
+            children.append((
+                (
+                    value,
+                    context['root_obj'],
+                    context['skip'],
+                    child_iteration,
+                    new_depth,
+                    context['root_index_start'],
+                    context['root_index_end'],
+                    context['original_obj'],
+                    child_parent_is_intermediate,
+                ),
+                attribute,
+            ))
+
+    if context['include_functions']:
+        node.functions = [
+            DumpFunction(attr, params, doc, access_modifier)
+            for attr, params, doc, access_modifier in context['functions']
+        ]
+
+    return node, children
+
+
+def _length(obj):
+    """Return the length of an object, the same way the template ``length`` filter does."""
+    try:
+        return len(obj)
+    except (ValueError, TypeError):
+        return 0
@@ -0,0 +1,90 @@
+"""Short-lived storage for lazily expanded dump output.
+
+When lazy expansion is enabled, dumped values past the lazy expansion depth are only output as a collapsed header.
+The value is kept here under a random token, until the browser requests its contents (or it expires).
+
+Values are stored separately per browser session, and only in the memory of the current process. Both the values of
+each session and the number of sessions are limited, so memory use stays bounded however many browsers connect.
+"""
+
+# System Imports.
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+# Internal Imports.
+from django_dump_die.constants import LAZY_SESSION_LIMIT, LAZY_STORE_SIZE, LAZY_STORE_TTL
+
+
+# Cookie used to identify the browser session that lazily expanded values belong to.
+LAZY_SESSION_COOKIE = 'django_dd_lazy_session'
+
+# Stores lazily expanded values for each browser session, in order of least recently used session.
+# Each session is an OrderedDict of token to (expiry time, value), in order of addition.
+lazy_value_store = OrderedDict()
+_store_lock = threading.Lock()
+
+
+def new_lazy_session():
+    """Generate a new, random, browser session key."""
+    return secrets.token_urlsafe(16)
+
+
+def add_lazy_value(session_key, value):
+    """Store a value for later expansion.
+
+    :param session_key: Browser session the value belongs to.
+    :param value: Value to store.
+    :return: Random token to later retrieve the value with.
+    """
+    token = secrets.token_urlsafe(16)
+    now = time.monotonic()
+
+    with _store_lock:
+        _prune_expired(now)
+
+        session_values = lazy_value_store.get(session_key)
+        if session_values is None:
+            # Discard the least recently used sessions, to make room for the new one.
+            if LAZY_SESSION_LIMIT is not None:
+                while lazy_value_store and len(lazy_value_store) >= LAZY_SESSION_LIMIT:
+                    lazy_value_store.popitem(last=False)
+            session_values = lazy_value_store[session_key] = OrderedDict()
+        else:
+            lazy_value_store.move_to_end(session_key)
+
+        if LAZY_STORE_SIZE is not None:
+            while session_values and len(session_values) >= LAZY_STORE_SIZE:
+                session_values.popitem(last=False)
+        session_values[token] = (now + LAZY_STORE_TTL, value)
+
+    return token
+
+
+def get_lazy_value(session_key, token):
+    """Get a stored value. Returns None if the value does not exist, has expired, or is for another session."""
+    now = time.monotonic()
+
+    with _store_lock:
+        _prune_expired(now)
+
+        session_values = lazy_value_store.get(session_key)
+        if session_values is None:
+            return None
+        lazy_value_store.move_to_end(session_key)
+        entry = session_values.get(token)
+
+    if entry is None or entry[0] < now:
+        return None
+    return entry[1]
+
+
+def _prune_expired(now):
+    """Discard all expired values. Values are stored in order of expiry, so only the oldest of each are checked."""
+    for session_key in list(lazy_value_store):
+        session_values = lazy_value_store[session_key]
+        while session_values and next(iter(session_values.values()))[0] < now:
+            session_values.popitem(last=False)
+        if not session_values:
+            del lazy_value_store[session_key]
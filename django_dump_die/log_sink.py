@@ -0,0 +1,174 @@
+"""Structured logging sink for DumpDie.
+
+Sends dumped objects to the "django_dump_die" logger, as compact JSON records. Only a snapshot of each dumped object is
+taken when dumped, so the record shows the object as it was at that point. Snapshots are then serialized (within a
+render budget sized to fit the record) and passed to the log handlers on a background listener thread, so the dumping
+(request) thread never waits on serialization or handler output.
+"""
+
+# System Imports.
+import atexit
+import json
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# Internal Imports.
+from django_dump_die.constants import LOG_MAX_SIZE, LOG_QUEUE_SIZE, MAX_RENDER_NODES, MAX_RENDER_TIME
+from django_dump_die.renderers import json_dump_objects
+from django_dump_die.templatetags.dump_die import RenderBudget, RenderState, add_snapshot_unique_map, render_scope
+from django_dump_die.utils import LazyObjectInfo, resolve_object_info, snapshot_object
+
+
+logger = logging.getLogger('django_dump_die')
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records once the queue is full, rather than blocking or raising an error.
+
+    Records are queued as-is, without being formatted, so that dumped objects are serialized on the listener thread.
+    """
+
+    def __init__(self, record_queue):
+        super().__init__(record_queue)
+        self.dropped_count = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped_count += 1
+
+
+class DumpRecordHandler(logging.Handler):
+    """Handler that runs on the listener thread.
+
+    Serializes the dumped object of each queued record, then passes the record on to the handlers of the logger.
+    """
+
+    def emit(self, record):
+        try:
+            record.msg = serialize_dump(record.msg, record.snapshot_memo)
+        except Exception:
+            # Dumped object could not be output, so log why instead, rather than stopping the listener thread.
+            logger.exception('Failed to serialize dumped object for logging.')
+            return
+        finally:
+            # No longer needed, so do not hold onto the snapshot while the record is output.
+            record.snapshot_memo = None
+
+        logger.handle(record)
+
+
+class DumpListener:
+    """Listener thread that passes queued records on to the logger. Started on first use."""
+    __slots__ = ('listener', 'lock')
+
+    def __init__(self):
+        self.listener = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        """Start the listener thread, if not already running."""
+        if self.listener is not None:
+            return
+        with self.lock:
+            if self.listener is None:
+                self.listener = QueueListener(dump_record_queue, DumpRecordHandler())
+                self.listener.start()
+
+    def stop(self):
+        """Stop the listener thread, once all queued records have been logged. Restarted on next use."""
+        with self.lock:
+            if self.listener is not None:
+                self.listener.stop()
+                self.listener = None
+
+
+# Log records of dumped object snapshots, waiting to be serialized and logged on the listener thread.
+# Bounded, so that records are dropped rather than piling up if the log handlers fall behind.
+dump_record_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+dump_queue_handler = DroppingQueueHandler(dump_record_queue)
+dump_listener = DumpListener()
+
+
+def log_dump(object_info):
+    """Take a snapshot of a dumped object, and queue it to be logged. Serialized later, on the listener thread.
+
+    Does nothing if the logger does not output INFO records.
+
+    :param object_info: Object info, as returned by ``get_lazy_dumped_object_info()``.
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
+    # Snapshots only copy what is output, so cost stays bounded by the output limits, without rendering anything.
+    snapshot_memo = {}
+    snapshot = snapshot_object(object_info.obj, object_info.start_index, object_info.end_index, snapshot_memo)
+    object_info = LazyObjectInfo(
+        object_info.call_site,
+        snapshot,
+        object_info.start_index,
+        object_info.end_index,
+        object_info.obj,
+    )
+
+    call_site = object_info.call_site
+    record = logger.makeRecord(
+        logger.name,
+        logging.INFO,
+        call_site.f_code.co_filename,
+        call_site.f_lineno,
+        object_info,
+        None,
+        None,
+        func=call_site.f_code.co_name,
+        extra={'snapshot_memo': snapshot_memo},
+    )
+
+    dump_listener.start()
+    dump_queue_handler.handle(record)
+
+
+def serialize_dump(object_info, snapshot_memo=None):
+    """Serialize a dumped object to a compact JSON string, of no more than DJANGO_DD_LOG_MAX_SIZE characters.
+
+    Values are output the same as the JSON output format, but with a render budget sized to fit the record.
+
+    :param object_info: Object info, as returned by ``get_lazy_dumped_object_info()``.
+    :param snapshot_memo: Memo filled in by ``snapshot_object()``, if the object is a snapshot. Used to output the
+        uniques of the original object, without reading it again.
+    """
+    object_info = resolve_object_info(object_info)
+
+    render_state = RenderState()
+    render_state.budget = RenderBudget(MAX_RENDER_NODES, LOG_MAX_SIZE, MAX_RENDER_TIME)
+    with render_scope(render_state):
+        if snapshot_memo is not None:
+            add_snapshot_unique_map(object_info[3], snapshot_memo)
+        data = json_dump_objects([object_info])[0]
+    if render_state.budget.truncated_count:
+        data['truncated_count'] = render_state.budget.truncated_count
+
+    message = json.dumps(data, separators=(',', ':'))
+
+    # The budget only counts output values, not the JSON structure around them.
+    # If the record still does not fit, fall back to only the type of the dumped object.
+    if len(message) > LOG_MAX_SIZE and 'value' in data:
+        data['value'] = {'type': data['value']['type'], 'skipped': 'truncated'}
+        message = json.dumps(data, separators=(',', ':'))
+
+    return message
+
+
+def stop_dump_listener():
+    """Stop the listener thread, once all queued records have been logged. Restarted on next use."""
+    dump_listener.stop()
+
+
+# Log any records still queued when the process exits.
+atexit.register(stop_dump_listener)
@@ -3,18 +3,47 @@ Middleware for DumpAndDie.
 """
 
 # System Imports.
+import inspect
 import logging
+import random
+import sys
+from contextvars import ContextVar
 
 # Third-Party Imports.
+from asgiref import sync as asgiref_sync
+from asgiref.sync import sync_to_async
 from django.conf import settings
 
 # Internal Imports.
-from .views import dd_view
-from django_dump_die.utils import get_dumped_object_info
+from .views import dd_expand_view, dd_view
+from django_dump_die.constants import (
+    ATTRIBUTE_GUARD_ENABLED,
+    CONSOLE_COLORS,
+    CONSOLE_OUTPUT,
+    LAZY_DUMP,
+    LAZY_EXPAND_DEPTH,
+    LAZY_EXPAND_URL,
+    LOG_DUMPS,
+    LOG_SAMPLE_RATE,
+)
+from django_dump_die.log_sink import log_dump
+from django_dump_die.renderers import render_text_objects
+from django_dump_die.templatetags.dump_die import render_scope
+from django_dump_die.utils import get_dumped_object_info, get_lazy_dumped_object_info
 
 
 logger = logging.getLogger('django_dump_die')
-dump_objects = []
+
+# Django only calls the middleware asynchronously if it's marked as a coroutine function.
+# Older asgiref versions (used by Django 4.1 and below) can't mark objects, but Python 3.12 and later can.
+# If neither can, the middleware is sync only, and Django adapts async requests through it instead.
+COROUTINE_MODULE = asgiref_sync if hasattr(asgiref_sync, 'markcoroutinefunction') else inspect
+iscoroutinefunction = COROUTINE_MODULE.iscoroutinefunction
+markcoroutinefunction = getattr(COROUTINE_MODULE, 'markcoroutinefunction', None)
+
+# Objects dumped so far, scoped to the current request.
+# Each request (thread or async task) gets its own list, set by the middleware, so no locking is needed.
+dump_objects_var = ContextVar('django_dump_die_dump_objects', default=None)
 
 
 class DumpAndDie(Exception):
@@ -27,6 +56,14 @@ class DumpAndDie(Exception):
         self.object = obj
 
 
+def get_dump_objects():
+    """Get the list of objects dumped so far, for the current request.
+
+    Outside of a request (such as when the middleware is not processing), returns None.
+    """
+    return dump_objects_var.get()
+
+
 def dd(obj, index_range=None, deepcopy=False):
     """
     Immediately return debug template with info about objects.
@@ -51,31 +88,85 @@ def dump(obj, index_range=None, deepcopy=False):
 
     Does nothing if DEBUG != True
 
-    NOTE: Not thread safe, this will collect objects server wide,
-    dumped objects can come from multiple requests.
+    Dumped objects are collected per request, so concurrent requests never see each other's dumps.
+    Outside of a request (such as in management commands), the dump is instead output immediately as text.
+    See DJANGO_DD_CONSOLE_OUTPUT.
+
+    If DJANGO_DD_LAZY_DUMP is set, object processing is deferred until the response is rendered.
+
+    If DJANGO_DD_LOG_DUMPS is set, a sample of dumps are also logged, regardless of DEBUG.
     """
 
+    # Queue the dump for logging. A snapshot is taken before returning, so never needs copying.
+    if LOG_DUMPS and random.random() < LOG_SAMPLE_RATE:
+        try:
+            log_dump(get_lazy_dumped_object_info(obj, index_range, False))
+        except Exception:
+            # Logging applies regardless of DEBUG, so must never break the dumping code.
+            logger.exception('Failed to log dumped object.')
+
     if settings.DEBUG:
+        dump_objects = get_dump_objects()
+
+        # Outside of a request, output immediately, rather than holding onto the object.
+        if dump_objects is None:
+            if CONSOLE_OUTPUT is not None:
+                # Object is output before returning, so never needs copying.
+                write_console_dump(get_dumped_object_info(obj, index_range, False))
+            return
 
         # Get the object info
-        object_info = get_dumped_object_info(obj, index_range, deepcopy)
+        if LAZY_DUMP:
+            object_info = get_lazy_dumped_object_info(obj, index_range, deepcopy)
+        else:
+            object_info = get_dumped_object_info(obj, index_range, deepcopy)
 
         # Run dd core logic.
         dump_objects.append(object_info)
 
 
+def write_console_dump(object_info):
+    """Write a dumped object as text, to the output set by DJANGO_DD_CONSOLE_OUTPUT."""
+    if CONSOLE_OUTPUT not in ('stderr', 'logger'):
+        raise ValueError(f"Unknown DJANGO_DD_CONSOLE_OUTPUT value '{CONSOLE_OUTPUT}'. Must be 'stderr' or 'logger'.")
+
+    # Logs are often written to files, so are never colored.
+    colorize = False
+    if CONSOLE_OUTPUT == 'stderr':
+        colorize = sys.stderr.isatty() if CONSOLE_COLORS is None else CONSOLE_COLORS
+
+    # Each dump is output separately, so gets its own unique tracking.
+    with render_scope():
+        output = render_text_objects([object_info], colorize)
+
+    if CONSOLE_OUTPUT == 'logger':
+        logger.info('%s', output)
+    else:
+        sys.stderr.write(f'{output}\n')
+
+
 class DumpAndDieMiddleware:
     """
     DumpAndDie Middleware.
 
     Allows access to php/laravel-like function dd().
+
+    Supports both sync and async request handling where the installed versions allow it,
+    so that Django doesn't need to adapt requests through it.
     """
+    sync_capable = True
+    async_capable = markcoroutinefunction is not None
+
     def __init__(self, get_response):
         """
         Add our dd() and dump() commands to be universally accessible.
         """
         self.get_response = get_response
 
+        # Handle requests asynchronously if the rest of the middleware chain is async.
+        if self.async_capable and iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
         # Add global dd() function.
         __builtins__['dd'] = dd
         # Add global dump() function.
@@ -86,31 +177,82 @@ class DumpAndDieMiddleware:
         Return standard response if nothing dumped.
         Otherwise return dump view.
         """
-        # Get the response
-        response = self.get_response(request)
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        # Output contents of deferred dumped objects, when expanded on the dd page.
+        if self.is_lazy_expand_request(request):
+            return dd_expand_view(request)
+
+        # Give this request its own list of dumped objects.
+        dump_objects = []
+        token = dump_objects_var.set(dump_objects)
+        try:
+            # Get the response
+            response = self.get_response(request)
+        finally:
+            dump_objects_var.reset(token)
 
         # If there are no items in the dump_objects list or there is no exception raised
         if not dump_objects or getattr(request, 'has_exception', False):
             return response
         else:
-            # Create a copy of the list, and clear it.
-            objects = dump_objects[:]
-            dump_objects.clear()
+            # Return the dd view to dump the items in the dump_objects list.
+            return dd_view(request, dump_objects)
+
+    async def __acall__(self, request):
+        """
+        Async version of __call__().
+        Return standard response if nothing dumped.
+        Otherwise return dump view, rendered in a thread so that the event loop is not blocked.
+        """
+        # Output contents of deferred dumped objects, when expanded on the dd page.
+        if self.is_lazy_expand_request(request):
+            return await sync_to_async(dd_expand_view)(request)
 
+        # Give this request its own list of dumped objects.
+        dump_objects = []
+        token = dump_objects_var.set(dump_objects)
+        try:
+            # Get the response
+            response = await self.get_response(request)
+        finally:
+            dump_objects_var.reset(token)
+
+        # If there are no items in the dump_objects list or there is no exception raised
+        if not dump_objects or getattr(request, 'has_exception', False):
+            return response
+        else:
             # Return the dd view to dump the items in the dump_objects list.
-            return dd_view(request, objects)
+            return await sync_to_async(dd_view)(request, dump_objects)
+
+    @staticmethod
+    def is_lazy_expand_request(request):
+        """Check if request is to expand a deferred dumped object, or load an unevaluated attribute.
+
+        See DJANGO_DD_LAZY_EXPAND_DEPTH and DJANGO_DD_ATTRIBUTE_TIME_LIMIT.
+        """
+        return (
+            settings.DEBUG
+            and (LAZY_EXPAND_DEPTH is not None or ATTRIBUTE_GUARD_ENABLED)
+            and request.path_info == LAZY_EXPAND_URL
+        )
 
     def process_exception(self, request, exception):
         """
         Check if exception is of DumpAndDie type.
         If so, return Debug Response.
         If not, ignore and allow standard exception handling.
+
+        Django always calls this synchronously (in a thread, for async requests), so the dd view never blocks the
+        event loop.
         """
         if not isinstance(exception, DumpAndDie):
             request.has_exception = True
             return None
 
         # Create a copy of the list, and clear it.
+        dump_objects = get_dump_objects() or []
         objects = dump_objects[:]
         objects.append(exception.object)
         dump_objects.clear()
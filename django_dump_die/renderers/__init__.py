@@ -0,0 +1,5 @@
+"""Alternative (non-template) output renderers for DumpDie."""
+
+from .html import render_complex_children, render_dump_context, render_dump_objects, render_dump_trees
+from .json import json_dump_objects, json_dump_trees
+from .text import render_text_objects, render_text_trees
@@ -0,0 +1,344 @@
+"""Pure-Python HTML renderer for DumpDie.
+
+Produces the same markup and css classes as the ``output_types`` and ``partials`` templates, but writes everything
+into a single buffer. Avoids a template load and context push for every node of the dumped object.
+"""
+
+# Third-Party Imports.
+from django.utils.html import conditional_escape, linebreaks
+from django.utils.safestring import mark_safe
+
+# Internal Imports.
+from django_dump_die.constants import MULTILINE_FUNCTION_DOCS
+from django_dump_die.inspection import DumpNode, build_context_node, build_dump_trees
+from django_dump_die.templatetags.dump_die import get_collapsable_values
+
+
+def render_dump_objects(objects):
+    """Inspect and render a list of dumped object info tuples to HTML.
+
+    :param objects: List of object info tuples, as returned by ``get_dumped_object_info()``.
+    :return: Safe HTML string.
+    """
+    return render_dump_trees(build_dump_trees(objects))
+
+
+def render_dump_trees(dumped_objects):
+    """Render already built node trees to HTML.
+
+    Python equivalent of the ``_dump_objects.html`` template.
+
+    :param dumped_objects: List of DumpedObject instances, as returned by ``build_dump_trees()``.
+    :return: Safe HTML string.
+    """
+    output = []
+    collapsable = get_collapsable_values()
+
+    for index, dumped_object in enumerate(dumped_objects):
+
+        # If it is not the first object, add a horizontal line to separate.
+        if index > 0:
+            output.append('<hr>')
+
+        output.append('\n<div class="dump-wrapper">\n')
+        if dumped_object.filename and dumped_object.linenumber:
+            output.append(
+                f'<span title="Dumped From Location" class="location">File: {_e(dumped_object.filename)}, '
+                f'Line: {_e(dumped_object.linenumber)}</span><br>\n'
+            )
+
+        # If dumped object has function_docs, assume function. Otherwise object.
+        if dumped_object.function_doc:
+            if dumped_object.name is not None:
+                output.append('<span class="dumped_function" title="Dumped Function">\n')
+                _write_object_name(output, dumped_object.name)
+                output.append('\n</span>:\n')
+            else:
+                output.append('<span class="empty" title="Dumped Function">Unknown Function</span>:\n')
+            output.append(f'<span class="docs">{_e(dumped_object.function_doc)}</span>\n')
+
+        else:
+            if dumped_object.name is not None:
+                output.append('<span class="dumped_object" title="Dumped Object">\n')
+                _write_object_name(output, dumped_object.name)
+                output.append('\n</span>:\n')
+            else:
+                output.append('<span class="empty" title="Dumped Object">Unknown Object</span>:\n')
+            _write_node(output, dumped_object.node, collapsable)
+
+        output.append('</div>\n')
+
+    return mark_safe(''.join(output))
+
+
+def render_complex_children(context):
+    """Render the contents (attributes and functions) of a complex object to HTML.
+
+    Python equivalent of the ``_complex_children.html`` template. Used to output deferred objects, once expanded.
+
+    :param context: Context dict for the object, as returned by ``dump_object()``.
+    :return: Safe HTML string.
+    """
+    collapsable = get_collapsable_values()
+    node = build_context_node(context)
+
+    parts = []
+    _write_complex_children(parts, node, f'{_e(node.unique)}{_e(node.root_count)}', collapsable)
+
+    output = []
+    _write_parts(output, parts, collapsable)
+    return mark_safe(''.join(output))
+
+
+def render_dump_context(context):
+    """Render a single value to HTML.
+
+    Python equivalent of the ``_dump_object.html`` template. Used to output attributes that were not evaluated, once
+    loaded.
+
+    :param context: Context dict for the value, as returned by ``dump_object()``.
+    :return: Safe HTML string.
+    """
+    output = []
+    _write_node(output, build_context_node(context), get_collapsable_values())
+    return mark_safe(''.join(output))
+
+
+def _e(value):
+    """Escape a value for output, the same way template variable output does."""
+    return conditional_escape(value)
+
+
+def _write_object_name(output, obj_name):
+    """Write the (possibly colorized) parts of a dumped object name."""
+    for entry in obj_name:
+        output.append(f'<span class="{_e(entry["css_class"])}">{_e(entry["value"])}</span>')
+
+
+def _write_node(output, node, collapsable):
+    """Write a node, and all of its children."""
+    _write_parts(output, [node], collapsable)
+
+
+def _write_parts(output, parts, collapsable):
+    """Write a list of output parts, expanding any nodes into output.
+
+    Uses an explicit work stack instead of recursion. Each stack entry is either a string of finished output, or a
+    child node that still needs expanding into output.
+    """
+    stack = list(reversed(parts))
+    while stack:
+        part = stack.pop()
+        if isinstance(part, DumpNode):
+            parts = []
+            _write_single_node(parts, part, collapsable)
+            # Add in reverse, so that parts are popped in output order.
+            stack.extend(reversed(parts))
+        else:
+            output.append(part)
+
+
+def _write_single_node(parts, node, collapsable):
+    """Write a single node. Python equivalent of the ``_dump_object.html`` template.
+
+    Child nodes are added to parts as-is, for the caller to expand.
+    """
+    parts.append('\n')
+    if node.kind == DumpNode.SIMPLE:
+        _write_simple_type(parts, node)
+    elif node.kind == DumpNode.UNEVALUATED:
+        _write_unevaluated_attribute(parts, node)
+    elif node.kind == DumpNode.COMPLEX:
+        _write_complex_type(parts, node, collapsable)
+    else:
+        _write_skipped_object(parts, node)
+    parts.append('\n')
+
+
+def _write_simple_type(output, node):
+    """Python equivalent of the ``simple_type.html`` template."""
+    output.append(
+        f'<span class="type" title="{_e(node.type)}">{_e(node.type)}</span> '
+        f'<code class="{_e(node.css_class)}">{_e(node.value)}</code>'
+    )
+
+
+def _write_unevaluated_attribute(output, node):
+    """Python equivalent of the ``unevaluated_attribute.html`` template."""
+    obj_type = _e(node.type)
+
+    output.append(
+        '<span class="unevaluated">\n'
+        f'<span class="type" title="{obj_type}">{obj_type}</span>\n'
+        '<a class="load-attribute"'
+    )
+    if node.lazy_token:
+        output.append(f' data-load-token="{_e(node.lazy_token)}"')
+    output.append(f' title="Not evaluated, due to {_e(node.skipped_reason)}.')
+    if node.lazy_token:
+        output.append(' Click to load.')
+    output.append('">\n<span class="empty">not evaluated')
+    if node.value is not None:
+        output.append(f' ({_e(node.value)} ms)')
+    output.append('</span>\n</a>\n</span>')
+
+
+def _write_skipped_object(output, node):
+    """Python equivalent of the ``skipped_object.html`` template, and the repeat reference of ``_dump_object.html``."""
+    obj_type = _e(node.type)
+    unique = _e(node.unique)
+
+    if node.skipped_reason == 'repeat':
+        full_unique = f'{unique}{_e(node.root_count)}'
+        output.append(f'<span class="type" title="{obj_type}">{obj_type}</span>\n')
+        if node.intermediate:
+            output.append(f'<code class="datetime">{_e(node.intermediate)}</code>\n')
+        output.append(
+            f'<a class="reference" href="#" data-reference="{full_unique}" title="Already output. Click to go to it">\n'
+            f'<span class="unique" data-highlight-unique="{unique}">{full_unique}</span>\n'
+            '</a>'
+        )
+        return
+
+    if node.skipped_reason == 'truncated':
+        output.append(
+            f'<span class="type" title="{obj_type}">{obj_type}</span>\n'
+            '<span class="empty" title="Not output, as the render budget was used up">Truncated</span>'
+        )
+        return
+
+    output.append(f'<span class="type" title="{obj_type}">{obj_type}</span>\n')
+    if node.intermediate:
+        output.append(f'<code class="datetime">{_e(node.intermediate)}</code>\n')
+    output.append(
+        '<span class="braces"></span>\n'
+        '<a title="Already output or skipped object">\n'
+        f'<span class="unique" data-highlight-unique="{unique}">{unique}{_e(node.root_count)}</span>\n'
+        '</a>\n'
+        '<span class="braces"></span>'
+    )
+
+
+def _write_complex_type(output, node, collapsable):
+    """Python equivalent of the ``complex_type.html`` template."""
+    obj_type = _e(node.type)
+    unique = _e(node.unique)
+    full_unique = f'{unique}{_e(node.root_count)}'
+    content_collapsable = collapsable['content']
+
+    type_text = obj_type
+    if node.length is not None:
+        type_text += f':{node.length}'
+
+    output.append(f'<span class="type" title="{obj_type}">{type_text}</span>\n')
+    if node.intermediate:
+        output.append(f'<code class="intermediate">{_e(node.intermediate)}</code>\n')
+    if node.sql:
+        output.append(f'<code class="intermediate" title="Generated SQL">{_e(node.sql)}</code>\n')
+    if node.query_note:
+        output.append(
+            '<span class="empty" title="Displayed rows differ from the requested index range">'
+            f'{_e(node.query_note)}</span>\n'
+        )
+    output.append(
+        f'<span class="braces">{_e(node.braces[0])}</span>\n'
+        f'<a class="arrow-toggle {content_collapsable["class"]}" title="[Ctrl+click] Expand all children"'
+        f' data-toggle="collapse" data-target=".{full_unique}" data-dd-type="type"'
+        f' data-object-depth="{node.depth + 1}" aria-label="Close"'
+        f' aria-expanded="{content_collapsable["aria"]}" >\n'
+        f'<span class="unique" data-highlight-unique="{unique}">{full_unique}</span>\n'
+        f'<span id="arrow-{full_unique}" class="arrow arrow-{full_unique}">\n{content_collapsable["arrow"]}\n</span>\n'
+        '</a>\n'
+        f'<div class="dd-wrapper collapse {full_unique} {content_collapsable["show"]}" data-unique="{full_unique}"'
+    )
+    if node.lazy_token:
+        output.append(f' data-lazy-token="{_e(node.lazy_token)}"')
+    output.append(' >\n')
+    _write_complex_children(output, node, full_unique, collapsable)
+    output.append(f'</div>\n<span class="braces">{_e(node.braces[1])}</span>')
+
+
+def _write_complex_children(output, node, full_unique, collapsable):
+    """Python equivalent of the ``_complex_children.html`` template."""
+    output.append('<ul class="attribute-list">\n')
+    if node.attributes is not None:
+        _write_attributes(output, node, full_unique, collapsable)
+    output.append('</ul>\n<ul class="attribute-list">\n')
+    if node.functions is not None:
+        _write_functions(output, node, full_unique, collapsable)
+    output.append('</ul>\n')
+
+
+def _write_attributes(output, node, full_unique, collapsable):
+    """Python equivalent of the ``_attributes.html`` template."""
+    attr_collapsable = collapsable['attribute']
+
+    output.append(f'<a class="arrow-toggle {attr_collapsable["class"]}" title="[Ctrl+click] Expand all children"\n')
+    if attr_collapsable['always_show'] == 'false':
+        output.append('data-toggle="collapse"\n')
+    output.append(
+        f'data-target=".{full_unique}-attributes" data-dd-type="attr" aria-label="Open/Close"'
+        f' aria-expanded="{attr_collapsable["aria"]}" >\n'
+        '<span class="section_name">Attributes</span>\n'
+        f'<span id="arrow-{full_unique}-attributes" class="arrow">\n{attr_collapsable["arrow"]}\n</span>\n'
+        '</a>\n'
+        f'<div class="li-wrapper collapse {full_unique}-attributes {attr_collapsable["show"]}"'
+        f' data-unique-attributes="{full_unique}-attributes" >\n'
+    )
+
+    for attribute in node.attributes:
+        output.append('<li>\n')
+        if attribute.access_modifier:
+            output.append(f'<span class="access-modifier">{_e(attribute.access_modifier)}</span>\n')
+        if attribute.name:
+            output.append(
+                f'<span class="{_e(attribute.css_class)}" title="{_e(attribute.title)}">{_e(attribute.name)}</span>:\n'
+            )
+        output.append(attribute.node)
+        output.append('</li>\n')
+
+    if not node.attributes:
+        output.append('<span class="empty" title="No Attributes">No Attributes</span>\n')
+    output.append('</div>\n')
+
+
+def _write_functions(output, node, full_unique, collapsable):
+    """Python equivalent of the ``_functions.html`` template."""
+    func_collapsable = collapsable['function']
+
+    output.append(f'<a class="arrow-toggle {func_collapsable["class"]}" title="[Ctrl+click] Expand all children"\n')
+    # NOTE: Mirrors the template, which keys function toggling off of the attribute section setting.
+    if collapsable['attribute']['always_show'] == 'false':
+        output.append('data-toggle="collapse"\n')
+    output.append(
+        f'data-target=".{full_unique}-functions" data-dd-type="func" aria-label="Open/Close"'
+        f' aria-expanded="{func_collapsable["aria"]}" >\n'
+        '<span class="section_name">Functions</span>\n'
+        f'<span id="arrow-{full_unique}-functions" class="arrow">\n{func_collapsable["arrow"]}\n</span>\n'
+        '</a>\n'
+        f'<div class="li-wrapper collapse {full_unique}-functions {func_collapsable["show"]}"'
+        f' data-unique-functions="{full_unique}-functions" >\n'
+    )
+
+    for function in node.functions:
+        output.append('<li class="function-li">\n')
+        if function.access_modifier:
+            output.append(f'<span class="access-modifier">{_e(function.access_modifier)}</span>\n')
+        output.append(
+            '<span class="function" title="Function">\n'
+            f'{_e(function.name)}<span class="braces">(</span><span class="params">{_e(function.params)}</span>'
+            '<span class="braces">)</span>\n'
+            '</span>:\n'
+        )
+        if function.doc:
+            if MULTILINE_FUNCTION_DOCS:
+                output.append(f'<span class="docs indent-docs">{linebreaks(function.doc, autoescape=True)}</span>\n')
+            else:
+                output.append(f'<span class="docs">{_e(function.doc)}</span>\n')
+        else:
+            output.append('<span class="empty">No Documentation</span>\n')
+        output.append('</li>\n')
+
+    if not node.functions:
+        output.append('<span class="empty" title="No Functions">No Functions</span>\n')
+    output.append('</div>\n')
@@ -0,0 +1,108 @@
+"""JSON renderer for DumpDie.
+
+Converts the node trees built by the inspection pass into plain (JSON serializable) dicts and lists. Uses the same
+traversal, limits, uniques and root counts as HTML output, but never touches the template engine.
+"""
+
+# Internal Imports.
+from django_dump_die.inspection import DumpNode, build_dump_trees
+
+
+def json_dump_objects(objects):
+    """Inspect a list of dumped object info tuples, and convert them to JSON serializable data.
+
+    :param objects: List of object info tuples, as returned by ``get_dumped_object_info()``.
+    :return: List of dicts, one per dumped object.
+    """
+    return json_dump_trees(build_dump_trees(objects))
+
+
+def json_dump_trees(dumped_objects):
+    """Convert already built node trees to JSON serializable data.
+
+    :param dumped_objects: List of DumpedObject instances, as returned by ``build_dump_trees()``.
+    :return: List of dicts, one per dumped object.
+    """
+    output = []
+    for dumped_object in dumped_objects:
+        name = None
+        if dumped_object.name is not None:
+            name = ''.join(str(entry['value']) for entry in dumped_object.name)
+
+        data = {'name': name}
+        if dumped_object.filename and dumped_object.linenumber:
+            data['filename'] = dumped_object.filename
+            data['linenumber'] = dumped_object.linenumber
+
+        # If dumped object has function_docs, assume function. Otherwise object.
+        if dumped_object.function_doc:
+            data['function_doc'] = dumped_object.function_doc
+        else:
+            data['value'] = _json_node(dumped_object.node)
+
+        output.append(data)
+
+    return output
+
+
+def _json_node(node):
+    """Convert a node, and all of its children, to a dict.
+
+    Uses an explicit work stack instead of recursion, the same as the inspection pass.
+    """
+    root = {}
+    stack = [(node, root)]
+    while stack:
+        node, data = stack.pop()
+        data['type'] = node.type
+
+        # Handle simple output.
+        if node.kind == DumpNode.SIMPLE:
+            data['value'] = node.value
+
+        # Handle attributes that were not evaluated.
+        elif node.kind == DumpNode.UNEVALUATED:
+            data['unevaluated'] = node.skipped_reason
+            if node.value is not None:
+                data['elapsed'] = node.value
+
+        # Handle already processed or past thresholds.
+        elif node.kind == DumpNode.SKIPPED:
+            if node.unique:
+                data['unique'] = f'{node.unique}{node.root_count}'
+            if node.intermediate:
+                data['intermediate'] = node.intermediate
+            data['skipped'] = node.skipped_reason
+
+        # Handle complex (and intermediate) output.
+        else:
+            data['unique'] = f'{node.unique}{node.root_count}'
+            if node.length is not None:
+                data['length'] = node.length
+            if node.intermediate:
+                data['intermediate'] = node.intermediate
+            if node.sql:
+                data['sql'] = node.sql
+            if node.query_note:
+                data['query_note'] = node.query_note
+
+            if node.attributes is not None:
+                data['attributes'] = []
+                for attribute in node.attributes:
+                    child = {}
+                    entry = {'name': attribute.name}
+                    if attribute.access_modifier:
+                        entry['access_modifier'] = attribute.access_modifier
+                    entry['value'] = child
+                    data['attributes'].append(entry)
+                    stack.append((attribute.node, child))
+
+            if node.functions is not None:
+                data['functions'] = []
+                for function in node.functions:
+                    entry = {'name': function.name, 'params': function.params, 'doc': function.doc}
+                    if function.access_modifier:
+                        entry['access_modifier'] = function.access_modifier
+                    data['functions'].append(entry)
+
+    return root
@@ -0,0 +1,179 @@
+"""Plain-text (and ANSI colored) renderer for DumpDie.
+
+Writes dumped objects as indented trees, for output to a console or log, such as when dumping from management commands
+or background tasks. Uses the same inspection pass, limits and css classes as HTML output.
+"""
+
+# Internal Imports.
+from django_dump_die.inspection import DumpNode, build_dump_trees
+
+
+# Colors for each css class, matching the default (dark) theme of dd.css.
+CLASS_COLORS = {
+    'access-modifier': '#657b83',
+    'attribute': '#93a1a1',
+    'bool': '#b58900',
+    'bound': '#268bd2',
+    'braces': '#839496',
+    'constant': '#cb4b16',
+    'default': '#586e75',
+    'docs': '#586e75',
+    'dumped_name': '#93a1a1',
+    'empty': '#dc322f',
+    'function': '#268bd2',
+    'index': '#d33682',
+    'intermediate': '#d33682',
+    'key': '#2aa198',
+    'location': '#586e75',
+    'module': '#268bd2',
+    'none': '#b58900',
+    'number': '#d33682',
+    'params': '#93a1a1',
+    'section_name': '#586e75',
+    'string': '#2aa198',
+    'type': '#859900',
+    'unique': '#6c71c4',
+}
+
+# Number of spaces to indent each level of children by.
+INDENT = '    '
+
+
+def render_text_objects(objects, colorize=False):
+    """Inspect and render a list of dumped object info tuples to text.
+
+    :param objects: List of object info tuples, as returned by ``get_dumped_object_info()``.
+    :param colorize: Whether to color output with ANSI escape codes.
+    :return: Text string, with one line per displayed value.
+    """
+    return render_text_trees(build_dump_trees(objects), colorize)
+
+
+def render_text_trees(dumped_objects, colorize=False):
+    """Render already built node trees to text.
+
+    :param dumped_objects: List of DumpedObject instances, as returned by ``build_dump_trees()``.
+    :param colorize: Whether to color output with ANSI escape codes.
+    :return: Text string, with one line per displayed value.
+    """
+    c = _colorizer(colorize)
+    lines = []
+
+    for dumped_object in dumped_objects:
+        if dumped_object.filename and dumped_object.linenumber:
+            lines.append(c('location', f'File: {dumped_object.filename}, Line: {dumped_object.linenumber}'))
+
+        if dumped_object.name is not None:
+            name = ''.join(c(entry['css_class'], entry['value']) for entry in dumped_object.name)
+        elif dumped_object.function_doc:
+            name = c('empty', 'Unknown Function')
+        else:
+            name = c('empty', 'Unknown Object')
+
+        # If dumped object has function_docs, assume function. Otherwise object.
+        if dumped_object.function_doc:
+            lines.append(f'{name}: {c("docs", _single_line(dumped_object.function_doc))}')
+        else:
+            _write_node(lines, f'{name}: ', dumped_object.node, c)
+
+    return '\n'.join(lines)
+
+
+def _colorizer(colorize):
+    """Get a function to color text by css class. Does nothing if not colorizing."""
+    if not colorize:
+        return lambda css_class, text: str(text)
+
+    escape_codes = {}
+    for css_class, color in CLASS_COLORS.items():
+        red, green, blue = (int(color[index:index + 2], 16) for index in (1, 3, 5))
+        escape_codes[css_class] = f'\033[38;2;{red};{green};{blue}m'
+
+    def c(css_class, text):
+        escape_code = escape_codes.get(css_class)
+        if escape_code is None:
+            return str(text)
+        return f'{escape_code}{text}\033[0m'
+
+    return c
+
+
+def _single_line(text):
+    """Collapse all whitespace runs, so that multiline text (such as docs) fits on a single line."""
+    return ' '.join(str(text).split())
+
+
+def _write_node(lines, prefix, node, c):
+    """Write a node, and all of its children, as indented lines.
+
+    Uses an explicit work stack instead of recursion. Each stack entry is either a finished line, or a
+    (line prefix, node, indent) tuple for a child node that still needs writing.
+    """
+    stack = [(prefix, node, '')]
+    while stack:
+        entry = stack.pop()
+        if isinstance(entry, str):
+            lines.append(entry)
+            continue
+
+        prefix, node, indent = entry
+        parts = []
+        _write_single_node(parts, prefix, node, indent, c)
+        # Add in reverse, so that parts are popped in output order.
+        stack.extend(reversed(parts))
+
+
+def _write_single_node(parts, prefix, node, indent, c):
+    """Write a single node. Child nodes are added to parts as (line prefix, node, indent) tuples."""
+    obj_type = c('type', node.type)
+
+    # Handle simple output.
+    if node.kind == DumpNode.SIMPLE:
+        parts.append(f'{indent}{prefix}{obj_type} {c(node.css_class, node.value)}')
+
+    # Handle attributes that were not evaluated.
+    elif node.kind == DumpNode.UNEVALUATED:
+        elapsed = '' if node.value is None else f' ({node.value} ms)'
+        parts.append(f'{indent}{prefix}{obj_type} {c("empty", f"not evaluated{elapsed}")}')
+
+    # Handle already processed or past thresholds.
+    elif node.kind == DumpNode.SKIPPED:
+        if node.skipped_reason == 'truncated':
+            parts.append(f'{indent}{prefix}{obj_type} {c("empty", "Truncated")}')
+        else:
+            intermediate = f' {c("intermediate", node.intermediate)}' if node.intermediate else ''
+            parts.append(f'{indent}{prefix}{obj_type}{intermediate} {c("unique", f"{node.unique}{node.root_count}")}')
+
+    # Handle complex (and intermediate) output.
+    else:
+        type_text = node.type if node.length is None else f'{node.type}:{node.length}'
+        line = f'{indent}{prefix}{c("type", type_text)}'
+        if node.intermediate:
+            line += f' {c("intermediate", node.intermediate)}'
+        if node.sql:
+            line += f' {c("intermediate", node.sql)}'
+        if node.query_note:
+            line += f' {c("empty", node.query_note)}'
+        parts.append(f'{line} {c("braces", node.braces[0])} {c("unique", f"{node.unique}{node.root_count}")}')
+
+        child_indent = indent + INDENT
+        for attribute in node.attributes or ():
+            child_prefix = ''
+            if attribute.access_modifier:
+                child_prefix += f'{c("access-modifier", attribute.access_modifier)} '
+            if attribute.name:
+                child_prefix += f'{c(attribute.css_class, attribute.name)}: '
+            parts.append((child_prefix, attribute.node, child_indent))
+        if node.functions:
+            parts.append(f'{child_indent}{c("section_name", "Functions")}:')
+            for function in node.functions:
+                access_modifier = ''
+                if function.access_modifier:
+                    access_modifier = f'{c("access-modifier", function.access_modifier)} '
+                doc = c('docs', _single_line(function.doc)) if function.doc else c('empty', 'No Documentation')
+                parts.append(
+                    f'{child_indent}{INDENT}{access_modifier}{c("function", function.name)}'
+                    f'({c("params", function.params)}): {doc}'
+                )
+
+        parts.append(f'{indent}{c("braces", node.braces[1])}')
@@ -11,54 +11,95 @@ const djangoDumpDie = {
      * or even appears twice via another dumped object it will highlight.
      */
     setUpUniqueDupHighlighting: () => {
-        // Var for all uniques.
-        let allUniques = [];
-        // Get all uniques from page via jQuery.
-        const allUniquesJQ = $('.unique');
-        // Convert JQ uniques to array of unique text.
-        allUniquesJQ.each(function(index) {
-            allUniques.push($(this).data('highlight-unique'));
+        // Group all unique elements on the page by their unique, in a single pass.
+        const uniqueGroups = new Map();
+        $('.unique').each(function() {
+            const unique = $(this).data('highlight-unique');
+            if (! uniqueGroups.has(unique)) {
+                uniqueGroups.set(unique, []);
+            }
+            uniqueGroups.get(unique).push(this);
         });
 
-        // Function to find duplicates inside our dataset.
-        const toFindDuplicates = arry => arry.filter((item, index) => arry.indexOf(item) !== index);
-
-        // Find the duplicates and save to separate array.
-        const dupUniques = toFindDuplicates(allUniques);
+        // Get original background color.
+        const origBackgroundColor = $('body').css('background-color');
 
         // Iterate through all Uniques found.
-        allUniquesJQ.each(function(index) {
+        uniqueGroups.forEach((elements, unique) => {
 
             // Check if Unique has one or more instances.
             // If so, set a class identifier on all matching elements which match said Unique.
-            if (dupUniques.includes($(this).data('highlight-unique'))) {
-
-                // Create the css class to identify Unique group.
-                var cssClass = 'duplicate-' + $(this).data('highlight-unique');
-
-                // Add the css class to the element.
-                $(this).addClass(cssClass);
-
-                // Append a period to the cssClass for jQuery.
-                cssClass = '.'+cssClass;
-
-                // Get original foreground and background color.
-                var origForegroundColor = $(cssClass).css('color');
-                var origBackgroundColor = $('body').css('background-color');
-
-                // On ALL elements with the class, on hover, swap the colors.
-                $(cssClass).hover(function() {
-                    // Swap colors.
-                    $(cssClass).css('color', origBackgroundColor);
-                    $(cssClass).css('background-color', origForegroundColor);
-                }, function() {
-                    // onMouseOut restore colors.
-                    $(cssClass).css('color', "");
-                    $(cssClass).css('background-color', "");
-                });
+            if (elements.length < 2) {
+                return;
+            }
+            const group = $(elements);
+            group.addClass('duplicate-' + unique);
+
+            // Get original foreground color.
+            const origForegroundColor = group.css('color');
+
+            // On ALL elements of the Unique, on hover, swap the colors.
+            // Existing hover handling is removed first, as this is re-run when lazily loaded content is added.
+            group.off('mouseenter mouseleave');
+            group.hover(function() {
+                // Swap colors.
+                group.css('color', origBackgroundColor);
+                group.css('background-color', origForegroundColor);
+            }, function() {
+                // onMouseOut restore colors.
+                group.css('color', "");
+                group.css('background-color', "");
+            });
+        });
+    },
+
+
+    /**
+     * Set up references to objects that were already output within the same dumped object.
+     * Shows how many times each object is referenced, and clicking a reference goes to the original output.
+     */
+    setUpReferences: () => {
+        djangoDumpDie.updateReferenceCounts();
 
+        // Delegated, so that it also applies to lazily loaded content.
+        $(document).on('click', 'a.reference', function(event) {
+            event.preventDefault();
+
+            const reference = $(this).attr('data-reference');
+            const toggle = $('.arrow-toggle[data-target=".' + reference + '"]').first();
+            if (! toggle.length) {
+                return;
             }
 
+            // Expand all collapsed parents of the original output, so that it is visible.
+            toggle.parents('.dd-wrapper, .li-wrapper').not('.show').each(function() {
+                $(this).addClass('show');
+                $(this).siblings('.arrow-toggle').find('.arrow').html('▼');
+            });
+
+            // Scroll to the original output, and briefly outline it.
+            toggle[0].scrollIntoView({block: 'center'});
+            toggle.addClass('reference-target');
+            setTimeout(() => toggle.removeClass('reference-target'), 1500);
+        });
+    },
+
+    /**
+     * Show the number of references to each object, next to its original output.
+     * Re-run when lazily loaded content is added.
+     */
+    updateReferenceCounts: () => {
+        const counts = new Map();
+        $('a.reference').each(function() {
+            const reference = $(this).attr('data-reference');
+            counts.set(reference, (counts.get(reference) || 0) + 1);
+        });
+
+        $('.reference-count').remove();
+        counts.forEach((count, reference) => {
+            const toggle = $('.arrow-toggle[data-target=".' + reference + '"]').first();
+            const text = count === 1 ? '1 reference' : count + ' references';
+            toggle.after($('<span class="section_name reference-count" title="Number of later references">').text(text));
         });
     },
 
@@ -69,8 +110,9 @@ const djangoDumpDie = {
      * expanded.
      */
     setUpCTRLClickFunctionality: () => {
-        // Set up click listener on an arrow-toggle
-        $('.arrow-toggle').click(function(event) {
+        // Set up click listener on an arrow-toggle.
+        // Delegated, so that it also applies to lazily loaded content.
+        $(document).on('click', '.arrow-toggle', function(event) {
 
             // Check if CTRL key was pressed.
             if (event.ctrlKey) {
@@ -101,6 +143,8 @@ const djangoDumpDie = {
                     childDivs.addClass('show');
                     // Change the arrow to the open state.
                     childArrows.html('▼');
+                    // Load any lazily expanded children, also expanding all of their children.
+                    djangoDumpDie.loadLazyContents(childDivs.filter('[data-lazy-token]'), true);
                 }
 
                 // Handle if any child elements have value of "always-show".
@@ -128,21 +172,23 @@ const djangoDumpDie = {
      * is triggered to also update the arrow so that it is displayed correctly.
      */
     setUpArrowUpdating: () => {
+        // NOTE: Event handling is delegated, so that it also applies to lazily loaded content.
+
         // Update arrow on show.
-        $('.dd-wrapper').on('show.bs.collapse', function(event) {
+        $(document).on('show.bs.collapse', '.dd-wrapper', function(event) {
             unique = $(event.target).data('unique');
             arrow_element = $('.arrow-' + unique);
             $(arrow_element).html('▼');
         });
         // Update arrow on hide.
-        $('.dd-wrapper').on('hide.bs.collapse', function(event) {
+        $(document).on('hide.bs.collapse', '.dd-wrapper', function(event) {
             unique = $(event.target).data('unique');
             arrow_element = $('.arrow-' + unique);
             $(arrow_element).html('▶');
         });
 
         // Update arrow on show attributes header.
-        $('.dd-wrapper').on('show.bs.collapse', function(event) {
+        $(document).on('show.bs.collapse', '.dd-wrapper', function(event) {
             if (! $(event.target).hasClass('always-show') ) {
                 unique = $(event.target).data('unique-attributes');
                 arrow_element = $('.arrow-' + unique);
@@ -150,7 +196,7 @@ const djangoDumpDie = {
             }
         });
         // Update arrow on hide attributes header.
-        $('.dd-wrapper').on('hide.bs.collapse', function(event) {
+        $(document).on('hide.bs.collapse', '.dd-wrapper', function(event) {
             if (! $(event.target).hasClass('always-show') ) {
                 unique = $(event.target).data('unique-attributes');
                 arrow_element = $('.arrow-' + unique);
@@ -159,7 +205,7 @@ const djangoDumpDie = {
         });
 
         // Update arrow on show functions header.
-        $('.dd-wrapper').on('show.bs.collapse', function(event) {
+        $(document).on('show.bs.collapse', '.dd-wrapper', function(event) {
             if (! $(event.target).hasClass('always-show') ) {
                 unique = $(event.target).data('unique-functions');
                 arrow_element = $('#arrow-' + unique);
@@ -167,7 +213,7 @@ const djangoDumpDie = {
             }
         });
         // Update arrow on hide functions header.
-        $('.dd-wrapper').on('hide.bs.collapse', function(event) {
+        $(document).on('hide.bs.collapse', '.dd-wrapper', function(event) {
             if (! $(event.target).hasClass('always-show') ) {
                 unique = $(event.target).data('unique-functions');
                 arrow_element = $('#arrow-' + unique);
@@ -176,6 +222,97 @@ const djangoDumpDie = {
         });
     },
 
+    /**
+     * Set up fetching the contents of lazily expanded objects, when they are first expanded.
+     * Only applies when DJANGO_DD_LAZY_EXPAND_DEPTH is set.
+     */
+    setUpLazyExpansion: () => {
+        if (! $('body').data('lazy-expand-url')) {
+            return;
+        }
+
+        // Load contents when a lazily expanded object is first expanded.
+        $(document).on('show.bs.collapse', '.dd-wrapper[data-lazy-token]', function(event) {
+            if (event.target === this) {
+                djangoDumpDie.loadLazyContents($(this));
+            }
+        });
+
+        // Load contents of any lazily expanded objects that start expanded.
+        djangoDumpDie.loadLazyContents($('.dd-wrapper.show[data-lazy-token]'));
+    },
+
+    /**
+     * Set up loading attributes that were not evaluated, when clicked.
+     * Only applies when DJANGO_DD_ATTRIBUTE_TIME_LIMIT or the DJANGO_DD_DESCRIPTOR_* lists are set.
+     */
+    setUpAttributeLoading: () => {
+        const expandUrl = $('body').data('lazy-expand-url');
+        if (! expandUrl) {
+            return;
+        }
+
+        $(document).on('click', '.load-attribute[data-load-token]', function(event) {
+            event.preventDefault();
+
+            // Each attribute is only fetched once. Its token is removed as soon as the fetch starts.
+            const link = $(this);
+            const token = link.attr('data-load-token');
+            link.removeAttr('data-load-token');
+            link.find('.empty').text('loading...');
+
+            fetch(expandUrl + '?token=' + encodeURIComponent(token), {credentials: 'same-origin'})
+                .then(response => response.ok ? response.text() : Promise.reject(response.status))
+                .then(html => {
+                    link.closest('.unevaluated').replaceWith(html);
+
+                    // Update highlighting and reference counts to include the loaded uniques.
+                    djangoDumpDie.setUpUniqueDupHighlighting();
+                    djangoDumpDie.updateReferenceCounts();
+                })
+                .catch(() => {
+                    link.find('.empty').text('Expired. Reload page to view.');
+                });
+        });
+    },
+
+    /**
+     * Fetch and insert the contents of lazily expanded objects.
+     * Each object is only fetched once. Its token is removed as soon as the fetch starts.
+     */
+    loadLazyContents: (wrappers, expandChildren = false) => {
+        const expandUrl = $('body').data('lazy-expand-url');
+
+        $(wrappers).each(function() {
+            const wrapper = $(this);
+            const token = wrapper.attr('data-lazy-token');
+            wrapper.removeAttr('data-lazy-token');
+
+            fetch(expandUrl + '?token=' + encodeURIComponent(token), {credentials: 'same-origin'})
+                .then(response => response.ok ? response.text() : Promise.reject(response.status))
+                .then(html => {
+                    wrapper.html(html);
+
+                    // If expanding all children (such as from a CTRL click), also expand the loaded content.
+                    if (expandChildren) {
+                        wrapper.find('.dd-wrapper, .li-wrapper').addClass('show');
+                        wrapper.find('.arrow').html('▼');
+                        wrapper.find('.always-show .arrow').html('');
+                    }
+
+                    // Update highlighting and reference counts to include the loaded uniques.
+                    djangoDumpDie.setUpUniqueDupHighlighting();
+                    djangoDumpDie.updateReferenceCounts();
+
+                    // Load contents of any further lazily expanded objects that are already expanded.
+                    djangoDumpDie.loadLazyContents(wrapper.find('.dd-wrapper.show[data-lazy-token]'), expandChildren);
+                })
+                .catch(() => {
+                    wrapper.html('<span class="empty" title="Object is no longer available">Expired. Reload page to view.</span>');
+                });
+        });
+    },
+
     /**
      * Add handling for UtilityToolbar logic, such as button click events, etc.
      */
@@ -403,5 +540,11 @@ $(document).ready(function() {
     djangoDumpDie.setUpArrowUpdating();
     // Set up toolbar handling.
     djangoDumpDie.setUpUtilityToolbar();
+    // Set up lazy expansion.
+    djangoDumpDie.setUpLazyExpansion();
+    // Set up loading of unevaluated attributes.
+    djangoDumpDie.setUpAttributeLoading();
+    // Set up references to already output objects.
+    djangoDumpDie.setUpReferences();
 
 });
@@ -3,22 +3,31 @@
 # System Imports.
 import inspect
 import re
+import threading
+import time
 import traceback
 import types
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
 from decimal import Decimal
 
 # Third-Party Imports.
 from django import template
+from django.template.loader import render_to_string
 from django.forms.boundfield import BoundField
 
 # Internal Imports.
 from django_dump_die.constants import (
-    SIMPLE_TYPES,
-    INTERMEDIATE_TYPES,
-    ADDITIONAL_SIMPLE_TYPES,
-    ADDITIONAL_INTERMEDIATE_TYPES,
+    ATTRIBUTE_GUARD_ENABLED,
+    ATTRIBUTE_TIME_LIMIT,
+    DESCRIPTOR_ALLOWLIST,
+    DESCRIPTOR_DENYLIST,
     MAX_RECURSION_DEPTH,
     MAX_ITERABLE_LENGTH,
+    MAX_RENDER_BYTES,
+    MAX_RENDER_NODES,
+    MAX_RENDER_TIME,
     MULTILINE_FUNCTION_DOCS,
     CONTENT_STARTS_EXPANDED,
     ATTRIBUTES_START_EXPANDED,
@@ -27,15 +36,22 @@ from django_dump_die.constants import (
     INCLUDE_MAGIC_METHODS,
     INCLUDE_ATTRIBUTES,
     INCLUDE_FUNCTIONS,
+    MEMBER_CACHE_SIZE,
+    UNIQUE_TRACKER_SIZE,
     PYTZ_PRESENT,
 )
+from django_dump_die.lazy_expansion import add_lazy_value
 from django_dump_die.utils import (
+    AttributeGuard,
+    UnevaluatedAttribute,
     get_dumped_object_info,
     generate_unique_from_obj,
-    get_members,
     get_class_name,
+    process_index_range,
+    get_members,
     get_callable_params,
     get_obj_type,
+    get_type_category,
     safe_repr,
     safe_str,
     is_iterable,
@@ -46,6 +62,8 @@ from django_dump_die.utils import (
     is_number,
     is_private,
     is_magic,
+    TYPE_SIMPLE,
+    TYPE_INTERMEDIATE,
 )
 
 # Imports that may not be accessible, depending on local python environment setup.
@@ -58,9 +76,14 @@ register = template.Library()
 
 # region Module Variables
 
-# Stores the uniques for each dumped root object.
-repeat_iteration_tracker = {}
-deepcopy_unique_map = {}
+# Sentinel for deepcopied members with no matching original member.
+_NO_MATCH = object()
+
+# Unique tracking state for the current render. Set by render_scope().
+render_state_var = ContextVar('django_dump_die_render_state', default=None)
+
+# Stores function info for each class, so that it only has to be determined once per class. Bounded LRU.
+member_metadata_cache = OrderedDict()
 
 # endregion Module Variables
 
@@ -74,8 +97,19 @@ def dump(context, obj):
     if render_head:
         context['django_dd_template_tag_render_head'] = False
 
+    # All dumps within the same template share unique tracking, so that repeat dumps are still distinguished.
+    render_state = context.get('django_dd_template_tag_render_state')
+    if render_state is None:
+        render_state = RenderState()
+        context['django_dd_template_tag_render_state'] = render_state
+
+    # Render immediately, while the template's unique tracking is in scope.
+    with render_scope(render_state):
+        rendered_objects = render_to_string('django_dump_die/partials/_dump_objects.html', {'objects': [object_info]})
+
     return {
         'objects': [object_info],
+        'rendered_objects': rendered_objects,
         'render_head': render_head,
     }
 
@@ -86,6 +120,30 @@ def dump_objects(objects):
     return {'objects': objects}
 
 
+@register.tag
+def dump_render_scope(parser, token):
+    """Template tag to render everything up to {% end_dump_render_scope %} with shared unique tracking.
+
+    Used by templates that dump objects, so that they can be rendered outside of a render scope. See render_scope().
+    """
+    if len(token.split_contents()) != 1:
+        raise template.TemplateSyntaxError(f'{token.contents.split()[0]} takes no arguments')
+    nodelist = parser.parse(('end_dump_render_scope',))
+    parser.delete_first_token()
+    return RenderScopeNode(nodelist)
+
+
+class RenderScopeNode(template.Node):
+    """Template node that renders its contents within a render scope, unless already within one."""
+
+    def __init__(self, nodelist):
+        self.nodelist = nodelist
+
+    def render(self, context):
+        with ensure_render_scope():
+            return self.nodelist.render(context)
+
+
 @register.inclusion_tag('django_dump_die/partials/_dump_object.html')
 def dump_object(
     obj,
@@ -121,22 +179,66 @@ def dump_object(
     :param original_obj: Original object, for handling uniques if dealing with deepcopy.
     :param parent_is_intermediate: Boolean indicating that parent is intermediate type. Do not recurse further.
     """
+    # Outside of a render scope (such as when called directly), this call gets its own unique tracking.
+    if render_state_var.get() is None:
+        with render_scope():
+            return dump_object(
+                obj,
+                root_obj,
+                skip_set,
+                current_iteration,
+                current_depth,
+                root_index_start,
+                root_index_end,
+                original_obj,
+                parent_is_intermediate,
+            )
+
+    # Once the render budget is used up, only output a marker for each remaining value.
+    render_budget = _get_render_budget()
+    if render_budget is not None and render_budget.is_exhausted():
+        render_budget.count_truncated()
+        return {
+            'type': get_obj_type(obj),
+            'skipped_reason': 'truncated',
+        }
+
     # Set up set to store uniques to skip if not passed in.
     # Will be used to skip objects already done to prevent infinite loops.
     skip_set = skip_set or set()
 
+    # Handle if object was already output within this dumped object, checked by identity before any other handling.
+    # Each later occurrence only outputs a reference back to it, which is built once and then reused.
+    context = _get_output_reference(obj, skip_set)
+    if context is not None:
+        if render_budget is not None:
+            render_budget.charge(context)
+        return context
+
     # Generate the unique
     unique, root_count = _generate_unique(obj, root_obj, original_obj)
 
     # Following section will determine what should get rendered out.
-    intermediate_value = None
+    skipped_reason = 'limit'
+
+    # Handle if object is an attribute that was not evaluated. See AttributeGuard.
+    if isinstance(obj, UnevaluatedAttribute):
+        context = _handle_unevaluated_attribute(
+            obj,
+            root_obj,
+            skip_set,
+            current_iteration,
+            current_depth,
+            root_index_start,
+            root_index_end,
+            original_obj,
+            parent_is_intermediate,
+        )
 
     # Handle if object is in skip set, aka already processed.
-    if unique in skip_set:
-        # Complex object found in skip set. Skip further handling of if clauses and go to end of function.
-        # Intermediates get slightly extra handling for "simple" value output.
-        if _is_intermediate_type(obj):
-            intermediate_value = safe_str(obj)
+    # Such as deepcopied objects, which are tracked by the unique of their original object.
+    elif unique in skip_set:
+        context = _get_reference_context(obj, unique, root_count)
 
     # Handle if obj is a simple type (Null/None, int, str, bool, and basic number types)
     # OR if direct parent is an intermediate (excluding pytz timezone objects).
@@ -147,11 +249,11 @@ def dump_object(
             or parent_is_intermediate
         )
     ):
-        return _handle_simple_type(obj)
+        context = _handle_simple_type(obj)
 
     # Handle if obj is an intermediate (date/time types).
     elif _is_intermediate_type(obj):
-        return _handle_intermediate_type(
+        context = _handle_intermediate_type(
             obj,
             root_obj,
             unique,
@@ -160,6 +262,23 @@ def dump_object(
             original_obj=original_obj
         )
 
+    # Handle if obj is a query. Only the displayed rows are fetched, so index range is applied when evaluating.
+    elif is_query(obj) and is_complex_type(current_depth, current_iteration):
+
+        # Handle for new "unique" object output.
+        context = _handle_complex_type(
+            obj,
+            root_obj,
+            unique,
+            root_count,
+            skip_set=skip_set,
+            current_iteration=current_iteration,
+            current_depth=current_depth,
+            root_index_start=root_index_start,
+            root_index_end=root_index_end,
+            original_obj=original_obj,
+        )
+
     # Handle if element is iterable and we are at the root's element direct children (depth of 1),
     elif is_iterable(root_obj) and current_depth == 0:
 
@@ -175,7 +294,7 @@ def dump_object(
         if current_iteration >= root_index_start and current_iteration < root_index_end:
 
             # Handle for new "unique" object output.
-            return _handle_complex_type(
+            context = _handle_complex_type(
                 obj,
                 root_obj,
                 unique,
@@ -190,7 +309,7 @@ def dump_object(
     elif is_complex_type(current_depth, current_iteration):
 
         # Handle for new "unique" object output.
-        return _handle_complex_type(
+        context = _handle_complex_type(
             obj,
             root_obj,
             unique,
@@ -203,20 +322,388 @@ def dump_object(
             original_obj=original_obj,
         )
 
-    # If we're here then the object has already been processed before,
-    # or we have reached the max depth or number of iterations
+    # If no context yet, then we have reached the max depth or number of iterations
     # or outside the bounds of the root indexes to process.
     # In any case, just return the type and unique of the object for output.
-    return {
-        'type': get_obj_type(obj),
-        'unique': unique,
-        'root_count': root_count,
-        'intermediate': intermediate_value,
-    }
+    if context is None:
+        context = {
+            'type': get_obj_type(obj),
+            'unique': unique,
+            'root_count': root_count,
+            'skipped_reason': skipped_reason,
+        }
+
+    if render_budget is not None:
+        render_budget.charge(context)
+
+    return context
 
 
 # region Unique Mapping Functions
 
+class RenderState:
+    """Unique tracking state for a single render of dumped objects.
+
+    Root counts only need to be distinct within a single page, so this state is discarded once the render ends.
+
+    If lazy_depth is set, complex objects at or past that depth are not output, and are instead stored under
+    lazy_session, to be output when expanded. See DeferredNode.
+    Attributes that are not evaluated are also stored under lazy_session, to be output on click. See DeferredAttribute.
+    """
+    __slots__ = (
+        'repeat_iteration_tracker',
+        'deepcopy_unique_map',
+        'lazy_depth',
+        'lazy_session',
+        'budget',
+        'attribute_guard',
+        'unique_registry',
+        'output_root_counts',
+        'reference_contexts',
+    )
+
+    def __init__(self, lazy_depth=None, lazy_session=None):
+        self.repeat_iteration_tracker = {}
+        self.deepcopy_unique_map = {}
+        self.unique_registry = UniqueRegistry()
+        # Root count that each fully output unique was last output with. See _track_output().
+        self.output_root_counts = {}
+        # Context to output references back to each already output unique with. See _get_reference_context().
+        self.reference_contexts = {}
+        self.lazy_depth = lazy_depth
+        self.lazy_session = lazy_session
+        self.budget = RenderBudget(MAX_RENDER_NODES, MAX_RENDER_BYTES, MAX_RENDER_TIME)
+        self.attribute_guard = _new_attribute_guard()
+
+
+class RenderBudget:
+    """Limits on the total output of a single render, so that huge objects cannot render indefinitely.
+
+    Once any limit is reached, the budget stays exhausted, and each remaining value is only output as a "truncated"
+    marker. Limits are checked before each value, so the final value may go slightly over.
+
+    A single budget may be shared by several render threads (see DJANGO_DD_RENDER_THREADS), so counts are only updated
+    while holding the lock.
+    """
+    __slots__ = (
+        'max_nodes',
+        'max_bytes',
+        'deadline',
+        'node_count',
+        'byte_count',
+        'truncated_count',
+        'exhausted_setting',
+        'lock',
+    )
+
+    def __init__(self, max_nodes=None, max_bytes=None, max_time=None):
+        """
+        :param max_nodes: Max number of values to output. None means no limit.
+        :param max_bytes: Max total length of value output (reprs, names, docs, etc). None means no limit.
+        :param max_time: Max number of milliseconds to spend, starting now. None means no limit.
+        """
+        self.max_nodes = max_nodes
+        self.max_bytes = max_bytes
+        self.deadline = None if max_time is None else time.monotonic() + max_time / 1000
+        self.node_count = 0
+        self.byte_count = 0
+        self.truncated_count = 0
+        # Name of the setting for the limit that was reached, for output. None while not exhausted.
+        self.exhausted_setting = None
+        self.lock = threading.Lock()
+
+    def is_exhausted(self):
+        """Return if any limit has been reached."""
+        with self.lock:
+            if self.exhausted_setting is None:
+                if self.max_nodes is not None and self.node_count >= self.max_nodes:
+                    self.exhausted_setting = 'DJANGO_DD_MAX_RENDER_NODES'
+                elif self.max_bytes is not None and self.byte_count >= self.max_bytes:
+                    self.exhausted_setting = 'DJANGO_DD_MAX_RENDER_BYTES'
+                elif self.deadline is not None and time.monotonic() >= self.deadline:
+                    self.exhausted_setting = 'DJANGO_DD_MAX_RENDER_TIME'
+            return self.exhausted_setting is not None
+
+    def count_truncated(self):
+        """Count a single value that was not output, as the budget is exhausted."""
+        with self.lock:
+            self.truncated_count += 1
+
+    def charge(self, context):
+        """Count a single value against the budget, using its dump_object() context.
+
+        :return: Size of the value, as counted against the byte limit.
+        """
+        size = len(context.get('simple') or '') + len(context.get('intermediate') or '')
+        query_info = context.get('query')
+        if query_info and query_info['sql']:
+            size += len(query_info['sql'])
+        for attribute in context.get('attributes', ()):
+            size += len(str(attribute[0])) + len(str(attribute[4] or ''))
+        for function in context.get('functions', ()):
+            size += len(str(function[0])) + len(str(function[1] or '')) + len(str(function[2] or ''))
+
+        with self.lock:
+            self.node_count += 1
+            self.byte_count += size
+        return size
+
+    def refund(self, node_count, byte_count, truncated_count):
+        """Remove counts of output that was discarded, such as a dumped object that is rendered again."""
+        with self.lock:
+            self.node_count -= node_count
+            self.byte_count -= byte_count
+            self.truncated_count -= truncated_count
+            # Checked again on next use, as the discarded output may have been what reached a limit.
+            self.exhausted_setting = None
+
+
+class UniqueRegistry:
+    """Uniques of every object seen within a single render, by identity.
+
+    Object ids are only distinct among objects that exist at the same time. Each object is kept alive until the render
+    ends, so that a value discarded mid-render (such as a property result) never has its id reused by a later value,
+    which would then be wrongly output as already processed.
+    """
+    __slots__ = ('entries',)
+
+    def __init__(self):
+        # Object id to (object, unique).
+        self.entries = {}
+
+    def get_unique(self, obj):
+        """Get the unique for an object, registering it if not yet seen."""
+        entry = self.entries.get(id(obj))
+        if entry is None:
+            entry = (obj, generate_unique_from_obj(obj))
+            self.entries[id(obj)] = entry
+        return entry[1]
+
+
+class DeferredNode:
+    """Complex object whose contents were not output, and are instead output once expanded.
+
+    Holds everything needed to continue the render from this object, including the unique tracking entries of its
+    root object, so that expanded children get the same uniques they would have had in the original render.
+    """
+    __slots__ = (
+        'obj',
+        'root_obj',
+        'unique',
+        'root_count',
+        'skip_set',
+        'current_iteration',
+        'current_depth',
+        'root_index_start',
+        'root_index_end',
+        'original_obj',
+        'tracked_roots',
+        'tracked_unique_maps',
+    )
+
+    def __init__(
+        self,
+        obj,
+        root_obj,
+        unique,
+        root_count,
+        skip_set,
+        current_iteration,
+        current_depth,
+        root_index_start,
+        root_index_end,
+        original_obj,
+    ):
+        self.obj = obj
+        self.root_obj = root_obj
+        self.unique = unique
+        self.root_count = root_count
+        self.skip_set = skip_set
+        self.current_iteration = current_iteration
+        self.current_depth = current_depth
+        self.root_index_start = root_index_start
+        self.root_index_end = root_index_end
+        self.original_obj = original_obj
+
+        # Copy the tracking entries of the root object, as they are at this point in the render.
+        repeat_iteration_tracker, deepcopy_unique_map = _get_unique_trackers()
+        root_unique = _get_obj_unique(root_obj)
+        root_uniques = {root_unique}
+        self.tracked_unique_maps = {}
+        if root_unique in deepcopy_unique_map:
+            self.tracked_unique_maps[root_unique] = deepcopy_unique_map[root_unique]
+            root_uniques.add(deepcopy_unique_map[root_unique].get(root_unique, root_unique))
+        self.tracked_roots = {
+            tracked_unique: repeat_iteration_tracker[tracked_unique]
+            for tracked_unique in root_uniques
+            if tracked_unique in repeat_iteration_tracker
+        }
+
+    def render_state(self, lazy_depth=None, lazy_session=None):
+        """Create a RenderState to output this object's contents with, holding only its root's tracking entries.
+
+        :param lazy_depth: Number of levels to output, before deferring again. If None, outputs all levels.
+        :param lazy_session: Session to store further deferred objects under.
+        """
+        if lazy_depth is not None:
+            # Always output at least this object's own contents.
+            lazy_depth = self.current_depth + max(lazy_depth, 1)
+        render_state = RenderState(lazy_depth=lazy_depth, lazy_session=lazy_session)
+        render_state.repeat_iteration_tracker.update(self.tracked_roots)
+        render_state.deepcopy_unique_map.update(self.tracked_unique_maps)
+        return render_state
+
+    def expand(self):
+        """Determine template dd/dump info for this object, including its contents.
+
+        Must be called within a render_scope() using this object's render_state().
+        """
+        return _handle_complex_type(
+            self.obj,
+            self.root_obj,
+            self.unique,
+            self.root_count,
+            skip_set=self.skip_set,
+            current_iteration=self.current_iteration,
+            current_depth=self.current_depth,
+            root_index_start=self.root_index_start,
+            root_index_end=self.root_index_end,
+            original_obj=self.original_obj,
+        )
+
+
+class DeferredAttribute(DeferredNode):
+    """Attribute that was not evaluated, and is instead evaluated and output once clicked.
+
+    The obj is the UnevaluatedAttribute placeholder, which holds the attribute owner and name.
+    """
+    __slots__ = ('parent_is_intermediate',)
+
+    def __init__(
+        self,
+        attribute,
+        root_obj,
+        skip_set,
+        current_iteration,
+        current_depth,
+        root_index_start,
+        root_index_end,
+        original_obj,
+        parent_is_intermediate,
+    ):
+        super().__init__(
+            attribute,
+            root_obj,
+            '',
+            '',
+            skip_set,
+            current_iteration,
+            current_depth,
+            root_index_start,
+            root_index_end,
+            original_obj,
+        )
+        self.parent_is_intermediate = parent_is_intermediate
+
+    def expand(self):
+        """Evaluate the attribute, and determine template dd/dump info for its value.
+
+        The attribute was explicitly requested, so is evaluated regardless of the attribute guard settings.
+        Must be called within a render_scope() using this attribute's render_state().
+        """
+        value = getattr(self.obj.owner, self.obj.name)
+        return dump_object(
+            value,
+            self.root_obj,
+            self.skip_set,
+            self.current_iteration,
+            self.current_depth,
+            self.root_index_start,
+            self.root_index_end,
+            self.original_obj,
+            self.parent_is_intermediate,
+        )
+
+
+@contextmanager
+def render_scope(render_state=None):
+    """Context manager to track uniques separately for everything rendered within it.
+
+    :param render_state: RenderState to use. If not provided, a new (empty) state is used.
+    """
+    token = render_state_var.set(render_state or RenderState())
+    try:
+        yield
+    finally:
+        render_state_var.reset(token)
+
+
+@contextmanager
+def ensure_render_scope():
+    """Context manager to track uniques in a new render scope, unless already within one."""
+    if render_state_var.get() is not None:
+        yield
+        return
+    with render_scope():
+        yield
+
+
+def _get_render_state():
+    """Get the RenderState for the current render.
+
+    Outside of a render scope, a new state is used on each call, so nothing is shared between unrelated dumps.
+    """
+    render_state = render_state_var.get()
+    if render_state is None:
+        return RenderState()
+    return render_state
+
+
+def _get_render_budget():
+    """Get the render budget for the current render. None if rendering outside of a render scope."""
+    render_state = render_state_var.get()
+    if render_state is None:
+        return None
+    return render_state.budget
+
+
+def _get_attribute_guard():
+    """Get the attribute guard for the current render.
+
+    Outside of a render scope, a new guard is used on each call, so slow attributes are not remembered.
+    """
+    render_state = render_state_var.get()
+    if render_state is None:
+        return _new_attribute_guard()
+    return render_state.attribute_guard
+
+
+def _new_attribute_guard():
+    """Create an attribute guard from settings. None if attribute access is not guarded."""
+    if not ATTRIBUTE_GUARD_ENABLED:
+        return None
+    return AttributeGuard(ATTRIBUTE_TIME_LIMIT, DESCRIPTOR_DENYLIST, DESCRIPTOR_ALLOWLIST)
+
+
+def _get_unique_trackers():
+    """Get the repeat iteration tracker and deepcopy unique map for the current render."""
+    render_state = _get_render_state()
+    return render_state.repeat_iteration_tracker, render_state.deepcopy_unique_map
+
+
+def _get_obj_unique(obj):
+    """Get the unique for an object, through the unique registry of the current render."""
+    return _get_render_state().unique_registry.get_unique(obj)
+
+
+def _add_tracked_root(tracker, root_unique, value):
+    """Add a root unique entry to a tracker, discarding the oldest roots if over the size limit."""
+    if UNIQUE_TRACKER_SIZE is not None:
+        while tracker and len(tracker) >= UNIQUE_TRACKER_SIZE:
+            del tracker[next(iter(tracker))]
+    tracker[root_unique] = value
+
+
 def _generate_unique(obj, root_obj, original_obj):
     """Generates object "unique" identifier.
 
@@ -230,28 +717,31 @@ def _generate_unique(obj, root_obj, original_obj):
     :param original_obj: Original instance of object corresponding to current obj. Used for deepcopy mapping logic.
     """
     # Get a unique for the object.
-    unique = generate_unique_from_obj(obj)
+    unique = _get_obj_unique(obj)
 
-    # Get a unique for the object.
-    root_unique = generate_unique_from_obj(root_obj)
+    # Get a unique for the root object.
+    root_unique = _get_obj_unique(root_obj)
 
     # Default root_count to blank string
     root_count_string = ''
 
+    # Get unique tracking for the current render.
+    repeat_iteration_tracker, deepcopy_unique_map = _get_unique_trackers()
+
     # If there is an original_obj, we may need to create the unique map so that
     # we can restore the original uniques to the deepcopied object.
     if original_obj:
         # Ensure root unique in root_unique_map.
         if root_unique not in deepcopy_unique_map:
             # Create the unique mapping of current deepcopy to original object.
-            _create_unique_map(obj, root_unique, original_obj)
+            _create_unique_map(obj, root_unique, original_obj, deepcopy_unique_map)
 
         # Skip simple types and intermediate types
         if unique in deepcopy_unique_map[root_unique]:
             # Do unique swap so that both unique and root unique are the
             # same value as the original value before deep copying.
             unique = deepcopy_unique_map[root_unique][unique]
-            root_unique = deepcopy_unique_map[root_unique][root_unique]
+            root_unique = deepcopy_unique_map[root_unique].get(root_unique, root_unique)
 
     # If the root unique is already in repeat_iteration_tracker.
     if root_unique in repeat_iteration_tracker:
@@ -259,7 +749,8 @@ def _generate_unique(obj, root_obj, original_obj):
         # Determine appended "iteration tracker" value for root unique and all associated children.
 
         # If obj and root_obj are the same, increment the count.
-        if obj == root_obj:
+        # NOTE: Identity check, as equality on nested containers is slow and can itself hit the recursion limit.
+        if obj is root_obj:
             # Get the current count out.
             root_count = repeat_iteration_tracker[root_unique]
             # Increment the count.
@@ -280,85 +771,175 @@ def _generate_unique(obj, root_obj, original_obj):
 
     else:
         # Unique not found in tracker. Add the unique to the repeat_iteration_tracker.
-        repeat_iteration_tracker[root_unique] = 1
+        _add_tracked_root(repeat_iteration_tracker, root_unique, 1)
 
     return unique, root_count_string
 
 
-def _create_unique_map(obj, root_unique, original_obj):
+def _create_unique_map(obj, root_unique, original_obj, deepcopy_unique_map):
     """Create an entry in the root_unique_map for this object."""
 
     # Create a dict for that unique map.
-    deepcopy_unique_map[root_unique] = {}
+    root_unique_map = {}
+    _add_tracked_root(deepcopy_unique_map, root_unique, root_unique_map)
 
     # Begin recursively adding entries to the unique map.
-    _add_unique_map_entry(obj, original_obj, root_unique)
+    _add_unique_map_entry(obj, original_obj, root_unique_map)
 
 
-def _add_unique_map_entry(obj, original_obj, root_unique):
-    """Add a unique entry to the unique entry map."""
+def add_snapshot_unique_map(snapshot, snapshot_memo):
+    """Create the unique map of a snapshot, for the current render, so that it outputs the uniques of the original.
 
-    # Calculate the obj unique and the original obj unique.
-    obj_unique = generate_unique_from_obj(obj)
-    original_obj_unique = generate_unique_from_obj(original_obj)
+    Same as the map created for a deepcopied object on first output, but built from the memo of snapshot_object(),
+    so that the original object is never read again.
 
-    # Add the new unique to the root unique map.
-    deepcopy_unique_map[root_unique][obj_unique] = original_obj_unique
+    :param snapshot: Snapshot of a dumped object, as returned by snapshot_object().
+    :param snapshot_memo: Memo filled in by snapshot_object(), of original object id to snapshot.
+    """
+    root_unique_map = {}
+    for original_id, value_snapshot in snapshot_memo.items():
+        # A snapshot has the same class as its original, so this is the same as generate_unique_from_obj(original).
+        root_unique_map[_get_obj_unique(value_snapshot)] = f'{get_class_name(value_snapshot)}_{original_id}'
 
-    # Attempt to get member values of object and original object.
-    members = get_members(obj)
-    original_members = get_members(original_obj)
+    _add_tracked_root(_get_unique_trackers()[1], _get_obj_unique(snapshot), root_unique_map)
 
-    # Loop through members and recursively determine unique mappings.
-    # We do this because the state of an object might change over time, so child values (and mappings) might be
-    # different. Parent might also be of complex type with children that are also complex types.
-    for attr, value in members:
-        # Skip simple types and children of intermediate types.
-        if _is_simple_type(value) or _is_intermediate_type(obj):
-            continue
-        # Skip private members if not including them and functions.
-        if (is_private(attr) and not INCLUDE_PRIVATE_METHODS) or callable(value):
-            continue
 
-        # Loop through orig members looking for a match.
-        for orig_attr, orig_value in original_members:
-            # Skip simple types and children of intermediate types.
-            if _is_simple_type(value) or _is_intermediate_type(original_obj):
+def _add_unique_map_entry(obj, original_obj, root_unique_map):
+    """Add unique entries to the unique entry map, for an object and all of its output children.
+
+    Walks the copied and original objects together, matching up children by attribute name, key, or index.
+    Uses an explicit (breadth first) work queue, so that each value is only visited once, at its shallowest depth.
+    Values past the max recursion depth are never output, so are not visited.
+    """
+    attribute_guard = _get_attribute_guard()
+    visited = set()
+    queue = deque([(obj, original_obj, 0)])
+    while queue:
+        obj, original_obj, depth = queue.popleft()
+
+        # Calculate the obj unique and the original obj unique.
+        # Add the new unique to the root unique map.
+        root_unique_map[_get_obj_unique(obj)] = _get_obj_unique(original_obj)
+
+        # Skip children of intermediate types, already visited values, and values at max depth.
+        if (
+            id(obj) in visited
+            or _is_intermediate_type(obj)
+            or (MAX_RECURSION_DEPTH is not None and depth >= MAX_RECURSION_DEPTH)
+        ):
+            continue
+        visited.add(id(obj))
+
+        # Attempt to get member values of object and original object.
+        # Named members are matched by name. Unnamed members (set entries) are matched by position.
+        original_named_values = {}
+        original_unnamed_values = []
+        for orig_attr, orig_value in get_members(original_obj, attribute_guard):
+            if orig_attr is None:
+                original_unnamed_values.append(orig_value)
+            else:
+                original_named_values[orig_attr] = orig_value
+        original_unnamed_values = iter(original_unnamed_values)
+
+        # Loop through members and determine unique mappings.
+        # We do this because the state of an object might change over time, so child values (and mappings) might be
+        # different. Parent might also be of complex type with children that are also complex types.
+        for attr, value in get_members(obj, attribute_guard):
+            if attr is None:
+                orig_value = next(original_unnamed_values, _NO_MATCH)
+            else:
+                orig_value = original_named_values.get(attr, _NO_MATCH)
+
+            # Skip simple types and unevaluated attributes.
+            if _is_simple_type(value) or isinstance(value, UnevaluatedAttribute):
                 continue
             # Skip private members if not including them and functions.
             if (is_private(attr) and not INCLUDE_PRIVATE_METHODS) or callable(value):
                 continue
 
-            # If the attrs match, make recursive call to add more entries to the unique map.
-            if orig_attr == attr:
-                _add_unique_map_entry(value, orig_value, root_unique)
+            # If the attrs match, add more entries to the unique map.
+            if orig_value is not _NO_MATCH:
+                queue.append((value, orig_value, depth + 1))
 
 # endregion Unique Mapping Functions
 
 
+# region Reference Functions
+
+def _track_output(unique, root_count, skip_set):
+    """Record that an object is being fully output, so that later occurrences within the same dumped object only
+    output a reference back to it.
+    """
+    skip_set.add(unique)
+
+    render_state = render_state_var.get()
+    if render_state is not None:
+        render_state.output_root_counts[unique] = root_count
+        # Discard any reference built for an earlier output, such as in a previous dump of the same object.
+        render_state.reference_contexts.pop(unique, None)
+
+
+def _get_output_reference(obj, skip_set):
+    """Get the reference context for an object already output within the current dumped object, by identity alone.
+
+    Avoids all unique and root count handling for repeat occurrences. Returns None if the object was not output yet,
+    or was not output within the current render, in which case it goes through the usual handling.
+    """
+    render_state = render_state_var.get()
+    if render_state is None or not skip_set:
+        return None
+
+    unique = render_state.unique_registry.get_unique(obj)
+    if unique not in skip_set or unique not in render_state.output_root_counts:
+        return None
+
+    return _get_reference_context(obj, unique, render_state.output_root_counts[unique])
+
+
+def _get_reference_context(obj, unique, root_count):
+    """Get the context to output a reference back to an already output object with.
+
+    Built on the first repeat occurrence, then reused for every later occurrence within the render.
+
+    :param obj: Already output object.
+    :param unique: Unique the object was output with.
+    :param root_count: Root count of the current occurrence. The root count the object was actually output with is
+        used instead, if known, so that references always link to the original output.
+    """
+    render_state = render_state_var.get()
+    if render_state is not None:
+        context = render_state.reference_contexts.get(unique)
+        if context is not None:
+            return context
+        root_count = render_state.output_root_counts.get(unique, root_count)
+
+    context = {
+        'type': get_obj_type(obj),
+        'unique': unique,
+        'root_count': root_count,
+        'skipped_reason': 'repeat',
+    }
+    # Intermediates get slightly extra handling for "simple" value output.
+    if _is_intermediate_type(obj):
+        context['intermediate'] = safe_str(obj)
+
+    if render_state is not None:
+        render_state.reference_contexts[unique] = context
+    return context
+
+# endregion Reference Functions
+
+
 # region Type Handling Functions
 
 def _is_simple_type(obj):
     """Return if the obj is a simple type."""
-    return (
-        obj is None
-        or type(obj) in SIMPLE_TYPES
-        or get_class_name(obj) in ADDITIONAL_SIMPLE_TYPES
-    )
+    return get_type_category(obj).kind == TYPE_SIMPLE
 
 
 def _is_intermediate_type(obj):
     """Return if the obj is an intermediate type."""
-
-    # Special handling for pytz timezone objects.
-    if PYTZ_PRESENT and isinstance(obj, pytz.BaseTzInfo):
-        return True
-
-    # Handling for all other objects.
-    return (
-        type(obj) in INTERMEDIATE_TYPES
-        or get_class_name(obj) in ADDITIONAL_INTERMEDIATE_TYPES
-    )
+    return get_type_category(obj).kind == TYPE_INTERMEDIATE
 
 
 def is_complex_type(current_depth, current_iteration):
@@ -442,7 +1023,7 @@ def _handle_intermediate_type(obj, root_obj, unique, root_count, skip_set=None,
     """
     # Add unique to skip so it won't be processed a second time by additional
     # recursive calls to this template tag.
-    skip_set.add(unique)
+    _track_output(unique, root_count, skip_set)
 
     # Attempt to get corresponding attribute/function values of object.
     attributes, functions = get_obj_values(obj)
@@ -451,7 +1032,7 @@ def _handle_intermediate_type(obj, root_obj, unique, root_count, skip_set=None,
     context = {
         'include_attributes': INCLUDE_ATTRIBUTES,
         'include_functions': INCLUDE_FUNCTIONS,
-        'collapsable': _get_collapsable_values(),
+        'collapsable': get_collapsable_values(),
         'braces': '{}',
         'object': obj,
         'intermediate': safe_str(obj),
@@ -499,17 +1080,41 @@ def _handle_complex_type(
     :param skip_set: Set of already-processed objects. Used to skip re-processing identical objects.
     :param current_iteration: Current iteration-index. Used to track current index of object we're iterating through.
     :param current_depth: Current depth-index. Used to track how deep of child-members we're iterating through.
-    :param root_index_start:
-    :param root_index_end:
+    :param root_index_start: Starting index for root iterable object. Only used for root query evaluation.
+    :param root_index_end: Ending index for root iterable object. Only used for root query evaluation.
     """
     # Add unique to skip so it won't be processed a second time by additional
     # recursive calls to this template tag.
-    skip_set.add(unique)
+    _track_output(unique, root_count, skip_set)
+
+    # Type is determined before any query evaluation, so that the query type is still displayed.
+    obj_type = get_obj_type(obj)
 
-    # If the object is a query, evaluate it.
-    # This prevents a crash because a lazy queryset has too many members.
+    # If past the lazy expansion depth, only output enough to display the object, and store it for later expansion.
+    render_state = render_state_var.get()
+    if render_state is not None and render_state.lazy_depth is not None and current_depth >= render_state.lazy_depth:
+        return _handle_deferred_type(
+            obj,
+            obj_type,
+            root_obj,
+            unique,
+            root_count,
+            skip_set,
+            current_iteration,
+            current_depth,
+            root_index_start,
+            root_index_end,
+            original_obj,
+            render_state.lazy_session,
+        )
+
+    # If the object is a query, evaluate only the rows that will be displayed.
+    # This prevents a crash because a lazy queryset has too many members,
+    # and prevents fetching an entire table when only a handful of rows are output.
+    query_info = None
+    row_offset = 0
     if is_query(obj):
-        obj = list(obj)
+        obj, row_offset, query_info = _evaluate_query(obj, current_depth, root_index_start, root_index_end)
 
     # Determine which type of braces should be used.
     if isinstance(obj, list):
@@ -522,6 +1127,12 @@ def _handle_complex_type(
     # Attempt to get corresponding attribute/function values of object.
     attributes, functions = get_obj_values(obj)
 
+    # Display query rows with their index in the full query, rather than their index in the fetched slice.
+    if row_offset:
+        for attribute in attributes:
+            if attribute[3] == 'index':
+                attribute[0] = str(int(attribute[0]) + row_offset)
+
     is_iterable_obj = is_iterable(obj) and not is_dict(obj) and not isinstance(obj, memoryview)
     is_dict_obj = is_dict(obj)
 
@@ -529,14 +1140,15 @@ def _handle_complex_type(
     context = {
         'include_attributes': INCLUDE_ATTRIBUTES,
         'include_functions': INCLUDE_FUNCTIONS,
-        'collapsable': _get_collapsable_values(),
+        'collapsable': get_collapsable_values(),
         'braces': braces,
         'object': obj,
         'unique': unique,
         'root_count': root_count,
-        'type': get_obj_type(obj),
+        'type': obj_type,
         'is_iterable': is_iterable_obj,
         'is_dict': is_dict_obj,
+        'query': query_info,
         'depth': current_depth,
         'root_index_start': root_index_start,
         'root_index_end': root_index_end,
@@ -553,6 +1165,165 @@ def _handle_complex_type(
 
     return context
 
+
+def _handle_deferred_type(
+    obj,
+    obj_type,
+    root_obj,
+    unique,
+    root_count,
+    skip_set,
+    current_iteration,
+    current_depth,
+    root_index_start,
+    root_index_end,
+    original_obj,
+    lazy_session,
+):
+    """Logic for outputting a complex object whose contents are deferred until expanded.
+
+    Outputs the same type, length and braces as a fully output object, but without any attributes or functions.
+    Instead, the object is stored, and the returned token is used to fetch its contents once expanded.
+    """
+    query_info = None
+    braces = '{}'
+    if is_query(obj):
+        # Queries are output as a list of rows, so use list braces. No rows are fetched until expanded.
+        query_info = _get_query_info(obj)
+        braces = '[]'
+    elif isinstance(obj, list):
+        braces = '[]'
+    elif isinstance(obj, tuple):
+        braces = '()'
+
+    lazy_token = add_lazy_value(lazy_session, DeferredNode(
+        obj,
+        root_obj,
+        unique,
+        root_count,
+        skip_set,
+        current_iteration,
+        current_depth,
+        root_index_start,
+        root_index_end,
+        original_obj,
+    ))
+
+    return {
+        'include_attributes': False,
+        'include_functions': False,
+        'collapsable': get_collapsable_values(),
+        'braces': braces,
+        'object': obj,
+        'unique': unique,
+        'root_count': root_count,
+        'type': obj_type,
+        'is_iterable': is_iterable(obj) and not is_dict(obj) and not isinstance(obj, memoryview),
+        'is_dict': is_dict(obj),
+        'query': query_info,
+        'depth': current_depth,
+        'root_index_start': root_index_start,
+        'root_index_end': root_index_end,
+        'original_obj': original_obj,
+        'lazy_token': lazy_token,
+    }
+
+
+def _handle_unevaluated_attribute(
+    attribute,
+    root_obj,
+    skip_set,
+    current_iteration,
+    current_depth,
+    root_index_start,
+    root_index_end,
+    original_obj,
+    parent_is_intermediate,
+):
+    """Logic for outputting an attribute that was not evaluated, due to the attribute guard settings.
+
+    If rendering with a lazy session, the attribute is stored, and the returned token is used to load it on click.
+    """
+    load_token = None
+    render_state = render_state_var.get()
+    if render_state is not None and render_state.lazy_session is not None:
+        load_token = add_lazy_value(render_state.lazy_session, DeferredAttribute(
+            attribute,
+            root_obj,
+            skip_set,
+            current_iteration,
+            current_depth,
+            root_index_start,
+            root_index_end,
+            original_obj,
+            parent_is_intermediate,
+        ))
+
+    return {
+        'unevaluated': True,
+        'type': attribute.descriptor_type,
+        'elapsed': attribute.elapsed,
+        'setting': attribute.setting,
+        'load_token': load_token,
+    }
+
+
+def _get_query_info(obj):
+    """Get the total row count and generated SQL of a query, without fetching any rows.
+
+    :return: Dict of query info for output. Values are None if they could not be determined.
+        Also includes a note, if displayed rows were not as requested.
+    """
+    # Get the total number of rows, without fetching them.
+    try:
+        total = obj.count()
+    except Exception:
+        total = None
+
+    # Get the generated SQL. Some queries (such as .none()) never generate SQL.
+    try:
+        sql = str(obj.query)
+    except Exception:
+        sql = None
+
+    return {'total': total, 'sql': sql, 'note': None}
+
+
+def _evaluate_query(obj, current_depth, root_index_start, root_index_end):
+    """Evaluate only the displayed rows of a query, instead of every row the query matches.
+
+    Rows are fetched with a single sliced (LIMIT/OFFSET) query. The total row count is determined with a separate
+    COUNT query, and is None if it could not be determined.
+
+    :param obj: Query to evaluate.
+    :param current_depth: Current depth-index. Index range only applies to a query that is the root object.
+    :param root_index_start: Starting index for root iterable object. If None, uses default behavior.
+    :param root_index_end: Ending index for root iterable object. If None, uses default behavior.
+    :return: Tuple of (list of fetched rows, index of first fetched row, dict of query info for output).
+    """
+    query_info = _get_query_info(obj)
+    total = query_info['total']
+
+    # Determine which rows will be displayed.
+    start, end = 0, MAX_ITERABLE_LENGTH
+    if current_depth == 0 and (root_index_start is not None or root_index_end is not None):
+        if total is not None:
+            start, end = _process_root_indices(root_index_start, root_index_end, total)
+        elif (root_index_start or 0) < 0 or (root_index_end or 0) < 0:
+            # Negative indexes are relative to the row count, so can't be determined. Display the first rows instead.
+            query_info['note'] = 'Row count unavailable. Negative index range ignored'
+        else:
+            start, end = _process_root_indices(root_index_start, root_index_end, 0)
+
+    try:
+        rows = list(obj[start:end])
+    except Exception:
+        # Not a true Django QuerySet. Fall back to evaluating the full query.
+        start = 0
+        rows = list(obj)
+
+    return rows, start, query_info
+
 # endregion Type Handling Functions
 
 
@@ -567,7 +1338,7 @@ def get_obj_values(obj):
 
     try:
         # Attempt to get member values of object. Falls back to empty list on failure.
-        members = get_members(obj)
+        members = get_members(obj, _get_attribute_guard())
 
     except Exception as exception:
         # On exception, add exception to attributes and return the attributes.
@@ -586,6 +1357,9 @@ def get_obj_values(obj):
         attributes.append(['EXCEPTION', str(exception), None, 'empty', title])
         return (attributes, functions)
 
+    # Get cached function info for the object's class.
+    function_metadata = _get_class_function_metadata(obj) if INCLUDE_FUNCTIONS else None
+
     # Once all members have been collected, attempt to figure out what type, access modifier, css class, and title
     # should be used for each attribute/function/value in the members.
     for attr, value in members:
@@ -605,14 +1379,12 @@ def get_obj_values(obj):
                 if is_magic(attr) and not INCLUDE_MAGIC_METHODS:
                     continue
 
-                # Get the method signature for attr.
-                params = get_callable_params(value)
-
-                # Get the documentation for the method.
-                value = inspect.getdoc(value)
+                # Skip determining function info entirely, if functions are not output.
+                if not INCLUDE_FUNCTIONS:
+                    continue
 
-                # Get the access modifier for the method.
-                access_modifier = _get_access_modifier(attr)
+                # Get the method signature, documentation, and access modifier for the method.
+                params, value, access_modifier = _get_function_metadata(function_metadata, obj, attr, value)
 
                 # Append function to list of functions
                 functions.append([attr, params, value, access_modifier])
@@ -682,6 +1454,74 @@ def get_obj_values(obj):
     return (attributes, functions)
 
 
+def _get_class_function_metadata(obj):
+    """Get the cached function info dict for the class of an object.
+
+    Cache is keyed on the class and the settings that affect function output, and holds at most
+    MEMBER_CACHE_SIZE classes, discarding the least recently used class first.
+
+    :param obj: Object (or class) to get class function info for.
+    :return: Dict of function name to (function key, params, doc, access modifier). None if caching is disabled.
+    """
+    if not MEMBER_CACHE_SIZE:
+        return None
+
+    owner = obj if inspect.isclass(obj) else type(obj)
+    cache_key = (owner, INCLUDE_PRIVATE_METHODS, INCLUDE_MAGIC_METHODS, INCLUDE_FUNCTIONS)
+
+    try:
+        function_metadata = member_metadata_cache[cache_key]
+        member_metadata_cache.move_to_end(cache_key)
+    except KeyError:
+        function_metadata = member_metadata_cache[cache_key] = {}
+        while len(member_metadata_cache) > MEMBER_CACHE_SIZE:
+            member_metadata_cache.popitem(last=False)
+    except TypeError:
+        # Unhashable class. Skip caching.
+        function_metadata = None
+
+    return function_metadata
+
+
+def _get_function_metadata(function_metadata, obj, attr, value):
+    """Get the params, doc, and access modifier for a member function, using cached values when possible.
+
+    Cached values are only used if the member still resolves to the same underlying function. So instance-level
+    callables that override or shadow a class function are still determined individually.
+
+    :param function_metadata: Class function info dict, as returned by _get_class_function_metadata().
+    :param obj: Object the function is a member of.
+    :param attr: Name of the function member.
+    :param value: Function member value.
+    :return: Tuple of (params, doc, access modifier).
+    """
+    # Bound methods share the same underlying function across every instance of a class.
+    function_key = getattr(value, '__func__', None)
+    if function_key is None:
+        function_key = value
+
+        # Bound builtin methods have no underlying function, and are recreated on each access.
+        # So use the class-level descriptor instead, provided the instance does not shadow it.
+        if getattr(value, '__self__', None) is not None and not inspect.isclass(obj):
+            instance_dict = getattr(obj, '__dict__', None)
+            if not isinstance(instance_dict, dict) or attr not in instance_dict:
+                function_key = inspect.getattr_static(type(obj), attr, value)
+
+    if function_metadata is not None:
+        entry = function_metadata.get(attr)
+        if entry is not None and entry[0] is function_key:
+            return entry[1:]
+
+    params = get_callable_params(value)
+    doc = inspect.getdoc(value)
+    access_modifier = _get_access_modifier(attr)
+
+    if function_metadata is not None:
+        function_metadata[attr] = (function_key, params, doc, access_modifier)
+
+    return params, doc, access_modifier
+
+
 def _get_access_modifier(obj):
     """Return the access modifier that should be used."""
     if is_magic(obj):
@@ -698,51 +1538,11 @@ def _get_access_modifier(obj):
 
 def _process_root_indices(start, end, parent_length):
     """Parse and validate indexes into expected format. Allows use of user-specified index ranges on root element."""
-
-    # Save for later processing
-    orig_end = end
-
-    # Handle defaults.
-    # If we got this far, at least one is set. Make sure the other is set as well.
-    if start is None:
-        start = 0
-    if end is None:
-        end = MAX_ITERABLE_LENGTH
-
-    # Handle if provided start_index is negative.
-    if start < 0:
-        start = parent_length + start
-
-        # Reset if still negative.
-        if start < 0:
-            start = 0
-
-    # If the original value of end is None, there is no specified end and
-    # it makes sense to then run from the start, now that it is calculated,
-    # to the max iterable length.
-    if orig_end is None:
-        end = start + MAX_ITERABLE_LENGTH
-
-    # Handle if provided end_index is negative.
-    if end < 0:
-        end = parent_length + end
-
-        # Reset if still negative.
-        if end < 0:
-            end = 0
-
-    # Handle if user provided a start_index that is higher than end_index.
-    if start > end:
-        temp = start
-        start = end
-        end = temp
-
-    # Return the processed indices.
-    return start, end
+    return process_index_range(start, end, parent_length, MAX_ITERABLE_LENGTH)
 
 
-def _get_collapsable_values():
-    """Get the arrow and collapsable values"""
+def get_collapsable_values():
+    """Get the arrow and collapsable values. Shared by the template and pure-Python HTML renderers."""
 
     # Determine default sets.
     content_set = {
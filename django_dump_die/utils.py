@@ -1,15 +1,31 @@
 """Utils for dump die"""
 
 # System Imports.
+import ast
 import copy
 import inspect
 import io
 import linecache
+import os
 import re
+import threading
+import time
 import tokenize
+from collections import OrderedDict, namedtuple
 from collections.abc import Sequence
+from contextlib import ExitStack
 from decimal import Decimal
 from enum import EnumMeta, Enum as OrigEnum
+from itertools import islice
+from types import (
+    BuiltinFunctionType,
+    ClassMethodDescriptorType,
+    FunctionType,
+    GetSetDescriptorType,
+    MemberDescriptorType,
+    MethodDescriptorType,
+    WrapperDescriptorType,
+)
 from tokenize import (
     generate_tokens,
     ENDMARKER,
@@ -22,16 +38,71 @@ from tokenize import (
 
 # Third-Party Imports.
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import connections
+from django.db.models import Model, QuerySet
 from django.http import QueryDict
 
 # Internal Imports.
-from django_dump_die.constants import COLORIZE_DUMPED_OBJECT_NAME, INCLUDE_FILENAME_LINENUMBER, PYTZ_PRESENT
+from django_dump_die.constants import (
+    CALL_SITE_CACHE_SIZE,
+    COLORIZE_DUMPED_OBJECT_NAME,
+    DEEPCOPY_MODE,
+    EXPAND_MODEL_RELATIONS,
+    INCLUDE_FILENAME_LINENUMBER,
+    MAX_ITERABLE_LENGTH,
+    MAX_RECURSION_DEPTH,
+    PYTZ_PRESENT,
+    SIMPLE_TYPES,
+    INTERMEDIATE_TYPES,
+    ADDITIONAL_SIMPLE_TYPES,
+    ADDITIONAL_INTERMEDIATE_TYPES,
+)
 
 # Imports that may not be accessible, depending on local python environment setup.
 if PYTZ_PRESENT:
     import pytz
 
 
+# Resolved dumped object text for each dump/dd call site. Keyed on (code object, last instruction).
+# Each entry records the source file modification time, so that entries are re-resolved once the file is edited.
+# Holds at most CALL_SITE_CACHE_SIZE entries, as are the other call site caches below.
+call_site_text_cache = OrderedDict()
+
+# Seconds between checks of whether the source file of a cached call site has been modified.
+# Within this time, repeat dumps from the same call site (such as within a loop) do not access the file at all.
+SOURCE_CHECK_INTERVAL = 1
+
+# Index of all dump/dd calls within each source file. Keyed on filename.
+# Each entry records the source file modification time, so that files are parsed again once edited.
+call_index_cache = OrderedDict()
+
+# Function names to index as dump/dd calls. Also the names of the dump/dd builtins added by the middleware.
+DUMP_FUNCTION_NAMES = ('dump', 'dd')
+
+# Module that defines the dump/dd functions, to recognize them when imported under other names.
+DUMP_FUNCTION_MODULE = 'django_dump_die.middleware'
+
+# Processed (colorized) name parts for each dumped object name.
+object_name_cache = OrderedDict()
+
+# Location of a dump call, for lazily dumped objects.
+# Holds the same attributes as a frame, for only the parts used to later determine the dumped object name.
+# Avoids keeping the frame itself alive, along with all of its local variables.
+CallSite = namedtuple('CallSite', ['f_code', 'f_lasti', 'f_lineno', 'f_globals'])
+
+
+class LazyObjectInfo:
+    """Lazily dumped object. Processed into full object info at render time, via resolve_object_info()."""
+    __slots__ = ('call_site', 'obj', 'start_index', 'end_index', 'original_obj')
+
+    def __init__(self, call_site, obj, start_index, end_index, original_obj):
+        self.call_site = call_site
+        self.obj = obj
+        self.start_index = start_index
+        self.end_index = end_index
+        self.original_obj = original_obj
+
+
 class Enum:
     """Enum faker class so an entire Enum can be dumped correctly."""
     def __init__(self, *args, **kwargs):
@@ -40,22 +111,93 @@ class Enum:
             setattr(self, key, val)
 
 
+class QueryCounter:
+    """Context manager to count the database queries executed within it, across all database connections."""
+
+    def __init__(self):
+        self.count = 0
+        self._exit_stack = None
+
+    def __enter__(self):
+        self._exit_stack = ExitStack()
+        for connection in connections.all():
+            self._exit_stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._exit_stack.close()
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper. Counts the query, then executes it as normal."""
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
 def get_dumped_object_info(obj, index_range=None, deepcopy=False):
     """Get all the required information to be able to dump an object"""
     # Get object filename, linenumber, and name
     filename, linenumber, obj_name = get_dumped_object_name_and_location(obj)
 
-    # Process the object name to add coloring and/or put in correct format for the template.
-    obj_name = process_object_name(obj_name)
+    # Sanitize and validate provided index values.
+    start_index, end_index = sanitize_index_range(index_range)
 
-    # Handle if function.
-    function_doc = None
-    if callable(obj) and not inspect.isclass(obj):
-        function_doc = inspect.getdoc(obj)
+    # Get object in the form to output.
+    obj, original_obj = _prepare_dumped_object(obj, deepcopy, start_index, end_index)
+
+    return _build_object_info(filename, linenumber, obj_name, obj, start_index, end_index, original_obj)
+
+
+def get_lazy_dumped_object_info(obj, index_range=None, deepcopy=False):
+    """Record the minimum information required to later dump an object.
+
+    Only the call site location and a reference to the object are kept.
+    All other processing is deferred until render time, via resolve_object_info().
+
+    NOTE: Unless deepcopy is set, the object is displayed as it is at render time, not at dump time.
+    """
+    # Get the frame where the dump occurred.
+    base_frame = inspect.currentframe().f_back.f_back
+    call_site = CallSite(base_frame.f_code, base_frame.f_lasti, base_frame.f_lineno, base_frame.f_globals)
 
     # Sanitize and validate provided index values.
     start_index, end_index = sanitize_index_range(index_range)
 
+    # Get object in the form to output.
+    # Has to happen now for deepcopy, to capture the current object state.
+    obj, original_obj = _prepare_dumped_object(obj, deepcopy, start_index, end_index)
+
+    return LazyObjectInfo(call_site, obj, start_index, end_index, original_obj)
+
+
+def resolve_object_info(object_info):
+    """Get all the required information to be able to dump an object, for a lazily dumped object.
+
+    Object info that has already been fully processed is returned as-is.
+    """
+    if not isinstance(object_info, LazyObjectInfo):
+        return object_info
+
+    # Get object filename, linenumber, and name
+    filename, linenumber, obj_name = get_dumped_object_name_and_location(object_info.obj, object_info.call_site)
+
+    return _build_object_info(
+        filename,
+        linenumber,
+        obj_name,
+        object_info.obj,
+        object_info.start_index,
+        object_info.end_index,
+        object_info.original_obj,
+    )
+
+
+def _prepare_dumped_object(obj, deepcopy, start_index=None, end_index=None):
+    """Convert a dumped object into the form to output.
+
+    :param start_index: Start of the index range of root entries to output, for snapshots to copy.
+    :param end_index: End of the index range of root entries to output, for snapshots to copy.
+    :return: Tuple of (obj, original_obj). Original obj is only set if deepcopied.
+    """
     # Handle if Enum by converting to a standard class.
     # NOTE: Dumping an Enum without conversion results in a blank string being dumped.
     if isinstance(obj, EnumMeta):
@@ -63,23 +205,52 @@ def get_dumped_object_info(obj, index_range=None, deepcopy=False):
 
     # Handle if deepcopy set.
     original_obj = None
-    try:
-        if deepcopy:
+    if deepcopy:
+        if DEEPCOPY_MODE == 'snapshot':
             original_obj = obj
-            obj = copy.deepcopy(obj)
-    except TypeError as type_error:
-        original_obj = None
-        raise TypeError(f"Object contains type that can't be deep copied. - {type_error}") from None
+            obj = snapshot_object(obj, start_index, end_index)
+        elif DEEPCOPY_MODE == 'full':
+            try:
+                original_obj = obj
+                obj = copy.deepcopy(obj)
+            except TypeError as type_error:
+                original_obj = None
+                raise TypeError(f"Object contains type that can't be deep copied. - {type_error}") from None
+        else:
+            raise ValueError(
+                f"Unknown DJANGO_DD_DEEPCOPY_MODE value '{DEEPCOPY_MODE}'. Must be 'full' or 'snapshot'."
+            )
+
+    return obj, original_obj
+
+
+def _build_object_info(filename, linenumber, obj_name, obj, start_index, end_index, original_obj):
+    """Build the object info tuple for a dumped object, from its already determined location and name."""
+
+    # Process the object name to add coloring and/or put in correct format for the template.
+    obj_name = process_object_name(obj_name)
+
+    # Handle if function.
+    function_doc = None
+    if callable(obj) and not inspect.isclass(obj):
+        function_doc = inspect.getdoc(obj)
 
     return (filename, linenumber, obj_name, obj, function_doc, start_index, end_index, original_obj)
 
 
-def get_dumped_object_name_and_location(object_needing_name):
-    """Look at the stack frame to figure out what the dumped var is"""
+def get_dumped_object_name_and_location(object_needing_name, base_frame=None):
+    """Look at the stack frame to figure out what the dumped var is.
+
+    :param object_needing_name: The dumped object.
+    :param base_frame: Frame (or CallSite) where the dump or dd occurred. Defaults to the frame calling dump or dd.
+    """
 
     # Get the frame where the dump or dd occurred.
-    base_frame = inspect.currentframe().f_back.f_back.f_back
-    frame_info = inspect.getframeinfo(base_frame)
+    if base_frame is None:
+        base_frame = inspect.currentframe().f_back.f_back.f_back
+
+    # Get the text passed to dump or dd. Only parsed from source once per call site.
+    source_filename, dumped_text = _get_call_site_text(base_frame)
 
     # Default to not showing filename and lineno via setting to None
     linenumber = None
@@ -87,13 +258,242 @@ def get_dumped_object_name_and_location(object_needing_name):
     # If we are to show the filename and linenumber
     if INCLUDE_FILENAME_LINENUMBER:
         # Get line number
-        linenumber = frame_info.lineno
+        linenumber = base_frame.f_lineno
         # Get filename
-        filename = frame_info.filename
+        filename = source_filename
+
+    # If function get the callable name for each function name.
+    if callable(object_needing_name) and not inspect.isclass(object_needing_name):
+        dumped_text = get_callable_name(dumped_text, object_needing_name)
+
+    return filename, linenumber, dumped_text
+
+
+def _get_call_site_text(base_frame):
+    """Get the source filename and the text passed to dump or dd, for the call at the given frame.
+
+    Results are cached per call site, so repeat dumps from the same line (such as within a loop) skip source parsing.
+    Cached results are discarded if the source file has been modified since, checked at most once per
+    SOURCE_CHECK_INTERVAL.
+    """
+    # Key on exact instruction, to tell apart multiple calls on the same line.
+    cache_key = (base_frame.f_code, base_frame.f_lasti)
+
+    # Check for a cached result that is still current.
+    cache_entry = _get_cache_entry(call_site_text_cache, cache_key)
+    if cache_entry is not None:
+        source_filename, mtime, dumped_text, checked_time = cache_entry
+        current_time = time.monotonic()
+        if current_time - checked_time < SOURCE_CHECK_INTERVAL:
+            return source_filename, dumped_text
+        if _get_mtime(source_filename) == mtime:
+            _set_cache_entry(call_site_text_cache, cache_key, (source_filename, mtime, dumped_text, current_time))
+            return source_filename, dumped_text
+
+    # Find the call in the parsed source file.
+    source_filename = base_frame.f_code.co_filename
+    mtime = _get_mtime(source_filename)
+    dumped_text = None
+    if mtime is not None:
+        dumped_text = _get_indexed_dumped_text(base_frame, source_filename, mtime)
+
+    # Fall back to parsing the dumped line directly.
+    # Such as for calls through an aliased function name, or source that cannot be parsed as a whole.
+    if dumped_text is None:
+        source_filename = inspect.getsourcefile(base_frame.f_code) or inspect.getfile(base_frame.f_code)
+        linecache.checkcache(source_filename)
+        dumped_text = _parse_dumped_text(base_frame, source_filename)
+        mtime = _get_mtime(source_filename)
+
+    # Only cache if source is an actual file, to be able to tell when it changes.
+    if mtime is not None:
+        _set_cache_entry(call_site_text_cache, cache_key, (source_filename, mtime, dumped_text, time.monotonic()))
+
+    return source_filename, dumped_text
+
+
+def _get_cache_entry(cache, key):
+    """Get an entry of a call site cache, marking it as most recently used. Returns None if not cached."""
+    try:
+        value = cache[key]
+        cache.move_to_end(key)
+    except KeyError:
+        # Not cached, or discarded by another thread in the meantime.
+        return None
+    return value
+
+
+def _set_cache_entry(cache, key, value):
+    """Set an entry of a call site cache, discarding the least recently used entries if over CALL_SITE_CACHE_SIZE."""
+    if not CALL_SITE_CACHE_SIZE:
+        return
+
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > CALL_SITE_CACHE_SIZE:
+        try:
+            cache.popitem(last=False)
+        except KeyError:
+            # Emptied by another thread in the meantime.
+            break
+
+
+def _get_indexed_dumped_text(base_frame, filename, mtime):
+    """Get the text passed to dump or dd from the call index of the source file. Returns None if not found."""
+    calls = _get_call_index(filename, mtime, base_frame.f_globals).get(base_frame.f_lineno)
+    if not calls:
+        return None
+
+    if len(calls) > 1:
+        # Multiple calls on the line. Match on the exact source position of the executing call.
+        position = _get_frame_position(base_frame)
+        for call in calls:
+            if call[:4] == position:
+                return call[4]
+
+        # Source positions are unavailable (or did not match), so the executing call cannot be told apart.
+        return None
+
+    return calls[0][4]
+
+
+def _get_frame_position(frame):
+    """Get the (lineno, end_lineno, col_offset, end_col_offset) source position of the executing frame instruction.
+
+    Only available in Python 3.11 and above. Returns None otherwise.
+    """
+    try:
+        positions = frame.f_code.co_positions()
+    except AttributeError:
+        return None
+    # Instructions are two bytes each.
+    return next(islice(positions, frame.f_lasti // 2, None), None)
+
+
+def _get_call_index(filename, mtime, module_globals):
+    """Get the index of all dump/dd calls in a source file, parsing the file if not already indexed.
+
+    :return: Dict of line number to a list of calls that span the line.
+        Each call is a tuple of (lineno, end_lineno, col_offset, end_col_offset, dumped text).
+    """
+    cache_entry = _get_cache_entry(call_index_cache, filename)
+    if cache_entry is not None and cache_entry[0] == mtime:
+        return cache_entry[1]
+
+    linecache.checkcache(filename)
+    source = ''.join(linecache.getlines(filename, module_globals))
+    call_index = _index_dump_calls(source, module_globals)
+    _set_cache_entry(call_index_cache, filename, (mtime, call_index))
+
+    return call_index
+
+
+def _index_dump_calls(source, module_globals=None):
+    """Parse source code and index all dump/dd calls by each line they span.
+
+    :param source: Source code to parse.
+    :param module_globals: Globals of the module the source is from, to resolve which called names are dump/dd.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return {}
+
+    # Whether each called name refers to dump/dd, as resolving a name is the same for every call to it.
+    dump_names = {}
+
+    call_index = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        called_name = _get_called_name(node.func)
+        if called_name is None:
+            continue
+        if called_name not in dump_names:
+            dump_names[called_name] = _is_dump_function_name(called_name, module_globals or {})
+        if not dump_names[called_name]:
+            continue
+
+        # Get the dumped object argument, whether passed by position or keyword.
+        if node.args:
+            argument = node.args[0]
+        else:
+            argument = next((keyword.value for keyword in node.keywords if keyword.arg == 'obj'), None)
+        if argument is None:
+            continue
+
+        dumped_text = ast.get_source_segment(source, argument)
+        if dumped_text is None:
+            continue
+
+        # Strip out extra whitespace, if present. Such as for arguments spanning multiple lines.
+        dumped_text = re.sub(r'\s+', ' ', dumped_text)
+
+        call = (node.lineno, node.end_lineno, node.col_offset, node.end_col_offset, dumped_text)
+        for line_num in range(node.lineno, node.end_lineno + 1):
+            call_index.setdefault(line_num, []).append(call)
+
+    # Order calls on each line by source position.
+    for calls in call_index.values():
+        calls.sort()
+
+    return call_index
+
+
+def _get_called_name(func):
+    """Get the dotted name of a called function, for either plain (``dd()``) or attribute (``module.dd()``) calls.
+
+    Returns None if the function is not called by name. Such as ``get_dump()()``.
+    """
+    attributes = []
+    while isinstance(func, ast.Attribute):
+        attributes.append(func.attr)
+        func = func.value
+    if not isinstance(func, ast.Name):
+        return None
+    return '.'.join([func.id, *reversed(attributes)])
+
+
+def _is_dump_function_name(called_name, module_globals):
+    """Return if a called (dotted) name refers to dump/dd, when called from a module with the given globals.
+
+    Plain dump/dd names are the builtins added by the middleware, unless imported from elsewhere, such as
+    ``from json import dump``. Any other name must resolve to the dump/dd functions, such as ``middleware.dump``
+    or an aliased import. Names that cannot be resolved (such as local variables) are not indexed.
+    """
+    parts = called_name.split('.')
+    if parts[0] not in module_globals:
+        return called_name in DUMP_FUNCTION_NAMES
+
+    # Resolve statically, so that resolving never runs any code.
+    value = module_globals[parts[0]]
+    for part in parts[1:]:
+        try:
+            value = inspect.getattr_static(value, part)
+        except AttributeError:
+            return False
+
+    if getattr(value, '__module__', None) == DUMP_FUNCTION_MODULE:
+        return getattr(value, '__name__', None) in DUMP_FUNCTION_NAMES
+
+    # Also allow wrappers defined in the same module, using the same names.
+    return called_name in DUMP_FUNCTION_NAMES and getattr(value, '__module__', None) == module_globals.get('__name__')
+
+
+def _get_mtime(filename):
+    """Get the modification time of a file. Returns None if it is not an accessible file."""
+    try:
+        return os.stat(filename).st_mtime_ns
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def _parse_dumped_text(base_frame, filename):
+    """Parse source of the dump or dd call at the given frame, for the text that was passed to it."""
 
     # Parse line that called, for full "name" to output.
     # Accounts for things like functions that span multiple lines.
-    code_context = get_fully_qualified_dumped_line(base_frame, frame_info)
+    code_context = get_fully_qualified_dumped_line(base_frame, filename)
 
     # TODO: This work of using RegEx to get down to the dumped object name can probably be improved.
     # Establish a couple of regular expressions to fetch out what was passed to dump or dd.
@@ -117,14 +517,10 @@ def get_dumped_object_name_and_location(object_needing_name):
         else:
             break
 
-    # If function get the callable name for each function name.
-    if callable(object_needing_name) and not inspect.isclass(object_needing_name):
-        dumped_text = get_callable_name(dumped_text, object_needing_name)
-
-    return filename, linenumber, dumped_text
+    return dumped_text
 
 
-def get_fully_qualified_dumped_line(base_frame, frame_info):
+def get_fully_qualified_dumped_line(base_frame, filename):
     """Loop through frame info until we get full object name.
 
     Required for definitions of things that span multiple lines, within a given dump/dd statement.
@@ -146,7 +542,7 @@ def get_fully_qualified_dumped_line(base_frame, frame_info):
 
         # Check line for parsing actual name info.
         line_num += 1
-        line = linecache.getline(frame_info.filename, line_num, base_frame.f_globals)
+        line = linecache.getline(filename, line_num, base_frame.f_globals)
         code_context += line
 
         # Get the tokens out of the string.
@@ -173,7 +569,20 @@ def get_fully_qualified_dumped_line(base_frame, frame_info):
 
 
 def process_object_name(object_name):
-    """Process the object name into a dictionary of parts that can be colorized in output"""
+    """Process the object name into a dictionary of parts that can be colorized in output.
+
+    Results are cached per name, as the same names are dumped repeatedly.
+    """
+    cache_key = (object_name, COLORIZE_DUMPED_OBJECT_NAME)
+    name = _get_cache_entry(object_name_cache, cache_key)
+    if name is None:
+        name = _process_object_name(object_name)
+        _set_cache_entry(object_name_cache, cache_key, name)
+    return name
+
+
+def _process_object_name(object_name):
+    """Process the object name into a dictionary of parts that can be colorized in output. Uncached."""
 
     # List to return for the name
     name = []
@@ -314,28 +723,85 @@ def sanitize_index_range(index_range):
     return start_index, end_index
 
 
+def process_index_range(start, end, parent_length, max_length):
+    """Parse and validate a user-specified index range, into the (start, end) range of entries to output.
+
+    :param start: Start index. May be negative. If None, starts from the first entry.
+    :param end: End index. May be negative. If None, outputs up to max_length entries from the start.
+    :param parent_length: Number of entries in the indexed object.
+    :param max_length: Max number of entries to output by default. None means no limit.
+    """
+    # Save for later processing
+    orig_end = end
+
+    # Handle defaults.
+    # If we got this far, at least one is set. Make sure the other is set as well.
+    if start is None:
+        start = 0
+    if end is None:
+        end = parent_length if max_length is None else max_length
+
+    # Handle if provided start_index is negative.
+    if start < 0:
+        start = parent_length + start
+
+        # Reset if still negative.
+        if start < 0:
+            start = 0
+
+    # If the original value of end is None, there is no specified end and
+    # it makes sense to then run from the start, now that it is calculated,
+    # to the max iterable length. A max iterable length of None means no limit.
+    if orig_end is None and max_length is not None:
+        end = start + max_length
+
+    # Handle if provided end_index is negative.
+    if end < 0:
+        end = parent_length + end
+
+        # Reset if still negative.
+        if end < 0:
+            end = 0
+
+    # Handle if user provided a start_index that is higher than end_index.
+    if start > end:
+        temp = start
+        start = end
+        end = temp
+
+    # Return the processed indices.
+    return start, end
+
+
 # region Object Property Functions
 
 
 def generate_unique_from_obj(obj):
-    """Generate a unique identifier for the object passed in."""
+    """Generate a unique identifier for the object passed in.
 
-    # Create unique via hash and fallback to id on exception.
-    try:
-        unique = hash(obj)
-    except Exception:
-        unique = id(obj)
-    # Append the class name to the unique to really make unique.
-    unique = f'{get_class_name(obj)}_{unique}'
+    Based on object identity, so never calls (potentially slow) ``__hash__`` implementations, and equal but distinct
+    objects get different uniques. Ids are only distinct among objects alive at the same time, so renders keep every
+    object alive until they end. See UniqueRegistry.
+    """
+    # Append the class name to the id to really make unique.
+    return f'{get_class_name(obj)}_{id(obj)}'
 
-    return unique
 
+def get_members(obj, attribute_guard=None):
+    """Attempts to get object members. Falls back to an empty list.
 
-def get_members(obj):
-    """Attempts to get object members. Falls back to an empty list."""
+    :param attribute_guard: Optional AttributeGuard instance. If provided, descriptor attributes (such as properties)
+        are read through it, and may be returned as UnevaluatedAttribute instances instead of their values.
+    """
 
     # Get initial member set or empty list.
-    members = inspect.getmembers(obj)
+    if isinstance(obj, Model) and not EXPAND_MODEL_RELATIONS:
+        # Model instances get special handling, to avoid database queries from unloaded relations.
+        members = get_model_members(obj, attribute_guard)
+    elif attribute_guard is not None and not isinstance(obj, type):
+        members = get_guarded_members(obj, attribute_guard)
+    else:
+        members = inspect.getmembers(obj)
 
     # Add type specific members that will not be included from the use of the inspect.getmembers function.
     if is_dict(obj):
@@ -352,7 +818,7 @@ def get_members(obj):
 
     elif is_iterable(obj):
         # Lists, sets, etc.
-        if _is_indexable(obj):
+        if get_type_category(obj).shape == SHAPE_SEQUENCE:
             # Use indexes as left half.
             members.extend(list(enumerate(obj)))
         elif is_set(obj):
@@ -365,6 +831,78 @@ def get_members(obj):
     return members
 
 
+def get_model_members(obj, attribute_guard=None):
+    """Get members of a model instance, without triggering database queries.
+
+    Concrete field values are read directly, with foreign keys shown as their PK value (such as ``author_id``).
+    Relations are only included if they are already loaded on the instance, such as through ``select_related()``,
+    ``prefetch_related()``, or previous access. Deferred fields are excluded.
+
+    :param attribute_guard: Optional AttributeGuard instance, used to read all remaining (non-field) members.
+    """
+    opts = obj._meta
+    members = []
+    handled_names = set(obj.get_deferred_fields())
+
+    # Get concrete field values. Foreign keys are handled by their attname, which holds the PK value.
+    for field in opts.concrete_fields:
+        if field.attname not in handled_names:
+            members.append((field.attname, getattr(obj, field.attname)))
+            handled_names.add(field.attname)
+
+    # Get relations that are already loaded.
+    for field in opts.get_fields():
+        if not field.is_relation:
+            continue
+
+        # Reverse relations are accessed by their accessor name, such as "book_set".
+        if field.auto_created and not field.concrete:
+            name = field.get_accessor_name()
+        else:
+            name = field.name
+        if not name:
+            continue
+        handled_names.add(name)
+
+        # Single object relations are cached on the instance once loaded.
+        if not (field.one_to_many or field.many_to_many) and field.is_cached(obj):
+            members.append((name, field.get_cached_value(obj)))
+
+    # Multiple object relations are only available when prefetched.
+    prefetched_objects = getattr(obj, '_prefetched_objects_cache', {})
+    for name, queryset in prefetched_objects.items():
+        members.append((name, queryset))
+        handled_names.add(name)
+
+    # Get all remaining (non-field) members, the same way inspect.getmembers() does.
+    for name in dir(obj):
+        if name in handled_names:
+            continue
+        try:
+            if attribute_guard is None:
+                members.append((name, getattr(obj, name)))
+            else:
+                members.append((name, attribute_guard.getattr(obj, name)))
+        except AttributeError:
+            continue
+
+    members.sort(key=lambda member: member[0])
+    return members
+
+
+def get_guarded_members(obj, attribute_guard):
+    """Get members of an object, the same way inspect.getmembers() does, but reading through an AttributeGuard."""
+    members = []
+    for name in dir(obj):
+        try:
+            members.append((name, attribute_guard.getattr(obj, name)))
+        except AttributeError:
+            continue
+
+    members.sort(key=lambda member: member[0])
+    return members
+
+
 def get_class_name(obj):
     """Get class name of an object."""
     name = None
@@ -444,6 +982,10 @@ def safe_str(obj):
 
 def is_iterable(obj):
     """Return True if object can be iterated."""
+    # Queries are always iterable. Avoids len(), which would fetch every row of the query.
+    if get_type_category(obj).shape == SHAPE_QUERY:
+        return True
+
     try:
         iter(obj) and len(obj)
     except NotImplementedError:
@@ -457,23 +999,30 @@ def is_iterable(obj):
 
 def is_query(obj):
     """Return True if object is most likely a query."""
-    if obj is not None:
-        return _in_dir(obj, 'as_manager') and _in_dir(obj, 'all') and _in_dir(obj, 'filter')
+    return get_type_category(obj).shape == SHAPE_QUERY
+
+
+def is_query_evaluated(obj):
+    """Return True if object is a QuerySet that has already fetched its rows."""
+    # pylint: disable=protected-access
+    # Django has no public API to check this without evaluating the query.
+    return isinstance(obj, QuerySet) and obj._result_cache is not None
 
 
 def is_dict(obj):
     """Return True if object is most likely a dict."""
-    if obj is not None:
-        return _in_dir(obj, 'items') and _in_dir(obj, 'keys') and _in_dir(obj, 'values')
+    return get_type_category(obj).shape == SHAPE_DICT
 
 
 def is_set(obj):
-    """Return True if object is most likely a dict."""
-    return isinstance(obj, set) or isinstance(obj, frozenset)
+    """Return True if object is most likely a set."""
+    return get_type_category(obj).shape == SHAPE_SET
+
 
 def is_enum_member(obj):
     """Return True if object is most likely a enum"""
-    return issubclass(type(obj), OrigEnum)
+    return get_type_category(obj).shape == SHAPE_ENUM
+
 
 def is_const(obj):
     """Return True if object is most likely a constant."""
@@ -507,17 +1056,438 @@ def is_magic(obj):
     if obj is not None:
         return isinstance(obj, str) and obj.startswith('__') and obj.endswith('__')
 
+# endregion Object Property Functions
 
-def _in_dir(obj, attr):
-    """Simpler hasattr() function without side effects."""
-    return attr in dir(obj)
 
+# region Attribute Guard
 
-def _is_indexable(obj):
-    """Return True if object can be indexed."""
-    if isinstance(obj, Sequence):
-        return True
+class UnevaluatedAttribute:
+    """Placeholder for an attribute value that was not evaluated by an AttributeGuard.
+
+    Output as "not evaluated", with the option to load the actual value on click.
+    """
+    __slots__ = ('owner', 'name', 'descriptor_type', 'elapsed', 'setting')
+
+    def __init__(self, owner, name, descriptor_type, elapsed, setting):
+        # Object the attribute belongs to.
+        self.owner = owner
+        self.name = name
+        # Class name of the descriptor that provides the attribute, such as "property".
+        self.descriptor_type = descriptor_type
+        # Milliseconds the attribute took to evaluate, if it was previously evaluated. Otherwise None.
+        self.elapsed = elapsed
+        # Name of the setting that prevented evaluation.
+        self.setting = setting
+
+    def __repr__(self):
+        return f'<UnevaluatedAttribute {self.name}>'
+
+
+class AttributeGuard:
+    """Guards reading descriptor attributes (properties, cached properties, etc) while processing dumped objects.
+
+    Descriptor types can be excluded entirely, through the deny/allow lists. Otherwise, each read is timed. Python has
+    no way to safely interrupt a running property, so a read that goes over the time limit still completes. But that
+    attribute is then not evaluated again for any other instance of the same class, for the rest of the render.
+    """
+    __slots__ = ('time_limit', 'denylist', 'allowlist', 'slow_attributes', 'lock')
+
+    def __init__(self, time_limit=None, denylist=(), allowlist=None):
+        self.time_limit = time_limit
+        self.denylist = set(denylist)
+        self.allowlist = None if allowlist is None else set(allowlist)
+        # Attributes that went over the time limit, as {(class, attribute name): elapsed milliseconds}.
+        self.slow_attributes = {}
+        # A single guard may be shared by several render threads. See DJANGO_DD_RENDER_THREADS.
+        self.lock = threading.Lock()
+
+    def getattr(self, obj, name):
+        """Get an attribute of an object. Same as getattr(), but may return an UnevaluatedAttribute instead."""
+        descriptor = _get_guarded_descriptor(obj, name)
+        if descriptor is None:
+            return getattr(obj, name)
+
+        descriptor_class = type(descriptor)
+        descriptor_names = {klass.__name__ for klass in descriptor_class.__mro__[:-1]}
+
+        # Check descriptor type lists.
+        if self.allowlist is not None and descriptor_names.isdisjoint(self.allowlist):
+            return UnevaluatedAttribute(obj, name, descriptor_class.__name__, None, 'DJANGO_DD_DESCRIPTOR_ALLOWLIST')
+        if not descriptor_names.isdisjoint(self.denylist):
+            return UnevaluatedAttribute(obj, name, descriptor_class.__name__, None, 'DJANGO_DD_DESCRIPTOR_DENYLIST')
+        if self.time_limit is None:
+            return getattr(obj, name)
+
+        # Check for attributes already known to be slow.
+        key = (type(obj), name)
+        with self.lock:
+            elapsed = self.slow_attributes.get(key)
+        if elapsed is not None:
+            return UnevaluatedAttribute(obj, name, descriptor_class.__name__, elapsed, 'DJANGO_DD_ATTRIBUTE_TIME_LIMIT')
+
+        start = time.perf_counter()
+        value = getattr(obj, name)
+        elapsed = (time.perf_counter() - start) * 1000
+        if elapsed > self.time_limit:
+            with self.lock:
+                self.slow_attributes[key] = round(elapsed)
+        return value
+
+
+# Descriptor types that are always cheap to read, so never need guarding.
+_UNGUARDED_DESCRIPTOR_TYPES = (
+    FunctionType,
+    BuiltinFunctionType,
+    MethodDescriptorType,
+    ClassMethodDescriptorType,
+    WrapperDescriptorType,
+    MemberDescriptorType,
+    GetSetDescriptorType,
+    staticmethod,
+    classmethod,
+)
+
+
+def _get_guarded_descriptor(obj, name):
+    """Get the class level descriptor that computes an attribute, if reading the attribute runs arbitrary code.
+
+    Functions, slots, and other builtin descriptors are cheap to read, so are not guarded. Neither are non-data
+    descriptors that already have a value in the instance dict, such as an already computed cached_property.
+
+    :return: The descriptor, or None if the attribute does not need guarding.
+    """
+    for klass in type(obj).__mro__:
+        if name in vars(klass):
+            descriptor = vars(klass)[name]
+            break
     else:
-        return False
+        return None
 
-# endregion Object Property Functions
+    descriptor_class = type(descriptor)
+    if not hasattr(descriptor_class, '__get__') or isinstance(descriptor, _UNGUARDED_DESCRIPTOR_TYPES):
+        return None
+
+    if not hasattr(descriptor_class, '__set__') and name in getattr(obj, '__dict__', {}):
+        return None
+
+    return descriptor
+
+# endregion Attribute Guard
+
+
+# region Type Classification
+
+# Display kinds of dumped objects. Determines how much of the object is output.
+TYPE_SIMPLE = 'simple'
+TYPE_INTERMEDIATE = 'intermediate'
+TYPE_COMPLEX = 'complex'
+
+# Container shapes of dumped objects. Determines how object entries are found and displayed.
+SHAPE_QUERY = 'query'
+SHAPE_DICT = 'dict'
+SHAPE_SET = 'set'
+SHAPE_SEQUENCE = 'sequence'
+SHAPE_ENUM = 'enum'
+SHAPE_OTHER = 'other'
+
+TypeCategory = namedtuple('TypeCategory', ['kind', 'shape'])
+
+# Memoized category of each type seen so far.
+# Class objects are keyed on the class itself, as dir() of a class differs from dir() of its metaclass.
+type_category_map = {}
+
+
+def get_type_category(obj):
+    """Return the display kind and container shape of an object, as a TypeCategory.
+
+    The category is only determined once per type, and then looked up for any further objects of that type. So the
+    shape only comes from members of the type, never from instance attributes, which differ between instances.
+    Objects that customize dir() (such as Django lazy objects) may answer differently per instance, so are always
+    determined individually.
+    """
+    if isinstance(obj, type):
+        key = obj
+    else:
+        key = type(obj)
+        if key.__dir__ is not object.__dir__:
+            return _determine_type_category(obj)
+
+    try:
+        return type_category_map[key]
+    except KeyError:
+        category = _determine_type_category(obj, dir(key))
+        type_category_map[key] = category
+        return category
+    except TypeError:
+        # Metaclass is unhashable. Skip memoization.
+        return _determine_type_category(obj, dir(key))
+
+
+def _determine_type_category(obj, obj_dir=None):
+    """Determine the display kind and container shape of an object.
+
+    :param obj_dir: Member names to check the shape against. If None, uses dir() of the object.
+    """
+    class_name = get_class_name(obj)
+
+    # Simple types are output directly, so are never checked for entries.
+    if obj is None or type(obj) in SIMPLE_TYPES or class_name in ADDITIONAL_SIMPLE_TYPES:
+        return TypeCategory(TYPE_SIMPLE, SHAPE_OTHER)
+
+    if (
+        # Special handling for pytz timezone objects.
+        (PYTZ_PRESENT and isinstance(obj, pytz.BaseTzInfo))
+        or type(obj) in INTERMEDIATE_TYPES
+        or class_name in ADDITIONAL_INTERMEDIATE_TYPES
+    ):
+        kind = TYPE_INTERMEDIATE
+    else:
+        kind = TYPE_COMPLEX
+
+    # Shapes are checked in order of precedence.
+    obj_dir = set(dir(obj) if obj_dir is None else obj_dir)
+    if {'as_manager', 'all', 'filter'} <= obj_dir:
+        shape = SHAPE_QUERY
+    elif {'items', 'keys', 'values'} <= obj_dir:
+        shape = SHAPE_DICT
+    elif isinstance(obj, (set, frozenset)):
+        shape = SHAPE_SET
+    elif isinstance(obj, Sequence):
+        shape = SHAPE_SEQUENCE
+    elif issubclass(type(obj), OrigEnum):
+        shape = SHAPE_ENUM
+    else:
+        shape = SHAPE_OTHER
+
+    return TypeCategory(kind, shape)
+
+# endregion Type Classification
+
+
+# region Snapshot
+
+def snapshot_object(obj, root_index_start=None, root_index_end=None, memo=None):
+    """Take a snapshot of a dumped object, preserving its current state for output.
+
+    Alternative to a full deepcopy, that only copies what is actually output. Values within the max recursion depth,
+    and the entries of iterables that are output, are copied. Anything past those limits is only output as a type and
+    unique, so is kept as a reference to the original value. Simple type values are immutable, and also kept as-is.
+
+    Cost scales with the output, rather than the size of the object. Values that cannot be copied are kept as references
+    to the original value, rather than raising an error. Values are walked with an explicit stack, so that deeply
+    nested objects never hit the recursion limit.
+
+    :param obj: Object to take a snapshot of.
+    :param root_index_start: Start of the index range of root entries to output. If None, uses default behavior.
+    :param root_index_end: End of the index range of root entries to output. If None, uses default behavior.
+    :param memo: Dict to fill with original object id to snapshot, for every value copied. If None, uses a new dict.
+    """
+    # Root entries are output within the root index range, which can go past the max iterable length.
+    index_range = None
+    if root_index_start is not None or root_index_end is not None:
+        try:
+            index_range = process_index_range(root_index_start, root_index_end, len(obj), MAX_ITERABLE_LENGTH)
+        except TypeError:
+            index_range = None
+
+    if memo is None:
+        memo = {}
+    root = [obj]
+    stack = []
+    root[0] = _snapshot_value(obj, 0, memo, stack, root, 0, index_range)
+
+    while stack:
+        task = stack.pop()
+        if task[0] is _SNAPSHOT_BUILD:
+            # All entries of an immutable value are now copied, so it can be created.
+            _, obj, values, parent, key = task
+            snapshot = memo[id(obj)] = _build_snapshot(obj, values)
+            _set_snapshot_entry(parent, key, snapshot)
+        else:
+            value, depth, parent, key = task
+            _set_snapshot_entry(parent, key, _snapshot_value(value, depth, memo, stack, parent, key))
+
+    return root[0]
+
+
+# Marks a stack task that creates an immutable snapshot, once all of its entries are copied.
+_SNAPSHOT_BUILD = object()
+
+
+def _snapshot_value(obj, depth, memo, stack, parent, key, index_range=None):
+    """Take a snapshot of a single value, at the given depth of the dumped object.
+
+    Copies the value itself, and adds a task to the stack for each of its entries to copy.
+
+    :param memo: Dict of original object id to snapshot. Ensures values referenced multiple times are only copied once.
+    :param stack: Stack of tasks remaining to copy.
+    :param parent: Snapshot (or list of entries for an immutable snapshot) that the value is an entry of.
+    :param key: Key of the value within the parent.
+    :param index_range: Range of entries to copy. If None, copies entries up to the max iterable length.
+    :return: Snapshot of the value. Immutable values are returned as-is, and replaced once all entries are copied.
+    """
+    obj_id = id(obj)
+    if obj_id in memo:
+        return memo[obj_id]
+
+    type_category = get_type_category(obj)
+
+    # Simple types, functions, and classes are output as-is.
+    if type_category.kind == TYPE_SIMPLE or inspect.isroutine(obj) or inspect.isclass(obj):
+        return obj
+
+    # Intermediate types do not have their children expanded, so only need a shallow copy.
+    if type_category.kind == TYPE_INTERMEDIATE:
+        snapshot = memo[obj_id] = _shallow_copy(obj)
+        return snapshot
+
+    # Past max depth, only the type and unique are output.
+    if depth > 0 and MAX_RECURSION_DEPTH is not None and depth >= MAX_RECURSION_DEPTH:
+        return obj
+
+    # Mark as in progress, so that cyclic references do not get copied again.
+    # Mutable values replace this with their copy, as soon as it exists.
+    memo[obj_id] = obj
+
+    if type_category.shape == SHAPE_QUERY:
+        snapshot = memo[obj_id] = _snapshot_query(obj)
+    elif type_category.shape == SHAPE_DICT and isinstance(obj, dict):
+        snapshot = _snapshot_dict(obj, depth, memo, stack)
+    elif (type_category.shape == SHAPE_SEQUENCE and isinstance(obj, (list, tuple))) or type_category.shape == SHAPE_SET:
+        snapshot = _snapshot_iterable(obj, depth, memo, stack, parent, key, index_range)
+    elif type_category.shape == SHAPE_ENUM:
+        # Enum members are singletons, which a deepcopy does not copy either.
+        snapshot = obj
+    else:
+        snapshot = _snapshot_instance(obj, depth, memo, stack)
+
+    return snapshot
+
+
+def _shallow_copy(obj):
+    """Shallow copy a value. Falls back to the original value if it cannot be copied."""
+    try:
+        return copy.copy(obj)
+    except Exception:
+        return obj
+
+
+def _push_snapshot_entries(stack, entries, depth, parent):
+    """Add a task to the stack to copy each entry, given as (key, value) pairs, into the parent snapshot."""
+    # Added in reverse, so that entries are copied in order.
+    for key, value in reversed(entries):
+        stack.append((value, depth, parent, key))
+
+
+def _set_snapshot_entry(parent, key, value):
+    """Set an entry of a snapshot. Keys are list indexes, dict keys, or slot attribute names."""
+    if isinstance(parent, list):
+        parent[key] = value
+    elif isinstance(parent, dict):
+        # Set raw dict values, as subclasses (such as QueryDict) may transform values on item assignment.
+        dict.__setitem__(parent, key, value)
+    else:
+        try:
+            setattr(parent, key, value)
+        except (AttributeError, TypeError):
+            pass
+
+
+def _build_snapshot(obj, values):
+    """Create the snapshot of an immutable value (tuple, set, or frozenset), from its copied entries."""
+    # The same as a deepcopy, tuples are kept as-is if no entry needed copying (such as strings), and anything else is
+    # always created again. So snapshot sets iterate in the same order as deepcopied ones.
+    # pylint: disable=unidiomatic-typecheck
+    if type(obj) is tuple and all(value is entry for value, entry in zip(values, obj)):
+        return obj
+
+    try:
+        if hasattr(obj, '_make'):
+            # Named tuple.
+            return obj._make(values)
+        return type(obj)(values)
+    except Exception:
+        return obj
+
+
+def _snapshot_query(obj):
+    """Take a snapshot of a query.
+
+    Query rows are fetched when output, so it is enough to copy the query itself. Evaluated querysets keep their fetched
+    rows, to avoid fetching them again.
+    """
+    if not isinstance(obj, QuerySet):
+        return obj
+    if is_query_evaluated(obj):
+        return _shallow_copy(obj)
+    return obj.all()
+
+
+def _snapshot_dict(obj, depth, memo, stack):
+    """Take a snapshot of a dict, or dict subclass.
+
+    Dict values are output regardless of the max iterable length, so all are copied.
+    """
+    snapshot = memo[id(obj)] = _shallow_copy(obj)
+    if snapshot is obj:
+        return obj
+
+    _push_snapshot_entries(stack, list(dict.items(obj)), depth + 1, snapshot)
+    return snapshot
+
+
+def _snapshot_iterable(obj, depth, memo, stack, parent, key, index_range):
+    """Take a snapshot of a list, tuple, set, or frozenset, or subclass of any.
+
+    Only entries within the index range (or max iterable length) are output, so only those are copied.
+    """
+    values = list(obj)
+    if index_range is None:
+        index_range = (0, len(values) if MAX_ITERABLE_LENGTH is None else MAX_ITERABLE_LENGTH)
+    entries = list(enumerate(values))[index_range[0]:index_range[1]]
+
+    if isinstance(obj, list):
+        snapshot = memo[id(obj)] = _shallow_copy(obj)
+        if snapshot is not obj:
+            _push_snapshot_entries(stack, entries, depth + 1, snapshot)
+        return snapshot
+
+    # Immutable values have to be created again, once all of their copied entries exist.
+    stack.append((_SNAPSHOT_BUILD, obj, values, parent, key))
+    _push_snapshot_entries(stack, entries, depth + 1, values)
+    return obj
+
+
+def _snapshot_instance(obj, depth, memo, stack):
+    """Take a snapshot of a class instance, copying its instance attributes."""
+    snapshot = memo[id(obj)] = _shallow_copy(obj)
+    if snapshot is obj:
+        return obj
+
+    # Copy attribute values, as class instance attributes are never limited by the max iterable length.
+    snapshot_dict = getattr(snapshot, '__dict__', None)
+    if isinstance(snapshot_dict, dict):
+        _push_snapshot_entries(stack, list(snapshot_dict.items()), depth + 1, snapshot_dict)
+
+    slot_entries = []
+    for slot in _get_slots(type(obj)):
+        try:
+            slot_entries.append((slot, getattr(obj, slot)))
+        except AttributeError:
+            continue
+    _push_snapshot_entries(stack, slot_entries, depth + 1, snapshot)
+
+    return snapshot
+
+
+def _get_slots(cls):
+    """Get all slot attribute names of a class, including those of parent classes."""
+    slots = []
+    for klass in cls.__mro__:
+        klass_slots = klass.__dict__.get('__slots__', ())
+        if isinstance(klass_slots, str):
+            klass_slots = (klass_slots,)
+        slots.extend(slot for slot in klass_slots if slot not in ('__dict__', '__weakref__'))
+    return slots
+
+# endregion Snapshot
@@ -1,4 +1,5 @@
 
+from .dd_expand_view import dd_expand_view
 from .dd_view import dd_view
 from .example_views import (
     index,
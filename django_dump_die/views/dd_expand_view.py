@@ -0,0 +1,43 @@
+"""View to output the contents of deferred (lazily expanded) dumped objects."""
+
+# Third-Party Imports.
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotFound
+from django.template.loader import render_to_string
+
+# Internal Imports.
+from django_dump_die.lazy_expansion import LAZY_SESSION_COOKIE, get_lazy_value
+from django_dump_die.renderers import render_complex_children, render_dump_context
+from django_dump_die.templatetags.dump_die import DeferredAttribute, render_scope
+
+
+def dd_expand_view(request):
+    """
+    Return the contents of a deferred dumped object, or the value of an unevaluated attribute, as an HTML fragment.
+    :param request: Request object. The deferred object is identified by the "token" GET parameter.
+    """
+    # Get rendering engine and lazy expansion depth, the same as the dd view.
+    renderer = getattr(settings, 'DJANGO_DD_RENDERER', 'template')
+    lazy_expand_depth = getattr(settings, 'DJANGO_DD_LAZY_EXPAND_DEPTH', None)
+
+    # Get the deferred object. Objects are only accessible from the browser session that originally dumped them.
+    lazy_session = request.COOKIES.get(LAZY_SESSION_COOKIE)
+    deferred_node = get_lazy_value(lazy_session, request.GET.get('token'))
+    if deferred_node is None:
+        return HttpResponseNotFound('Dumped object not found. It may have expired.')
+
+    # Render the object contents. Anything past the lazy expansion depth is deferred again.
+    # Attributes are output as a full value, in place of the "not evaluated" placeholder.
+    with render_scope(deferred_node.render_state(lazy_expand_depth, lazy_session)):
+        context = deferred_node.expand()
+        if isinstance(deferred_node, DeferredAttribute):
+            if renderer == 'python':
+                rendered_output = render_dump_context(context)
+            else:
+                rendered_output = render_to_string('django_dump_die/partials/_dump_object.html', context)
+        elif renderer == 'python':
+            rendered_output = render_complex_children(context)
+        else:
+            rendered_output = render_to_string('django_dump_die/partials/_complex_children.html', context)
+
+    return HttpResponse(rendered_output)
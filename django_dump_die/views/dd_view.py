@@ -1,8 +1,33 @@
 """Core view for DumpDie library. All logic renders from this."""
 
+# System Imports.
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
 # Third-Party Imports.
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import DatabaseError, connections
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.urls import get_script_prefix
+from django.utils.safestring import mark_safe
+
+# Internal Imports.
+from django_dump_die.constants import ATTRIBUTE_GUARD_ENABLED, LAZY_EXPAND_URL
+from django_dump_die.lazy_expansion import LAZY_SESSION_COOKIE, new_lazy_session
+from django_dump_die.renderers import json_dump_objects, render_dump_objects
+from django_dump_die.templatetags.dump_die import RenderState, add_snapshot_unique_map, render_scope
+from django_dump_die.utils import (
+    QueryCounter,
+    generate_unique_from_obj,
+    is_query,
+    is_query_evaluated,
+    resolve_object_info,
+    snapshot_object,
+)
 
 
 def dd_view(request, objects):
@@ -22,13 +47,52 @@ def dd_view(request, objects):
     custom_color_theme = getattr(settings, 'DJANGO_DD_COLOR_SCHEME', None)
     multiline_function_docs = getattr(settings, 'DJANGO_DD_MULTILINE_FUNCTION_DOCS', False)
 
+    # Get rendering engine for dumped objects.
+    renderer = getattr(settings, 'DJANGO_DD_RENDERER', 'template')
+
+    # Get output format. API clients can also request JSON through the Accept header.
+    output_format = getattr(settings, 'DJANGO_DD_OUTPUT_FORMAT', 'html')
+
+    # Get depth past which dumped object contents are only output once expanded.
+    lazy_expand_depth = getattr(settings, 'DJANGO_DD_LAZY_EXPAND_DEPTH', None)
+
+    # Get if page should be sent in parts, as each dumped object is rendered.
+    stream_output = getattr(settings, 'DJANGO_DD_STREAM_OUTPUT', False)
+
+    # Get number of background threads to render dumped objects with. None renders on the request thread.
+    render_threads = getattr(settings, 'DJANGO_DD_RENDER_THREADS', None)
+
     # Validate chosen themes.
     if force_light_theme and force_dark_theme:
         raise ValueError("You can't force both light and dark themes.")
 
-    # Render template.
-    return render(request, 'django_dump_die/dd.html', {
-        'objects': objects,
+    # Validate chosen renderer.
+    if renderer not in ('template', 'python'):
+        raise ValueError(f"Unknown DJANGO_DD_RENDERER value '{renderer}'. Must be 'template' or 'python'.")
+
+    # Validate chosen output format.
+    if output_format not in ('html', 'json'):
+        raise ValueError(f"Unknown DJANGO_DD_OUTPUT_FORMAT value '{output_format}'. Must be 'html' or 'json'.")
+
+    # Validate chosen render threads.
+    if render_threads is not None and (not isinstance(render_threads, int) or render_threads < 1):
+        raise ValueError(f"Invalid DJANGO_DD_RENDER_THREADS value '{render_threads}'. Must be None or at least 1.")
+
+    if output_format == 'json' or _accepts_json(request):
+        return _json_response(objects, render_threads)
+
+    # Deferred objects (and unevaluated attributes) are stored per browser session, so that only this browser can
+    # expand them.
+    lazy_session = None
+    lazy_expand_url = None
+    if lazy_expand_depth is not None or ATTRIBUTE_GUARD_ENABLED:
+        lazy_session = request.COOKIES.get(LAZY_SESSION_COOKIE) or new_lazy_session()
+        lazy_expand_url = get_script_prefix().rstrip('/') + LAZY_EXPAND_URL
+
+    # Unique tracking and render budget are scoped to this page, and discarded once it finishes rendering.
+    render_state = RenderState(lazy_depth=lazy_expand_depth, lazy_session=lazy_session)
+
+    context = {
         'include_util_toolbar': include_util_toolbar,
         'attrs_enabled': attrs_enabled,
         'funcs_enabled': funcs_enabled,
@@ -36,4 +100,290 @@ def dd_view(request, objects):
         'force_dark_theme': force_dark_theme,
         'custom_color_theme': custom_color_theme,
         'multiline_function_docs': multiline_function_docs,
+        'lazy_expand_url': lazy_expand_url,
+    }
+
+    if stream_output:
+        page_parts = _stream_page(request, objects, renderer, render_state, context)
+
+        # ASGI servers iterate the response asynchronously, and Django 4.2+ would first buffer a sync iterator in full.
+        # So generate each part in a thread as it is needed instead, which also keeps the event loop free.
+        if isinstance(request, ASGIRequest) and hasattr(StreamingHttpResponse, '__aiter__'):
+            page_parts = _iterate_in_thread(page_parts)
+
+        response = StreamingHttpResponse(page_parts)
+    else:
+        # Finish processing any lazily dumped objects.
+        objects = [resolve_object_info(object_info) for object_info in objects]
+
+        # Render dumped objects up front, counting any database queries that dumping them triggers.
+        if render_threads is not None and len(objects) > 1:
+            with QueryCounter() as query_counter:
+                rendered_objects = _render_in_pool(
+                    objects,
+                    lambda group: _render_objects(group, renderer),
+                    render_state,
+                    render_threads,
+                )
+            dump_query_count = query_counter.count
+            rendered_objects = mark_safe('<hr>'.join(rendered_objects))
+        else:
+            with QueryCounter() as query_counter, render_scope(render_state):
+                rendered_objects = _render_objects(objects, renderer)
+            dump_query_count = query_counter.count
+
+        # Render template.
+        response = render(request, 'django_dump_die/dd.html', {
+            **context,
+            'objects': objects,
+            'rendered_objects': rendered_objects,
+            'dump_query_count': dump_query_count,
+            'dump_truncated_count': render_state.budget.truncated_count,
+            'dump_truncated_setting': render_state.budget.exhausted_setting,
+        })
+
+    if lazy_session is not None:
+        response.set_cookie(LAZY_SESSION_COOKIE, lazy_session, httponly=True, samesite='Lax')
+
+    return response
+
+
+def _accepts_json(request):
+    """Return if the request explicitly asks for JSON, rather than HTML.
+
+    Wildcard Accept headers (such as the ``*/*`` sent by curl) still get HTML.
+    """
+    media_types = {media_type.split(';')[0].strip() for media_type in request.headers.get('Accept', '').split(',')}
+    return 'application/json' in media_types and 'text/html' not in media_types
+
+
+def _json_response(objects, render_threads=None):
+    """Return dumped objects as JSON. Skips the template engine entirely.
+
+    Lazy expansion and streaming only apply to the HTML page, so everything is output in full.
+    """
+    # Finish processing any lazily dumped objects.
+    objects = [resolve_object_info(object_info) for object_info in objects]
+
+    render_state = RenderState()
+    if render_threads is not None and len(objects) > 1:
+        with QueryCounter() as query_counter:
+            dumped_objects = _render_in_pool(objects, json_dump_objects, render_state, render_threads)
+        dumped_objects = [dumped_object for group in dumped_objects for dumped_object in group]
+        query_count = query_counter.count
+    else:
+        with QueryCounter() as query_counter, render_scope(render_state):
+            dumped_objects = json_dump_objects(objects)
+        query_count = query_counter.count
+
+    return JsonResponse({
+        'objects': dumped_objects,
+        'query_count': query_count,
+        'truncated_count': render_state.budget.truncated_count,
+        'truncated_setting': render_state.budget.exhausted_setting,
     })
+
+
+def _stream_page(request, objects, renderer, render_state, context):
+    """Generate the DumpDie page in parts, sending each dumped object as soon as it is rendered.
+
+    Only one rendered object is held in memory at a time, rather than the full page.
+    """
+    yield render_to_string('django_dump_die/partials/_dd_page_start.html', context, request)
+
+    dump_query_count = 0
+    for index, object_info in enumerate(objects):
+
+        # Finish processing the object, if lazily dumped.
+        object_info = resolve_object_info(object_info)
+
+        # Unique tracking and query counting are re-entered for each object, so nothing is left active between parts.
+        with QueryCounter() as query_counter, render_scope(render_state):
+            rendered_object = _render_objects([object_info], renderer)
+        dump_query_count += query_counter.count
+
+        # If it is not the first object, add a horizontal line to separate.
+        if index > 0:
+            yield '<hr>'
+        yield rendered_object
+
+    yield render_to_string('django_dump_die/partials/_dd_page_end.html', {
+        **context,
+        'dump_query_count': dump_query_count,
+        'dump_truncated_count': render_state.budget.truncated_count,
+        'dump_truncated_setting': render_state.budget.exhausted_setting,
+    }, request)
+
+
+async def _iterate_in_thread(parts):
+    """Asynchronously iterate a sync generator, generating each part in a thread."""
+    generate_part = sync_to_async(next)
+    try:
+        while True:
+            # StopIteration can't be raised out of a thread, so iteration ends once the default is returned instead.
+            part = await generate_part(parts, None)
+            if part is None:
+                return
+            yield part
+    finally:
+        await sync_to_async(parts.close)()
+
+
+def _render_objects(objects, renderer):
+    """Render a list of dumped object info tuples to HTML, using the given renderer."""
+    if renderer == 'python':
+        return render_dump_objects(objects)
+    return render_to_string('django_dump_die/partials/_dump_objects.html', {'objects': objects})
+
+
+def _render_in_pool(objects, render_func, render_state, max_threads):
+    """Render each dumped object on a bounded pool of background threads, so that slow attribute reads (such as
+    remote-backed properties) of different objects overlap.
+
+    Objects are grouped by the root unique that their output tracks. Each group renders on a single thread, in dump
+    order, with its own unique tracking. As different groups never share tracking entries, output is the same as
+    rendering every object in order on the request thread. The render budget and attribute guard are still shared
+    by the full page, and are safe to update from several threads.
+
+    Background threads only ever see a snapshot of each object, taken on the request thread first, so no object is
+    read by more than one thread at a time. Database connections are per thread, and would not see the request's
+    transaction. So background threads refuse all database queries, and any group that tries to query is discarded
+    and rendered again on the request thread, from the original objects. Groups that output unevaluated querysets
+    always query, so are rendered on the request thread to begin with. Deepcopied groups also stay on the request
+    thread, as their uniques are mapped back by reading the original object.
+
+    :param objects: List of already resolved object info tuples.
+    :param render_func: Function to render a list of object info tuples with.
+    :param render_state: RenderState of the page.
+    :param max_threads: Max number of threads to render with.
+    :return: List of render_func output, one per object in the original order.
+    """
+    # Group objects by root unique, the same as _generate_unique() tracks repeat dumps.
+    groups = {}
+    for index, object_info in enumerate(objects):
+        obj, original_obj = object_info[3], object_info[7]
+        root_unique = generate_unique_from_obj(original_obj if original_obj else obj)
+        groups.setdefault(root_unique, []).append((index, object_info))
+
+    def new_group_state():
+        group_state = RenderState(lazy_depth=render_state.lazy_depth, lazy_session=render_state.lazy_session)
+        group_state.budget = render_state.budget
+        group_state.attribute_guard = render_state.attribute_guard
+        return group_state
+
+    # Take snapshots on the request thread, before any background thread starts.
+    pool_groups = []
+    request_groups = []
+    for group in groups.values():
+        # Deepcopied dumps stay on the request thread.
+        if any(object_info[7] for _, object_info in group):
+            request_groups.append(group)
+            continue
+
+        group_state = new_group_state()
+        group_state.budget = _GroupBudget(render_state.budget)
+        snapshot_group = []
+        has_query = False
+        with render_scope(group_state):
+            for index, object_info in group:
+                snapshot_memo = {}
+                snapshot = snapshot_object(object_info[3], object_info[5], object_info[6], snapshot_memo)
+                add_snapshot_unique_map(snapshot, snapshot_memo)
+                has_query = has_query or _has_unevaluated_query(snapshot_memo.values())
+                snapshot_group.append((index, object_info[:3] + (snapshot,) + object_info[4:7] + (object_info[3],)))
+
+        if has_query:
+            request_groups.append(group)
+        else:
+            pool_groups.append((group, group_state, snapshot_group))
+
+    def render_group(group_state, group):
+        with render_scope(group_state):
+            return [(index, render_func([object_info])) for index, object_info in group]
+
+    def render_pool_group(pool_group):
+        _, group_state, snapshot_group = pool_group
+        query_refuser = _QueryRefuser()
+        try:
+            with ExitStack() as exit_stack:
+                for connection in connections.all():
+                    exit_stack.enter_context(connection.execute_wrapper(query_refuser))
+                rendered_group = render_group(group_state, snapshot_group)
+        finally:
+            # Connecting happens before a query is refused, so close any connection that was still opened.
+            connections.close_all()
+
+        if query_refuser.refused:
+            # Output would differ from the request thread, so discard it, and render again on the request thread.
+            group_state.budget.refund()
+            return None
+        return rendered_group
+
+    results = [None] * len(objects)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_threads, len(pool_groups)))) as executor:
+        pool_results = executor.map(render_pool_group, pool_groups)
+
+        # Render query groups on the request thread, while the pool renders the rest.
+        rendered_groups = [render_group(new_group_state(), group) for group in request_groups]
+
+        for (group, _, _), rendered_group in zip(pool_groups, pool_results):
+            if rendered_group is None:
+                rendered_group = render_group(new_group_state(), group)
+            rendered_groups.append(rendered_group)
+
+    for rendered_group in rendered_groups:
+        for index, rendered_object in rendered_group:
+            results[index] = rendered_object
+
+    return results
+
+
+def _has_unevaluated_query(values):
+    """Return if any of the given values is a query that will fetch its rows when output."""
+    return any(is_query(value) and not is_query_evaluated(value) for value in values)
+
+
+class _QueryRefuser:
+    """Database execute wrapper for background render threads. Refuses every query, and records that it did."""
+    __slots__ = ('refused',)
+
+    def __init__(self):
+        self.refused = False
+
+    def __call__(self, execute, sql, params, many, context):
+        self.refused = True
+        raise DatabaseError('Database queries are not available on DJANGO_DD_RENDER_THREADS background threads.')
+
+
+class _GroupBudget:
+    """Render budget of a single group rendered on a background thread.
+
+    Charges the page budget as normal, but also keeps its own counts, to refund if the group is discarded.
+    """
+    __slots__ = ('budget', 'node_count', 'byte_count', 'truncated_count')
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.node_count = 0
+        self.byte_count = 0
+        self.truncated_count = 0
+
+    def is_exhausted(self):
+        """Return if any limit of the page budget has been reached."""
+        return self.budget.is_exhausted()
+
+    def count_truncated(self):
+        """Count a single value that was not output, as the budget is exhausted."""
+        self.truncated_count += 1
+        self.budget.count_truncated()
+
+    def charge(self, context):
+        """Count a single value against the page budget, using its dump_object() context."""
+        size = self.budget.charge(context)
+        self.node_count += 1
+        self.byte_count += size
+        return size
+
+    def refund(self):
+        """Remove everything this group counted from the page budget."""
+        self.budget.refund(self.node_count, self.byte_count, self.truncated_count)
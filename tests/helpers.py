@@ -0,0 +1,31 @@
+"""
+Shared helpers for DumpDie tests.
+"""
+
+
+def build_object_info(
+    obj,
+    obj_name='sample_obj',
+    filename=None,
+    linenumber=None,
+    function_doc=None,
+    root_index_start=None,
+    root_index_end=None,
+    original_obj=None,
+):
+    """Build an object info tuple, in the same format as get_dumped_object_info()."""
+    return (
+        filename,
+        linenumber,
+        [{'css_class': 'dumped_name', 'value': obj_name}],
+        obj,
+        function_doc,
+        root_index_start,
+        root_index_end,
+        original_obj,
+    )
+
+
+def normalize_whitespace(html):
+    """Collapse all whitespace runs, as a browser does when displaying the output."""
+    return ' '.join(html.split())
@@ -0,0 +1,572 @@
+"""
+Benchmark tests for DumpDie processing.
+
+Verifies how processing cost scales with the size and shape of dumped objects.
+"""
+
+# System Imports.
+import copy
+import gc
+import itertools
+import json
+import sys
+import threading
+import weakref
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Third-Party Imports.
+from asgiref.sync import AsyncToSync, SyncToAsync
+from django.contrib.auth.models import Permission
+from django.template.loader import render_to_string
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.signals import template_rendered
+
+# Internal Imports.
+from django_dump_die import inspection, lazy_expansion, middleware, utils
+from django_dump_die.renderers import html
+from django_dump_die.templatetags import dump_die
+from django_dump_die.views.dd_view import dd_view
+from django_dump_die.views.example_helpers import ComplexClass, SimpleClass
+from tests.helpers import build_object_info
+
+
+def build_nested_structure(levels, leaves_per_level):
+    """Build a chain of alternating nested dicts and lists, with simple leaf values at each level.
+
+    :return: Tuple of (structure, total node count).
+    """
+    root = []
+    current = root
+    for level in range(levels):
+        child = {'leaf': level} if level % 2 else [level]
+        for index in range(leaves_per_level - 1):
+            if isinstance(current, dict):
+                current[f'leaf_{index}'] = index
+            else:
+                current.append(index)
+        if isinstance(current, dict):
+            current['child'] = child
+        else:
+            current.append(child)
+        current = child
+
+    return root, levels * (leaves_per_level + 1) + 2
+
+
+def dump(obj):
+    """Stand-in for dump(), with the same call depth down to get_dumped_object_name_and_location()."""
+    return utils.get_dumped_object_info(obj)
+
+
+def get_stack_depth():
+    """Return the number of frames on the current call stack."""
+    depth = 0
+    frame = sys._getframe()
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+@patch.multiple(dump_die, MAX_RECURSION_DEPTH=None, MAX_ITERABLE_LENGTH=None)
+class IterativeTraversalBenchmarkTestCase(SimpleTestCase):
+    """Verify stack depth stays flat, regardless of how deeply the dumped object is nested."""
+
+    def measure_max_stack_depth(self, obj):
+        """Render an object, returning the max stack depth seen while inspecting and writing nodes."""
+        stack_depths = []
+
+        def record_dump_object(*args):
+            stack_depths.append(get_stack_depth())
+            return dump_die.dump_object(*args)
+
+        def record_write_single_node(*args):
+            stack_depths.append(get_stack_depth())
+            return original_write_single_node(*args)
+
+        original_write_single_node = html._write_single_node
+        with patch.object(inspection, 'dump_object', side_effect=record_dump_object):
+            with patch.object(html, '_write_single_node', side_effect=record_write_single_node):
+                output = html.render_dump_objects([build_object_info(obj)])
+
+        return max(stack_depths), output
+
+    def test_stack_depth_is_flat(self):
+        """Verify a deep 10,000 node structure uses no more stack than a single level structure."""
+        shallow, _ = build_nested_structure(1, 9)
+        deep, node_count = build_nested_structure(1000, 9)
+        self.assertGreaterEqual(node_count, 10000)
+
+        shallow_depth, _ = self.measure_max_stack_depth(shallow)
+        deep_depth, output = self.measure_max_stack_depth(deep)
+
+        self.assertEqual(shallow_depth, deep_depth)
+        self.assertLess(deep_depth, sys.getrecursionlimit())
+
+        # Verify every level was fully rendered, with nothing skipped for depth.
+        self.assertEqual(output.count('class="dd-wrapper'), 1001)
+        self.assertNotIn('Already output or skipped object', output)
+        self.assertNotIn('class="reference"', output)
+
+    def test_limits_are_respected(self):
+        """Verify depth and iteration limits still apply to the iterative traversal."""
+        deep, _ = build_nested_structure(20, 1)
+        wide, _ = build_nested_structure(1, 30)
+
+        with patch.multiple(dump_die, MAX_RECURSION_DEPTH=5, MAX_ITERABLE_LENGTH=20):
+            deep_tree = inspection.build_dump_tree(build_object_info(deep))
+            wide_tree = inspection.build_dump_tree(build_object_info(wide))
+
+        # Verify nesting stops at the max recursion depth.
+        node = deep_tree.node
+        depth = 0
+        while node.kind == inspection.DumpNode.COMPLEX:
+            node = node.attributes[-1].node
+            depth += 1
+        self.assertEqual(depth, 5)
+        self.assertEqual(node.skipped_reason, 'limit')
+
+        # Verify entries past the max iterable length are skipped, rather than expanded.
+        child_kinds = [attribute.node.kind for attribute in wide_tree.node.attributes]
+        self.assertEqual(len(child_kinds), 30)
+        self.assertEqual(child_kinds[-1], inspection.DumpNode.SKIPPED)
+        self.assertEqual(wide_tree.node.attributes[-1].node.skipped_reason, 'limit')
+
+
+@patch.dict(dump_die.member_metadata_cache, clear=True)
+@patch.multiple(dump_die, INCLUDE_FUNCTIONS=True)
+class MemberMetadataCacheBenchmarkTestCase(SimpleTestCase):
+    """Verify function info is determined once per class, rather than once per instance."""
+
+    def count_function_inspections(self, obj):
+        """Render an object, returning how many times function info had to be determined."""
+        with patch.object(dump_die, 'get_callable_params', wraps=dump_die.get_callable_params) as mocked_get_params:
+            html.render_dump_objects([build_object_info(obj)])
+        return mocked_get_params.call_count
+
+    def test_instances_share_class_inspection(self):
+        """Verify dumping 20 instances costs the same function inspection as dumping 1."""
+        single_count = self.count_function_inspections([SimpleClass()])
+        dump_die.member_metadata_cache.clear()
+        many_count = self.count_function_inspections([SimpleClass() for _ in range(20)])
+
+        self.assertEqual(single_count, many_count)
+
+
+@patch.dict(utils.type_category_map, clear=True)
+class TypeCategoryBenchmarkTestCase(SimpleTestCase):
+    """Verify type checks do not call dir() once per dumped value."""
+
+    def count_dir_calls(self, obj):
+        """Render an object, returning how many times type checks had to call dir()."""
+        with patch.object(utils, 'dir', create=True, wraps=dir) as mocked_dir:
+            html.render_dump_objects([build_object_info(obj)])
+        return mocked_dir.call_count
+
+    def test_dir_calls_are_per_type(self):
+        """Verify dumping 100 values of a type costs the same dir() calls as dumping 1."""
+        single_count = self.count_dir_calls([SimpleClass()])
+        utils.type_category_map.clear()
+        many_count = self.count_dir_calls([SimpleClass() for _ in range(100)])
+
+        self.assertEqual(single_count, many_count)
+
+
+class ModelQueryBenchmarkTestCase(TestCase):
+    """Verify dumping model instances does not trigger a query per instance."""
+
+    def count_dump_queries(self, obj):
+        """Render an object, returning how many database queries were triggered."""
+        with utils.QueryCounter() as query_counter:
+            html.render_dump_objects([build_object_info(obj)])
+        return query_counter.count
+
+    def test_instances_trigger_no_queries(self):
+        """Verify dumping 20 instances with unloaded relations triggers no queries."""
+        permissions = list(Permission.objects.all()[:20])
+        self.assertEqual(len(permissions), 20)
+
+        self.assertEqual(self.count_dump_queries(permissions[:1]), 0)
+        self.assertEqual(self.count_dump_queries(permissions), 0)
+
+        # Verify expanding relations does trigger a query per instance.
+        with patch.object(utils, 'EXPAND_MODEL_RELATIONS', True):
+            self.assertGreaterEqual(self.count_dump_queries(permissions), 20)
+
+
+@override_settings(DEBUG=True, ROOT_URLCONF='tests.test_middleware')
+class AsyncMiddlewareBenchmarkTestCase(SimpleTestCase):
+    """Verify the middleware adds no sync/async adaption overhead to async requests."""
+
+    async def count_thread_hops(self, request_count):
+        """Make async requests that dump nothing, returning how many sync/async adaptions occurred."""
+        hop_count = 0
+
+        def counted(original_call):
+            def call(*args, **kwargs):
+                nonlocal hop_count
+                hop_count += 1
+                return original_call(*args, **kwargs)
+            return call
+
+        # Use a new client, so that the middleware chain is loaded from current settings.
+        # Make an initial request, so that one-time handler setup is not counted.
+        async_client = AsyncClient()
+        await async_client.get('/async-dump/')
+
+        with patch.object(SyncToAsync, '__call__', counted(SyncToAsync.__call__)):
+            with patch.object(AsyncToSync, '__call__', counted(AsyncToSync.__call__)):
+                for _ in range(request_count):
+                    response = await async_client.get('/async-dump/')
+                    self.assertEqual(response.content, b'Async view response')
+
+        return hop_count
+
+    async def test_no_overhead_without_dumps(self):
+        """Verify 100 requests cost the same thread hops with and without the middleware installed."""
+        with self.settings(MIDDLEWARE=[]):
+            baseline_hops = await self.count_thread_hops(100)
+        with self.settings(MIDDLEWARE=['django_dump_die.middleware.DumpAndDieMiddleware']):
+            middleware_hops = await self.count_thread_hops(100)
+
+        self.assertEqual(baseline_hops, middleware_hops)
+
+
+class UniqueTrackingMemoryBenchmarkTestCase(SimpleTestCase):
+    """Verify unique tracking does not keep dumped objects alive once rendered."""
+
+    def assertReleased(self, render):
+        """Render 200 new (and deepcopied) objects, verifying none are still referenced afterwards."""
+        sample_lists = [[SimpleClass()] for _ in range(200)]
+        references = [weakref.ref(sample_list[0]) for sample_list in sample_lists]
+        for sample_list in sample_lists:
+            render([
+                (None, None, [], sample_list, None, None, None, None),
+                (None, None, [], list(sample_list), None, None, None, sample_list),
+            ])
+
+        del sample_lists, sample_list
+        gc.collect()
+        self.assertEqual([reference for reference in references if reference() is not None], [])
+
+    def test_dd_pages_are_not_tracked(self):
+        """Verify rendering many dd pages leaves nothing tracked afterwards."""
+        request = RequestFactory().get('/')
+        self.assertReleased(lambda objects: dd_view(request, objects))
+
+    def test_unscoped_renders_are_not_tracked(self):
+        """Verify rendering many objects outside of any render scope leaves nothing tracked afterwards."""
+        self.assertReleased(html.render_dump_objects)
+        self.assertReleased(
+            lambda objects: render_to_string('django_dump_die/partials/_dump_objects.html', {'objects': objects})
+        )
+
+
+@patch.dict(utils.call_site_text_cache, clear=True)
+@patch.dict(utils.object_name_cache, clear=True)
+class CallSiteCacheBenchmarkTestCase(SimpleTestCase):
+    """Verify repeat dumps from the same line do not parse source again."""
+
+    def count_source_parses(self, dump_count):
+        """Dump from a single line, returning how many times source had to be parsed."""
+        sample_obj = SimpleClass()
+        with patch.object(utils.ast, 'parse', wraps=utils.ast.parse) as mocked_parse:
+            with patch.object(utils, 'generate_tokens', wraps=utils.generate_tokens) as mocked_tokens:
+                for _ in range(dump_count):
+                    dump(sample_obj)
+        return mocked_parse.call_count + mocked_tokens.call_count
+
+    @patch.dict(utils.call_index_cache, clear=True)
+    def test_source_parsed_once_per_call_site(self):
+        """Verify 1,000 dumps from one line cost the same source parsing as 1."""
+        single_count = self.count_source_parses(1)
+        utils.call_site_text_cache.clear()
+        utils.object_name_cache.clear()
+        utils.call_index_cache.clear()
+        many_count = self.count_source_parses(1000)
+
+        self.assertEqual(single_count, many_count)
+
+    @patch.dict(utils.call_index_cache, clear=True)
+    def test_source_parsed_once_per_file(self):
+        """Verify dumps from many lines of the same file parse the file only once."""
+        sample_obj = SimpleClass()
+        with patch.object(utils.ast, 'parse', wraps=utils.ast.parse) as mocked_parse:
+            dump(sample_obj)
+            dump(sample_obj)
+            dump(sample_obj)
+        self.assertEqual(mocked_parse.call_count, 1)
+
+
+@override_settings(DEBUG=True)
+class LazyDumpBenchmarkTestCase(SimpleTestCase):
+    """Verify lazy dumps do no stack inspection or name processing at dump time."""
+
+    def count_dump_processing(self, dump_count):
+        """Dump repeatedly from a loop, returning how many names were processed at dump time."""
+        sample_obj = SimpleClass()
+        dump_objects = []
+        with patch.object(middleware, 'get_dump_objects', return_value=dump_objects):
+            with patch.object(utils, 'process_object_name', wraps=utils.process_object_name) as mocked_process:
+                for _ in range(dump_count):
+                    middleware.dump(sample_obj)
+        self.assertEqual(len(dump_objects), dump_count)
+        return mocked_process.call_count
+
+    def test_lazy_dumps_defer_processing(self):
+        """Verify 1,000 lazy dumps process no names, compared to one per eager dump."""
+        self.assertEqual(self.count_dump_processing(1000), 1000)
+        with patch.object(middleware, 'LAZY_DUMP', True):
+            self.assertEqual(self.count_dump_processing(1000), 0)
+
+
+@patch.multiple(utils, MAX_RECURSION_DEPTH=5, MAX_ITERABLE_LENGTH=20)
+class SnapshotBenchmarkTestCase(SimpleTestCase):
+    """Verify snapshot cost scales with what is output, rather than the size of the dumped object."""
+
+    def count_snapshot_values(self, obj):
+        """Snapshot an object, returning how many values had to be visited."""
+        with patch.object(utils, '_snapshot_value', wraps=utils._snapshot_value) as mocked_snapshot_value:
+            utils.snapshot_object(obj)
+        return mocked_snapshot_value.call_count
+
+    def test_cost_bounded_by_output(self):
+        """Verify snapshots of 10,000 entries, or 1,000 levels deep, cost the same as their output limits."""
+        wide_count = self.count_snapshot_values([[index] for index in range(20)])
+        self.assertEqual(wide_count, self.count_snapshot_values([[index] for index in range(10000)]))
+
+        shallow, _ = build_nested_structure(5, 3)
+        deep, _ = build_nested_structure(1000, 3)
+        self.assertEqual(self.count_snapshot_values(shallow), self.count_snapshot_values(deep))
+
+
+class DeepcopyUniqueMapBenchmarkTestCase(SimpleTestCase):
+    """Verify deepcopy unique mapping cost is linear in the number of dumped values."""
+
+    def count_member_checks(self, key_count):
+        """Map a deepcopied dict back to its original, returning how many members had to be checked."""
+        sample_dict = {f'key_{index}': [index] for index in range(key_count)}
+        copied_dict = copy.deepcopy(sample_dict)
+        with patch.object(dump_die, 'is_private', wraps=dump_die.is_private) as mocked_is_private:
+            dump_die._create_unique_map(copied_dict, 'root', sample_dict, {})
+        return mocked_is_private.call_count
+
+    def test_cost_is_linear(self):
+        """Verify mapping a dict of 1,000 keys costs no more than 10 times a dict of 100 keys."""
+        self.assertLessEqual(self.count_member_checks(1000), self.count_member_checks(100) * 10)
+
+
+@patch.dict(lazy_expansion.lazy_value_store, clear=True)
+@patch.multiple(dump_die, MAX_RECURSION_DEPTH=None, MAX_ITERABLE_LENGTH=None)
+class LazyExpansionBenchmarkTestCase(SimpleTestCase):
+    """Verify initial render cost of lazily expanded dumps does not grow with depth."""
+
+    def count_processed_values(self, obj, lazy_depth):
+        """Render an object, returning how many values had their members processed."""
+        with patch.object(dump_die, 'get_obj_values', wraps=dump_die.get_obj_values) as mocked_get_obj_values:
+            with dump_die.render_scope(dump_die.RenderState(lazy_depth=lazy_depth, lazy_session='session')):
+                html.render_dump_objects([build_object_info(obj)])
+        return mocked_get_obj_values.call_count
+
+    def test_cost_bounded_by_lazy_depth(self):
+        """Verify rendering 1,000 levels deep costs the same as 5 levels deep, instead of once per level."""
+        shallow, _ = build_nested_structure(5, 3)
+        deep, _ = build_nested_structure(1000, 3)
+
+        self.assertEqual(self.count_processed_values(deep, None), 1001)
+        self.assertEqual(self.count_processed_values(deep, 2), self.count_processed_values(shallow, 2))
+        self.assertEqual(self.count_processed_values(deep, 2), 2)
+
+
+@patch.multiple(dump_die, MAX_RECURSION_DEPTH=None, MAX_ITERABLE_LENGTH=None)
+class RenderBudgetBenchmarkTestCase(SimpleTestCase):
+    """Verify render cost is bounded by the render budget, rather than the size of the dumped object."""
+
+    def count_processed_values(self, obj, render_budget):
+        """Render an object using the given budget, returning how many values had their members processed."""
+        render_state = dump_die.RenderState()
+        render_state.budget = render_budget
+        with patch.object(dump_die, 'get_obj_values', wraps=dump_die.get_obj_values) as mocked_get_obj_values:
+            with dump_die.render_scope(render_state):
+                html.render_dump_objects([build_object_info(obj)])
+        return mocked_get_obj_values.call_count
+
+    def test_cost_bounded_by_budget(self):
+        """Verify an object of 20 children per level, 4 levels deep, renders only 1,000 of its 168,421 values."""
+        wide_obj = [[[[index for index in range(20)] for _ in range(20)] for _ in range(20)] for _ in range(20)]
+
+        render_budget = dump_die.RenderBudget(max_nodes=1000)
+        processed_count = self.count_processed_values(wide_obj, render_budget)
+
+        self.assertEqual(render_budget.node_count, 1000)
+        self.assertLess(processed_count, 1000)
+        # Only values already listed by a rendered parent are output as truncated markers.
+        self.assertLess(render_budget.truncated_count, 20 * 4)
+
+
+class SlowPropertyClass:
+    """Class with a property that counts each time it is evaluated."""
+    evaluation_count = 0
+
+    @property
+    def slow_property(self):
+        SlowPropertyClass.evaluation_count += 1
+        return 'slow_value'
+
+
+@patch.multiple(dump_die, MAX_ITERABLE_LENGTH=None)
+class AttributeGuardBenchmarkTestCase(SimpleTestCase):
+    """Verify slow attributes only slow down a render once, rather than once per instance."""
+
+    def count_property_evaluations(self, attribute_guard):
+        """Render a list of 100 instances, returning how many times the slow property was evaluated."""
+        sample_list = [SlowPropertyClass() for _ in range(100)]
+        render_state = dump_die.RenderState()
+        render_state.attribute_guard = attribute_guard
+
+        # Each timed read takes 100 milliseconds.
+        clock = itertools.count(step=0.1)
+        SlowPropertyClass.evaluation_count = 0
+        with patch.object(utils, 'time', SimpleNamespace(perf_counter=lambda: next(clock))):
+            with dump_die.render_scope(render_state):
+                html.render_dump_objects([build_object_info(sample_list)])
+        return SlowPropertyClass.evaluation_count
+
+    def test_slow_property_evaluated_once(self):
+        """Verify a property over the time limit is evaluated once, instead of once for each of 100 instances."""
+        self.assertEqual(self.count_property_evaluations(None), 100)
+        self.assertEqual(self.count_property_evaluations(utils.AttributeGuard(time_limit=50)), 1)
+
+
+class BarrierPropertyClass:
+    """Class with a property that blocks until the same property of every other instance is also being read."""
+    barrier = None
+
+    @property
+    def remote_value(self):
+        BarrierPropertyClass.barrier.wait()
+        return 'remote_value'
+
+
+@override_settings(DEBUG=True)
+class ThreadedRenderBenchmarkTestCase(SimpleTestCase):
+    """Verify rendering on background threads overlaps the blocking attribute reads of different dumped objects."""
+
+    def test_blocking_reads_overlap(self):
+        """Verify the properties of 8 objects are all read at the same time, when rendered on 8 threads."""
+        # Each read only returns once all 8 are waiting. Reads that do not overlap break the barrier after the timeout.
+        barrier = threading.Barrier(8, timeout=5)
+        objects = [build_object_info(BarrierPropertyClass(), f'obj_{index}') for index in range(8)]
+
+        with patch.object(BarrierPropertyClass, 'barrier', barrier), override_settings(DJANGO_DD_RENDER_THREADS=8):
+            content = dd_view(RequestFactory().get('/'), objects).content.decode()
+
+        self.assertFalse(barrier.broken)
+        self.assertNotIn('BrokenBarrierError', content)
+        self.assertEqual(content.count('&#x27;remote_value&#x27;'), 8)
+
+
+def count_json_values(data):
+    """Count the values output within JSON dd output. Each value is a dict with a type."""
+    count = 0
+    stack = [data]
+    while stack:
+        data = stack.pop()
+        if isinstance(data, dict):
+            count += 'type' in data
+            stack.extend(data.values())
+        elif isinstance(data, list):
+            stack.extend(data)
+    return count
+
+
+class JsonOutputBenchmarkTestCase(SimpleTestCase):
+    """Verify JSON output only costs the inspection of each value, without any template rendering."""
+
+    def render_dd_view(self, obj, output_format):
+        """Render the dd page for an object, returning the response, templates rendered, and values inspected."""
+        rendered_templates = []
+
+        def record_template(sender, template, **kwargs):
+            rendered_templates.append(template.name)
+
+        template_rendered.connect(record_template)
+        try:
+            with override_settings(DJANGO_DD_OUTPUT_FORMAT=output_format):
+                with patch.object(inspection, 'dump_object', wraps=inspection.dump_object) as mocked_dump_object:
+                    response = dd_view(RequestFactory().get('/'), [build_object_info(obj)])
+        finally:
+            template_rendered.disconnect(record_template)
+
+        return response, rendered_templates, mocked_dump_object.call_count
+
+    def test_json_skips_templates(self):
+        """Verify the JSON output renders no templates, and inspects each output value exactly once."""
+        sample_list = [{'key': [index, str(index), {'nested': index}], 'obj': ComplexClass()} for index in range(20)]
+
+        _, html_templates, _ = self.render_dd_view(sample_list, 'html')
+        response, json_templates, json_inspected = self.render_dd_view(sample_list, 'json')
+
+        self.assertNotEqual(html_templates, [])
+        self.assertEqual(json_templates, [])
+        self.assertEqual(json_inspected, count_json_values(json.loads(response.content)['objects']))
+        self.assertGreater(json_inspected, 100)
+
+
+class CountedHashClass:
+    """Class that counts each time it is hashed."""
+    hash_count = 0
+
+    def __hash__(self):
+        CountedHashClass.hash_count += 1
+        return 1
+
+
+@patch.multiple(dump_die, MAX_RECURSION_DEPTH=None, MAX_ITERABLE_LENGTH=None)
+class UniqueIdentityBenchmarkTestCase(SimpleTestCase):
+    """Verify determining node uniques is constant time, regardless of the size of the node."""
+
+    def test_nested_tuples_not_hashed(self):
+        """Verify no values are hashed, where hashing each nested tuple would hash all of its contents again."""
+        nested_tuple = tuple(CountedHashClass() for _ in range(10))
+        for _ in range(10):
+            nested_tuple = (nested_tuple, *(CountedHashClass() for _ in range(10)))
+
+        # Hashing the root alone hashes every leaf.
+        CountedHashClass.hash_count = 0
+        hash(nested_tuple)
+        self.assertEqual(CountedHashClass.hash_count, 110)
+
+        CountedHashClass.hash_count = 0
+        with dump_die.render_scope():
+            html.render_dump_objects([build_object_info(nested_tuple)])
+        self.assertEqual(CountedHashClass.hash_count, 0)
+
+
+@override_settings(DEBUG=True)
+@patch.multiple(dump_die, MAX_ITERABLE_LENGTH=None)
+class SharedReferenceBenchmarkTestCase(SimpleTestCase):
+    """Verify render cost scales with the number of distinct objects, rather than the number of references to them."""
+
+    def render_rows(self, shared_obj, row_count=500):
+        """Render a list of rows that all reference the same object. Returns the output, and unique generation count."""
+        rows = [[index, shared_obj] for index in range(row_count)]
+        with patch.object(dump_die, '_generate_unique', wraps=dump_die._generate_unique) as mocked_generate_unique:
+            with dump_die.render_scope():
+                output = html.render_dump_objects([build_object_info(rows)])
+        return output, mocked_generate_unique.call_count
+
+    def test_shared_object_output_once(self):
+        """Verify an object referenced by 500 rows is only output once, regardless of its size."""
+        small_output, small_count = self.render_rows({'key': 1})
+        large_output, large_count = self.render_rows({f'key_{index}': index for index in range(100)})
+
+        # Uniques are only generated for the root, each row and its index, and the shared object (and its values).
+        self.assertEqual(small_count, 1 + 500 * 2 + 1 + 1)
+        self.assertEqual(large_count, small_count + 99)
+
+        # The larger shared object only adds its own contents once, rather than once per row.
+        single_large_output = html.render_dump_objects([build_object_info({f'key_{i}': i for i in range(100)})])
+        self.assertLess(len(large_output) - len(small_output), len(single_large_output))
+        self.assertEqual(large_output.count('class="reference"'), 499)
@@ -0,0 +1,150 @@
+"""
+Tests for the object inspection pass, which builds node trees for renderers.
+"""
+
+# System Imports.
+import datetime
+from unittest.mock import patch
+
+# Third-Party Imports.
+from django.test import SimpleTestCase
+
+# Internal Imports.
+from django_dump_die.inspection import DumpNode, build_dump_tree
+from django_dump_die.renderers import render_dump_trees
+from django_dump_die.templatetags import dump_die
+from tests.helpers import build_object_info
+
+
+class BuildDumpTreeTestCase(SimpleTestCase):
+    """Verify node trees built for dumped objects."""
+
+    def test_simple_node(self):
+        """Verify simple values produce a single simple node."""
+        node = build_dump_tree(build_object_info(42)).node
+
+        self.assertEqual(node.kind, DumpNode.SIMPLE)
+        self.assertEqual(node.type, 'int')
+        self.assertEqual(node.css_class, 'number')
+        self.assertEqual(node.value, '42')
+
+    def test_complex_node(self):
+        """Verify iterables produce a complex node with one child per entry."""
+        node = build_dump_tree(build_object_info(['A', [1, 2]])).node
+
+        self.assertEqual(node.kind, DumpNode.COMPLEX)
+        self.assertEqual(node.type, 'list')
+        self.assertEqual(node.braces, '[]')
+        self.assertEqual(node.length, 2)
+        self.assertEqual(node.depth, 0)
+        self.assertEqual([attribute.name for attribute in node.attributes], ['0', '1'])
+        self.assertEqual([attribute.css_class for attribute in node.attributes], ['index', 'index'])
+
+        first, second = (attribute.node for attribute in node.attributes)
+        self.assertEqual(first.kind, DumpNode.SIMPLE)
+        self.assertEqual(first.value, "'A'")
+        self.assertEqual(second.kind, DumpNode.COMPLEX)
+        self.assertEqual(second.length, 2)
+        self.assertEqual(second.depth, 1)
+
+    def test_intermediate_node(self):
+        """Verify intermediate values produce a complex node with simple children."""
+        node = build_dump_tree(build_object_info(datetime.date(2022, 8, 1))).node
+
+        self.assertEqual(node.kind, DumpNode.COMPLEX)
+        self.assertEqual(node.intermediate, '2022-08-01')
+        self.assertIsNone(node.length)
+        for attribute in node.attributes:
+            self.assertEqual(attribute.node.kind, DumpNode.SIMPLE)
+
+    def test_skipped_nodes(self):
+        """Verify repeated and past-threshold values produce skipped nodes with a reason."""
+        shared = ['shared']
+        node = build_dump_tree(build_object_info([shared, shared, [[[[['deep']]]]]])).node
+
+        self.assertEqual(node.attributes[0].node.kind, DumpNode.COMPLEX)
+        repeated = node.attributes[1].node
+        self.assertEqual(repeated.kind, DumpNode.SKIPPED)
+        self.assertEqual(repeated.skipped_reason, 'repeat')
+        self.assertEqual(repeated.unique, node.attributes[0].node.unique)
+
+        deepest = node.attributes[2].node
+        while deepest.kind == DumpNode.COMPLEX:
+            deepest = deepest.attributes[0].node
+        self.assertEqual(deepest.kind, DumpNode.SKIPPED)
+        self.assertEqual(deepest.skipped_reason, 'limit')
+
+    def test_function_sections(self):
+        """Verify function sections are only included when enabled."""
+        self.assertIsNone(build_dump_tree(build_object_info([1])).node.functions)
+
+        with patch.multiple(dump_die, INCLUDE_FUNCTIONS=True, INCLUDE_ATTRIBUTES=False):
+            node = build_dump_tree(build_object_info([1])).node
+        self.assertIsNone(node.attributes)
+        self.assertIn('append', [function.name for function in node.functions])
+
+    def test_dumped_function(self):
+        """Verify dumped functions carry docs and no node."""
+        dumped_object = build_dump_tree(build_object_info(len, function_doc='Return the length.'))
+
+        self.assertIsNone(dumped_object.node)
+        self.assertEqual(dumped_object.function_doc, 'Return the length.')
+
+    def test_render_tree_multiple_times(self):
+        """Verify a built tree can be rendered repeatedly without walking the object again."""
+        dumped_object = build_dump_tree(build_object_info({'key': [1, 2, 3]}))
+
+        with patch('django_dump_die.inspection.dump_object') as mocked_dump_object:
+            first_output = render_dump_trees([dumped_object])
+            second_output = render_dump_trees([dumped_object])
+
+        mocked_dump_object.assert_not_called()
+        self.assertEqual(first_output, second_output)
+        self.assertIn('<span class="key" title="Key">&#x27;key&#x27;</span>', first_output)
+
+
+class ReferenceTestCase(SimpleTestCase):
+    """Verify objects repeated within a dumped object are output once, with later occurrences referencing it."""
+
+    def build_trees(self, *objects):
+        """Build node trees for objects within a single render, returning the root nodes."""
+        with dump_die.render_scope():
+            return [build_dump_tree(build_object_info(obj)).node for obj in objects]
+
+    def test_references_link_to_output(self):
+        """Verify each reference links to the original output, and is built once for all occurrences."""
+        shared = ['shared']
+        (node,) = self.build_trees([[shared], [shared], [shared]])
+
+        original, *references = (attribute.node.attributes[0].node for attribute in node.attributes)
+        self.assertEqual(original.kind, DumpNode.COMPLEX)
+        for reference in references:
+            self.assertEqual(reference.skipped_reason, 'repeat')
+            self.assertEqual(f'{reference.unique}{reference.root_count}', f'{original.unique}{original.root_count}')
+
+        with patch.object(dump_die, 'get_obj_type', wraps=dump_die.get_obj_type) as mocked_get_obj_type:
+            self.build_trees([shared] + [shared] * 10)
+        # Once each for the root list, the original output and its string, and the shared reference.
+        self.assertEqual(mocked_get_obj_type.call_count, 4)
+
+    def test_root_cycle(self):
+        """Verify references back to a repeatedly dumped root link to the output of that same dump."""
+        cyclic_list = [1]
+        cyclic_list.append(cyclic_list)
+
+        first, second = self.build_trees(cyclic_list, cyclic_list)
+
+        self.assertEqual(first.root_count, '')
+        self.assertEqual(first.attributes[1].node.root_count, '')
+        self.assertEqual(second.root_count, '_1')
+        self.assertEqual(second.attributes[1].node.root_count, '_1')
+
+    def test_reference_output(self):
+        """Verify references are output as links back to the original output."""
+        shared = ['shared']
+        with dump_die.render_scope():
+            output = render_dump_trees([build_dump_tree(build_object_info([shared, shared]))])
+
+        full_unique = dump_die.generate_unique_from_obj(shared)
+        self.assertEqual(output.count(f'data-reference="{full_unique}"'), 1)
+        self.assertEqual(output.count(f'data-unique="{full_unique}"'), 1)
@@ -0,0 +1,264 @@
+"""
+Tests for lazy expansion of dumped objects.
+"""
+
+# System Imports.
+import re
+from unittest.mock import patch
+
+# Third-Party Imports.
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+# Internal Imports.
+from django_dump_die import lazy_expansion, middleware
+from django_dump_die.constants import LAZY_EXPAND_URL
+from django_dump_die.lazy_expansion import LAZY_SESSION_COOKIE
+from django_dump_die.templatetags import dump_die
+from django_dump_die.utils import generate_unique_from_obj
+
+
+@patch.dict(lazy_expansion.lazy_value_store, clear=True)
+class LazyValueStoreTestCase(SimpleTestCase):
+    """Verify stored values are scoped per session, and evicted by age and count."""
+
+    def test_add_and_get(self):
+        """Verify values are only accessible by their token, from the session that stored them."""
+        first_token = lazy_expansion.add_lazy_value('session_1', 'first_value')
+        second_token = lazy_expansion.add_lazy_value('session_1', 'second_value')
+
+        self.assertNotEqual(first_token, second_token)
+        self.assertEqual(lazy_expansion.get_lazy_value('session_1', first_token), 'first_value')
+        self.assertEqual(lazy_expansion.get_lazy_value('session_1', second_token), 'second_value')
+        self.assertIsNone(lazy_expansion.get_lazy_value('session_2', first_token))
+        self.assertIsNone(lazy_expansion.get_lazy_value(None, first_token))
+        self.assertIsNone(lazy_expansion.get_lazy_value('session_1', 'unknown'))
+        self.assertIsNone(lazy_expansion.get_lazy_value('session_1', None))
+
+    @patch.object(lazy_expansion, 'LAZY_STORE_TTL', 10)
+    def test_ttl_eviction(self):
+        """Verify values expire, and expired values and sessions are discarded."""
+        with patch.object(lazy_expansion.time, 'monotonic', return_value=100):
+            old_token = lazy_expansion.add_lazy_value('session_1', 'old_value')
+        with patch.object(lazy_expansion.time, 'monotonic', return_value=105):
+            new_token = lazy_expansion.add_lazy_value('session_2', 'new_value')
+
+        with patch.object(lazy_expansion.time, 'monotonic', return_value=112):
+            self.assertEqual(lazy_expansion.get_lazy_value('session_2', new_token), 'new_value')
+
+            # Expired values are also discarded on read, without waiting for another value to be added.
+            self.assertNotIn('session_1', lazy_expansion.lazy_value_store)
+            self.assertIsNone(lazy_expansion.get_lazy_value('session_1', old_token))
+
+            lazy_expansion.add_lazy_value('session_2', 'another_value')
+
+        self.assertEqual(len(lazy_expansion.lazy_value_store['session_2']), 2)
+
+    @patch.object(lazy_expansion, 'LAZY_STORE_SIZE', 3)
+    def test_size_eviction(self):
+        """Verify oldest values of a session are discarded once the size limit is reached."""
+        tokens = [lazy_expansion.add_lazy_value('session_1', index) for index in range(5)]
+        other_token = lazy_expansion.add_lazy_value('session_2', 'other_value')
+
+        self.assertEqual([lazy_expansion.get_lazy_value('session_1', token) for token in tokens], [None, None, 2, 3, 4])
+        self.assertEqual(lazy_expansion.get_lazy_value('session_2', other_token), 'other_value')
+
+    @patch.object(lazy_expansion, 'LAZY_SESSION_LIMIT', 3)
+    @patch.object(lazy_expansion, 'LAZY_STORE_SIZE', 2)
+    def test_session_eviction(self):
+        """Verify least recently used sessions are discarded once the session limit is reached."""
+        tokens = {f'session_{index}': lazy_expansion.add_lazy_value(f'session_{index}', index) for index in range(3)}
+
+        # Reading a value marks its session as recently used, so the next oldest session is discarded instead.
+        self.assertEqual(lazy_expansion.get_lazy_value('session_0', tokens['session_0']), 0)
+        for index in range(3, 100):
+            for _ in range(5):
+                tokens[f'session_{index}'] = lazy_expansion.add_lazy_value(f'session_{index}', index)
+            lazy_expansion.get_lazy_value('session_0', tokens['session_0'])
+
+        # Total stored values stay bounded by both limits, however many sessions add values.
+        self.assertEqual(list(lazy_expansion.lazy_value_store), ['session_98', 'session_99', 'session_0'])
+        self.assertEqual(sum(len(session_values) for session_values in lazy_expansion.lazy_value_store.values()), 5)
+        self.assertIsNone(lazy_expansion.get_lazy_value('session_1', tokens['session_1']))
+        self.assertEqual(lazy_expansion.get_lazy_value('session_99', tokens['session_99']), 99)
+
+
+@override_settings(DEBUG=True, DJANGO_DD_LAZY_EXPAND_DEPTH=1)
+@patch.object(middleware, 'LAZY_EXPAND_DEPTH', 1)
+@patch.dict(lazy_expansion.lazy_value_store, clear=True)
+class LazyExpandViewTestCase(SimpleTestCase):
+    """Verify dumped object contents past the lazy expansion depth are only output once expanded."""
+
+    def setUp(self):
+        self.sample_obj = {'first': {'second': {'third': ['deep_value']}}, 'sibling': ['sibling_value']}
+
+    def get_dd_response(self, *objects, cookies=None):
+        """Get the dd page response, for a request that dumps the given objects."""
+        def get_response(request):
+            for obj in objects:
+                middleware.dump(obj)
+            return HttpResponse()
+
+        request = RequestFactory().get('/')
+        request.COOKIES.update(cookies or {})
+        return middleware.DumpAndDieMiddleware(get_response)(request)
+
+    def get_expand_response(self, token, session):
+        """Get the response for expanding a deferred object."""
+        request = RequestFactory().get(LAZY_EXPAND_URL, {'token': token})
+        request.COOKIES[LAZY_SESSION_COOKIE] = session
+        return middleware.DumpAndDieMiddleware(lambda request: HttpResponse('Not expanded'))(request)
+
+    def get_lazy_tokens(self, content):
+        """Get all lazy expansion tokens, in output order."""
+        return re.findall(r'data-lazy-token="([^"]+)"', content)
+
+    def test_contents_deferred(self):
+        """Verify only the first level of contents is output, and the rest is fetched when expanded."""
+        first_unique = generate_unique_from_obj(self.sample_obj['first'])
+        second_unique = generate_unique_from_obj(self.sample_obj['first']['second'])
+
+        response = self.get_dd_response(self.sample_obj)
+        content = response.content.decode()
+        session = response.cookies[LAZY_SESSION_COOKIE].value
+
+        self.assertIn(f'data-lazy-expand-url="{LAZY_EXPAND_URL}"', content)
+        self.assertTrue(response.cookies[LAZY_SESSION_COOKIE]['httponly'])
+        self.assertIn(f'data-unique="{first_unique}"', content)
+        self.assertNotIn('second', content)
+        self.assertNotIn('sibling_value', content)
+        tokens = self.get_lazy_tokens(content)
+        self.assertEqual(len(tokens), 2)
+
+        # Verify expanding outputs one more level, deferring the rest again.
+        response = self.get_expand_response(tokens[0], session)
+        content = response.content.decode()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('&#x27;second&#x27;', content)
+        self.assertIn(f'data-unique="{second_unique}"', content)
+        self.assertNotIn('third', content)
+        self.assertEqual(len(self.get_lazy_tokens(content)), 1)
+
+        response = self.get_expand_response(tokens[1], session)
+        self.assertIn('sibling_value', response.content.decode())
+
+    @override_settings(DJANGO_DD_RENDERER='python')
+    def test_python_renderer(self):
+        """Verify the Python renderer defers and expands the same as the template renderer."""
+        response = self.get_dd_response(self.sample_obj)
+        content = response.content.decode()
+        tokens = self.get_lazy_tokens(content)
+
+        self.assertNotIn('second', content)
+        self.assertEqual(len(tokens), 2)
+
+        response = self.get_expand_response(tokens[0], response.cookies[LAZY_SESSION_COOKIE].value)
+        self.assertIn('&#x27;second&#x27;', response.content.decode())
+
+    def test_repeat_dumps(self):
+        """Verify expanded contents of repeat dumps keep the root count of their dump."""
+        second_unique = generate_unique_from_obj(self.sample_obj['first']['second'])
+
+        response = self.get_dd_response(self.sample_obj, self.sample_obj)
+        tokens = self.get_lazy_tokens(response.content.decode())
+        session = response.cookies[LAZY_SESSION_COOKIE].value
+
+        self.assertEqual(len(tokens), 4)
+        self.assertIn(f'data-unique="{second_unique}"', self.get_expand_response(tokens[0], session).content.decode())
+        self.assertIn(f'data-unique="{second_unique}_1"', self.get_expand_response(tokens[2], session).content.decode())
+
+    def test_session_reused(self):
+        """Verify an existing browser session is kept, rather than starting a new one."""
+        response = self.get_dd_response(self.sample_obj, cookies={LAZY_SESSION_COOKIE: 'existing_session'})
+        token = self.get_lazy_tokens(response.content.decode())[0]
+
+        self.assertEqual(response.cookies[LAZY_SESSION_COOKIE].value, 'existing_session')
+        self.assertEqual(self.get_expand_response(token, 'existing_session').status_code, 200)
+
+    def test_not_found(self):
+        """Verify unknown tokens, and tokens from other sessions, are not found."""
+        response = self.get_dd_response(self.sample_obj)
+        token = self.get_lazy_tokens(response.content.decode())[0]
+
+        self.assertEqual(self.get_expand_response('unknown', response.cookies[LAZY_SESSION_COOKIE].value).status_code, 404)
+        self.assertEqual(self.get_expand_response(token, 'other_session').status_code, 404)
+
+    def test_disabled(self):
+        """Verify all contents are output up front, and the expand url is not handled, by default."""
+        with override_settings(DJANGO_DD_LAZY_EXPAND_DEPTH=None), patch.object(middleware, 'LAZY_EXPAND_DEPTH', None):
+            response = self.get_dd_response(self.sample_obj)
+            content = response.content.decode()
+
+            self.assertIn('deep_value', content)
+            self.assertNotIn('data-lazy', content)
+            self.assertNotIn(LAZY_SESSION_COOKIE, response.cookies)
+            self.assertEqual(self.get_expand_response('unknown', 'session').content, b'Not expanded')
+
+        with override_settings(DEBUG=False):
+            self.assertEqual(self.get_expand_response('unknown', 'session').content, b'Not expanded')
+
+    async def test_async_expand(self):
+        """Verify deferred objects are also expanded when handling requests asynchronously."""
+        async def async_get_response(request):
+            return HttpResponse('Not expanded')
+
+        response = self.get_dd_response(self.sample_obj)
+        token = self.get_lazy_tokens(response.content.decode())[0]
+        request = RequestFactory().get(LAZY_EXPAND_URL, {'token': token})
+        request.COOKIES[LAZY_SESSION_COOKIE] = response.cookies[LAZY_SESSION_COOKIE].value
+
+        response = await middleware.DumpAndDieMiddleware(async_get_response)(request)
+        self.assertIn('&#x27;second&#x27;', response.content.decode())
+
+
+class SlowPropertyClass:
+    """Class with a property that is too slow to evaluate during output."""
+
+    @property
+    def slow_property(self):
+        return ['slow_value']
+
+
+@override_settings(DEBUG=True)
+@patch.object(middleware, 'ATTRIBUTE_GUARD_ENABLED', True)
+@patch('django_dump_die.views.dd_view.ATTRIBUTE_GUARD_ENABLED', True)
+@patch.multiple(dump_die, ATTRIBUTE_GUARD_ENABLED=True, DESCRIPTOR_DENYLIST=['property'])
+@patch.dict(lazy_expansion.lazy_value_store, clear=True)
+class AttributeLoadViewTestCase(SimpleTestCase):
+    """Verify unevaluated attributes can be loaded on click."""
+
+    get_dd_response = LazyExpandViewTestCase.get_dd_response
+    get_expand_response = LazyExpandViewTestCase.get_expand_response
+
+    def get_load_tokens(self, content):
+        """Get all attribute load tokens, in output order."""
+        return re.findall(r'data-load-token="([^"]+)"', content)
+
+    def test_attribute_loaded(self):
+        """Verify unevaluated attributes are output with a load link, which outputs the attribute value."""
+        response = self.get_dd_response(SlowPropertyClass())
+        content = response.content.decode()
+        tokens = self.get_load_tokens(content)
+
+        self.assertIn('not evaluated', content)
+        self.assertNotIn('slow_value', content)
+        self.assertEqual(len(tokens), 1)
+
+        response = self.get_expand_response(tokens[0], response.cookies[LAZY_SESSION_COOKIE].value)
+        content = response.content.decode()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('<span class="type" title="list">list:1</span>', content)
+        self.assertIn('slow_value', content)
+        self.assertNotIn('not evaluated', content)
+
+    @override_settings(DJANGO_DD_RENDERER='python')
+    def test_python_renderer(self):
+        """Verify the Python renderer outputs and loads attributes the same as the template renderer."""
+        response = self.get_dd_response(SlowPropertyClass())
+        tokens = self.get_load_tokens(response.content.decode())
+
+        self.assertEqual(len(tokens), 1)
+        response = self.get_expand_response(tokens[0], response.cookies[LAZY_SESSION_COOKIE].value)
+        self.assertIn('slow_value', response.content.decode())
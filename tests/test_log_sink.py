@@ -0,0 +1,132 @@
+"""
+Tests for the structured logging sink.
+"""
+
+# System Imports.
+import json
+import queue
+import threading
+from unittest.mock import patch
+
+# Third-Party Imports.
+from django.test import SimpleTestCase, override_settings
+
+# Internal Imports.
+from django_dump_die import log_sink, middleware, utils
+
+
+@override_settings(DEBUG=False)
+@patch.object(middleware, 'LOG_DUMPS', True)
+class LogSinkTestCase(SimpleTestCase):
+    """Verify dumps are logged as JSON records, output in the background."""
+
+    def dump_and_get_records(self, *objects):
+        """Dump objects, returning the logged records once all are serialized."""
+        with self.assertLogs('django_dump_die', 'INFO') as logs:
+            for obj in objects:
+                middleware.dump(obj)
+            log_sink.stop_dump_listener()
+        return logs.records
+
+    def test_record(self):
+        """Verify each dump is logged as a compact JSON record, with the dump location, even when DEBUG is False."""
+        sample_list = ['A', 1]
+        records = self.dump_and_get_records(sample_list)
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].pathname, __file__)
+        self.assertEqual(records[0].funcName, 'dump_and_get_records')
+        self.assertNotIn(' ', records[0].getMessage())
+        self.assertEqual(json.loads(records[0].getMessage()), {
+            'name': 'obj',
+            'value': {
+                'type': 'list',
+                'unique': utils.generate_unique_from_obj(sample_list),
+                'length': 2,
+                'attributes': [
+                    {'name': '0', 'value': {'type': 'str', 'value': "'A'"}},
+                    {'name': '1', 'value': {'type': 'int', 'value': '1'}},
+                ],
+            },
+        })
+
+    @patch.object(log_sink, 'LOG_MAX_SIZE', 500)
+    def test_size_limit(self):
+        """Verify records of large objects are truncated to fit the max size."""
+        records = self.dump_and_get_records(list(range(1000)), ['A' * 1000])
+
+        self.assertEqual(len(records), 2)
+        first, second = (json.loads(record.getMessage()) for record in records)
+        self.assertLessEqual(len(records[0].getMessage()), 500)
+        self.assertGreater(first['truncated_count'], 0)
+        self.assertEqual(second['value'], {'type': 'list', 'skipped': 'truncated'})
+
+    def test_sample_rate(self):
+        """Verify only the sampled fraction of dumps are logged."""
+        with patch.object(middleware, 'log_dump') as mocked_log_dump:
+            with patch.object(middleware, 'LOG_SAMPLE_RATE', 0):
+                middleware.dump('not logged')
+            self.assertEqual(mocked_log_dump.call_count, 0)
+
+            with patch.object(middleware, 'LOG_SAMPLE_RATE', 0.5), patch('random.random', side_effect=[0.4, 0.6]):
+                middleware.dump('logged')
+                middleware.dump('not logged')
+            self.assertEqual(mocked_log_dump.call_count, 1)
+
+    def test_serialized_in_background(self):
+        """Verify only a snapshot is taken on the dumping thread, and objects are serialized on the listener thread."""
+        serializing_threads = []
+
+        def record_serializing_thread(*args):
+            serializing_threads.append(threading.current_thread())
+            return serialize_dump(*args)
+
+        sample_list = ['A']
+        serialize_dump = log_sink.serialize_dump
+        with patch.object(log_sink, 'serialize_dump', side_effect=record_serializing_thread):
+            with self.assertLogs('django_dump_die', 'INFO') as logs:
+                middleware.dump(sample_list)
+                sample_list.append('appended after dump')
+                log_sink.stop_dump_listener()
+
+        self.assertEqual(len(serializing_threads), 1)
+        self.assertNotIn(threading.current_thread(), serializing_threads)
+
+        # Logged as it was when dumped, with the unique of the original object.
+        data = json.loads(logs.records[0].getMessage())
+        self.assertEqual(data['value']['length'], 1)
+        self.assertEqual(data['value']['unique'], utils.generate_unique_from_obj(sample_list))
+
+    def test_errors_logged(self):
+        """Verify errors while logging a dump are logged, rather than raised to the dumping code."""
+        with self.assertLogs('django_dump_die', 'INFO') as logs:
+            middleware.dump(['A'], index_range='invalid')
+            with patch.object(log_sink, 'json_dump_objects', side_effect=RuntimeError('Sample error')):
+                middleware.dump(['B'])
+                log_sink.stop_dump_listener()
+            middleware.dump(['C'])
+            log_sink.stop_dump_listener()
+
+        self.assertEqual([record.levelname for record in logs.records], ['ERROR', 'ERROR', 'INFO'])
+        self.assertEqual(logs.records[0].getMessage(), 'Failed to log dumped object.')
+        self.assertEqual(logs.records[1].getMessage(), 'Failed to serialize dumped object for logging.')
+        self.assertEqual(logs.records[1].exc_info[0], RuntimeError)
+        self.assertEqual(json.loads(logs.records[2].getMessage())['value']['length'], 1)
+
+    def test_queue_full(self):
+        """Verify records are dropped once the queue is full, rather than blocking the dumping thread."""
+        record_queue = queue.Queue(maxsize=2)
+        queue_handler = log_sink.DroppingQueueHandler(record_queue)
+        with patch.object(log_sink, 'dump_queue_handler', queue_handler), patch.object(log_sink.DumpListener, 'start'):
+            with patch.object(log_sink.logger, 'isEnabledFor', return_value=True):
+                for index in range(5):
+                    middleware.dump(index)
+
+        self.assertEqual(record_queue.qsize(), 2)
+        self.assertEqual(queue_handler.dropped_count, 3)
+
+    def test_logger_disabled(self):
+        """Verify nothing is queued when the logger does not output INFO records."""
+        with patch.object(log_sink.dump_queue_handler, 'handle') as mocked_handle:
+            middleware.dump('not logged')
+        mocked_handle.assert_not_called()
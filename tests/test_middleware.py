@@ -0,0 +1,240 @@
+"""
+Tests for DumpDie middleware.
+"""
+
+# System Imports.
+import asyncio
+import io
+import threading
+from unittest.mock import patch
+
+# Third-Party Imports.
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import path
+
+# Internal Imports.
+from django_dump_die import middleware, utils
+
+
+async def async_dump_view(request):
+    """Async view that dumps objects, if requested."""
+    for value in request.GET.getlist('dump'):
+        middleware.dump(value)
+    if 'dd' in request.GET:
+        middleware.dd(request.GET['dd'])
+    return HttpResponse('Async view response')
+
+
+urlpatterns = [
+    path('async-dump/', async_dump_view),
+]
+
+
+@override_settings(DEBUG=True)
+@patch('django_dump_die.middleware.get_dumped_object_info', side_effect=lambda obj, *args: obj)
+@patch('django_dump_die.middleware.dd_view', side_effect=lambda request, objects: objects)
+class DumpObjectsScopeTestCase(SimpleTestCase):
+    """Verify dumped objects are collected per request."""
+
+    def test_concurrent_requests(self, mocked_dd_view, mocked_get_info):
+        """Verify requests handled at the same time only output their own dumped objects."""
+        barrier = threading.Barrier(4)
+
+        def get_response(request):
+            # Interleave dumps from every request.
+            for index in range(3):
+                middleware.dump(f'{request.GET["name"]}_{index}')
+                barrier.wait()
+            return HttpResponse()
+
+        dump_middleware = middleware.DumpAndDieMiddleware(get_response)
+        results = {}
+
+        def handle_request(name):
+            results[name] = dump_middleware(RequestFactory().get('/', {'name': name}))
+
+        threads = [threading.Thread(target=handle_request, args=(f'request{index}',)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for index in range(4):
+            name = f'request{index}'
+            self.assertEqual(results[name], [f'{name}_0', f'{name}_1', f'{name}_2'])
+
+    def test_dumps_cleared_between_requests(self, mocked_dd_view, mocked_get_info):
+        """Verify dumped objects do not carry over to the next request."""
+        dumped_values = iter(['first', None])
+
+        def get_response(request):
+            value = next(dumped_values)
+            if value:
+                middleware.dump(value)
+            return HttpResponse('no dumps')
+
+        dump_middleware = middleware.DumpAndDieMiddleware(get_response)
+        first_response = dump_middleware(RequestFactory().get('/'))
+        second_response = dump_middleware(RequestFactory().get('/'))
+
+        self.assertEqual(first_response, ['first'])
+        self.assertEqual(second_response.content, b'no dumps')
+        self.assertIsNone(middleware.dump_objects_var.get())
+
+    def test_dd_includes_request_dumps(self, mocked_dd_view, mocked_get_info):
+        """Verify dd() output includes objects dumped earlier in the same request."""
+        def get_response(request):
+            middleware.dump('dumped')
+            try:
+                middleware.dd('died')
+            except middleware.DumpAndDie as exception:
+                return dump_middleware.process_exception(request, exception)
+
+        dump_middleware = middleware.DumpAndDieMiddleware(get_response)
+        response = dump_middleware(RequestFactory().get('/'))
+
+        self.assertEqual(response, ['dumped', 'died'])
+
+
+@override_settings(DEBUG=True, ROOT_URLCONF=__name__, MIDDLEWARE=['django_dump_die.middleware.DumpAndDieMiddleware'])
+class AsyncMiddlewareTestCase(SimpleTestCase):
+    """Verify middleware handles async requests natively."""
+
+    def test_sync_and_async_capable(self):
+        """Verify middleware only handles requests asynchronously when the rest of the chain is async."""
+        async def async_get_response(request):
+            return HttpResponse()
+
+        self.assertTrue(middleware.DumpAndDieMiddleware.sync_capable)
+        self.assertTrue(middleware.DumpAndDieMiddleware.async_capable)
+        self.assertTrue(middleware.iscoroutinefunction(middleware.DumpAndDieMiddleware(async_get_response)))
+        self.assertFalse(middleware.iscoroutinefunction(middleware.DumpAndDieMiddleware(lambda request: None)))
+
+    async def test_no_dumps(self):
+        """Verify standard response is returned when nothing is dumped."""
+        response = await self.async_client.get('/async-dump/')
+
+        self.assertEqual(response.content, b'Async view response')
+
+    async def test_dump(self):
+        """Verify objects dumped in an async view are output."""
+        response = await self.async_client.get('/async-dump/', {'dump': ['first_value', 'second_value']})
+        content = response.content.decode()
+
+        self.assertIn('<title>DD</title>', content)
+        self.assertIn('first_value', content)
+        self.assertIn('second_value', content)
+
+    async def test_dd(self):
+        """Verify dd() in an async view outputs immediately, including earlier dumps."""
+        response = await self.async_client.get('/async-dump/', {'dump': 'dumped_value', 'dd': 'died_value'})
+        content = response.content.decode()
+
+        self.assertIn('<title>DD</title>', content)
+        self.assertIn('dumped_value', content)
+        self.assertIn('died_value', content)
+
+    async def test_concurrent_requests(self):
+        """Verify async requests handled at the same time only output their own dumped objects."""
+        responses = await asyncio.gather(*[
+            self.async_client.get('/async-dump/', {'dump': f'request{index}_value'})
+            for index in range(4)
+        ])
+
+        for index, response in enumerate(responses):
+            content = response.content.decode()
+            for other_index in range(4):
+                if other_index == index:
+                    self.assertIn(f'request{other_index}_value', content)
+                else:
+                    self.assertNotIn(f'request{other_index}_value', content)
+
+
+@override_settings(DEBUG=True)
+@patch.object(middleware, 'LAZY_DUMP', True)
+@patch.object(utils, 'INCLUDE_FILENAME_LINENUMBER', True)
+class LazyDumpTestCase(SimpleTestCase):
+    """Verify lazily dumped objects are only processed once the response is rendered."""
+
+    def test_processing_deferred(self):
+        """Verify dump() defers name and location processing, and the page still outputs them."""
+        sample_list = ['initial']
+        processed_during_view = []
+
+        def get_response(request):
+            middleware.dump(sample_list)
+            middleware.dump(sample_list, deepcopy=True)
+            processed_during_view.append(mocked_get_name.call_count)
+            sample_list.append('appended')
+            return HttpResponse()
+
+        dump_middleware = middleware.DumpAndDieMiddleware(get_response)
+        with patch.object(
+            utils,
+            'get_dumped_object_name_and_location',
+            wraps=utils.get_dumped_object_name_and_location,
+        ) as mocked_get_name:
+            response = dump_middleware(RequestFactory().get('/'))
+        content = response.content.decode()
+
+        self.assertEqual(processed_during_view, [0])
+        self.assertEqual(mocked_get_name.call_count, 2)
+        self.assertEqual(content.count('<span class="dumped_name">sample_list</span>'), 2)
+        self.assertIn(f'File: {__file__}', content)
+
+        # Verify the lazy dump shows the object at render time, and the deepcopied dump at dump time.
+        self.assertEqual(content.count("&#x27;appended&#x27;"), 1)
+
+    def test_invalid_index_range(self):
+        """Verify invalid dump options still raise at dump time."""
+        with self.assertRaises(ValueError):
+            middleware.dump([1, 2], index_range='invalid')
+
+
+@override_settings(DEBUG=True)
+class ConsoleOutputTestCase(SimpleTestCase):
+    """Verify dumps outside of a request are output immediately, instead of being held onto."""
+
+    def test_stderr(self):
+        """Verify dumps are written to stderr as text, without colors when not a terminal."""
+        with patch('sys.stderr', new_callable=io.StringIO) as mocked_stderr:
+            middleware.dump(['A', 1])
+
+        self.assertRegex(mocked_stderr.getvalue(), r"^\S+: list:2 \[ list_\d+\n    0: str 'A'\n    1: int 1\n\]\n$")
+        self.assertIsNone(middleware.get_dump_objects())
+
+        with patch('sys.stderr', new_callable=io.StringIO) as mocked_stderr:
+            with patch.object(middleware, 'CONSOLE_COLORS', True):
+                middleware.dump('A')
+        self.assertIn('\033[', mocked_stderr.getvalue())
+
+    @patch.object(middleware, 'CONSOLE_OUTPUT', 'logger')
+    def test_logger(self):
+        """Verify dumps are written to the django_dump_die logger, when set."""
+        with self.assertLogs('django_dump_die', 'INFO') as logs:
+            middleware.dump(['A', 1])
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("    0: str 'A'", logs.records[0].getMessage())
+
+    @patch.object(middleware, 'CONSOLE_OUTPUT', None)
+    def test_disabled(self):
+        """Verify dumps are discarded, when console output is disabled."""
+        with patch('sys.stderr', new_callable=io.StringIO) as mocked_stderr:
+            middleware.dump(['A', 1])
+
+        self.assertEqual(mocked_stderr.getvalue(), '')
+        self.assertIsNone(middleware.get_dump_objects())
+
+    def test_request_dumps_not_output(self):
+        """Verify dumps within a request are still collected for the dd page, rather than output."""
+        def get_response(request):
+            middleware.dump('dumped')
+            return HttpResponse()
+
+        with patch('sys.stderr', new_callable=io.StringIO) as mocked_stderr:
+            response = middleware.DumpAndDieMiddleware(get_response)(RequestFactory().get('/'))
+
+        self.assertEqual(mocked_stderr.getvalue(), '')
+        self.assertIn('dumped', response.content.decode())
@@ -0,0 +1,251 @@
+"""
+Tests for the pure-Python HTML renderer.
+"""
+
+# System Imports.
+import datetime
+import itertools
+import re
+from decimal import Decimal
+from unittest.mock import patch
+
+# Third-Party Imports.
+from django.contrib.auth.models import User
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django_expanded_test_cases import IntegrationTestCase
+
+# Internal Imports.
+from django_dump_die.renderers import render_complex_children, render_dump_context, render_dump_objects
+from django_dump_die.templatetags import dump_die
+from django_dump_die.utils import AttributeGuard
+from django_dump_die.views.example_helpers import (
+    ComplexClass,
+    EmptyClass,
+    SampleEnum,
+    SimpleClass,
+    sample_func,
+)
+from tests.helpers import build_object_info, normalize_whitespace
+
+
+def normalize_uniques(html):
+    """Number object ids within uniques in order of appearance.
+
+    Uniques are based on object identity, so values created fresh on each access (such as query rows) get different
+    ids in separate renders. Which values share a unique must still match.
+    """
+    ids = {}
+    return re.sub(r'(?<=_)\d{6,}', lambda match: str(ids.setdefault(match.group(), len(ids))), html)
+
+
+class PropertyClass:
+    """Class with a property, for attribute guard output. The property returns the same object on every access."""
+
+    @property
+    def sample_property(self):
+        return PROPERTY_VALUE
+
+
+PROPERTY_VALUE = {'key': ['value', 1]}
+
+
+class HtmlRendererParityTestCase(SimpleTestCase):
+    """Verify the Python renderer produces the same output as the template renderer."""
+
+    def assertRenderParity(self, objects):
+        """Render objects with both renderers and verify the output matches."""
+        # Each render tracks uniques in its own scope, the same as in the dd view.
+        with dump_die.render_scope():
+            template_output = render_to_string('django_dump_die/partials/_dump_objects.html', {'objects': objects})
+        with dump_die.render_scope():
+            python_output = render_dump_objects(objects)
+
+        self.assertEqual(
+            normalize_uniques(normalize_whitespace(template_output)),
+            normalize_uniques(normalize_whitespace(python_output)),
+        )
+
+    def test_simple_types(self):
+        """Verify parity for "simple" types."""
+        for obj in (True, b'bytes', Decimal('23.5'), 23.5, 23, None, 'test string', '<b>escaped</b>'):
+            with self.subTest(obj=obj):
+                self.assertRenderParity([build_object_info(obj)])
+
+    def test_intermediate_types(self):
+        """Verify parity for "intermediate" types."""
+        for obj in (datetime.datetime(2022, 8, 1, 12, 30), datetime.timedelta(days=2), complex(1, 2)):
+            with self.subTest(obj=obj):
+                self.assertRenderParity([build_object_info(obj)])
+
+    def test_complex_types(self):
+        """Verify parity for "complex" types."""
+        objects = (
+            ['A', 12, True],
+            ('A', 12, True),
+            {'A', 12, True},
+            {'char': 'A', 'num': 12, 'nested': {'list': [1, 2, [3, 4]]}},
+            memoryview(b'test'),
+            list(range(30)),
+            SampleEnum.RED,
+        )
+        for obj in objects:
+            with self.subTest(obj=obj):
+                self.assertRenderParity([build_object_info(obj)])
+
+    def test_class_instances(self):
+        """Verify parity for class instances, including nested and duplicate children."""
+        for obj in (EmptyClass(), SimpleClass(), ComplexClass()):
+            with self.subTest(obj=obj):
+                self.assertRenderParity([build_object_info(obj)])
+
+    def test_functions(self):
+        """Verify parity for dumped functions and objects with function output enabled."""
+        self.assertRenderParity([build_object_info(sample_func, function_doc='Sample <func> doc.')])
+
+        with patch.multiple(dump_die, INCLUDE_FUNCTIONS=True, MULTILINE_FUNCTION_DOCS=True):
+            with patch('django_dump_die.renderers.html.MULTILINE_FUNCTION_DOCS', True):
+                self.assertRenderParity([build_object_info(SimpleClass())])
+        with patch.multiple(dump_die, INCLUDE_FUNCTIONS=True, INCLUDE_ATTRIBUTES=False):
+            self.assertRenderParity([build_object_info(SimpleClass())])
+
+    def test_multiple_objects(self):
+        """Verify parity for multiple dumps, including repeated dumps of the same object."""
+        sample_list = [1, [2, 3]]
+        self.assertRenderParity([
+            build_object_info('first', filename='views.py', linenumber=12),
+            build_object_info(sample_list),
+            build_object_info(sample_list),
+        ])
+
+    def test_index_range_and_deepcopy(self):
+        """Verify parity for dumps using index_range and deepcopy options."""
+        sample_list = list(range(30))
+        self.assertRenderParity([build_object_info(sample_list, root_index_start=0, root_index_end=5)])
+        self.assertRenderParity([build_object_info(list(sample_list), original_obj=sample_list)])
+
+    def test_lazy_expansion(self):
+        """Verify parity for deferred objects, and for their contents once expanded."""
+        sample_obj = {'first': {'second': [1, {'third': 3}]}, 'sibling': SimpleClass()}
+
+        template_output = self.render_lazy(
+            sample_obj,
+            lambda objects: render_to_string('django_dump_die/partials/_dump_objects.html', {'objects': objects}),
+            lambda context: render_to_string('django_dump_die/partials/_complex_children.html', context),
+        )
+        python_output = self.render_lazy(sample_obj, render_dump_objects, render_complex_children)
+
+        self.assertIn('data-lazy-token="token_0"', template_output[0])
+        self.assertIn('data-lazy-token="token_2"', template_output[1])
+        self.assertEqual(normalize_whitespace(template_output[0]), normalize_whitespace(python_output[0]))
+        self.assertEqual(normalize_whitespace(template_output[1]), normalize_whitespace(python_output[1]))
+
+    def test_render_budget(self):
+        """Verify parity for values truncated once the render budget is used up."""
+        sample_list = [1, [2, 3], SimpleClass(), 4]
+        outputs = []
+        for render in (
+            lambda objects: render_to_string('django_dump_die/partials/_dump_objects.html', {'objects': objects}),
+            render_dump_objects,
+        ):
+            render_state = dump_die.RenderState()
+            render_state.budget = dump_die.RenderBudget(max_nodes=5)
+            with dump_die.render_scope(render_state):
+                outputs.append(render([build_object_info(sample_list)]))
+
+        self.assertIn('>Truncated</span>', outputs[0])
+        self.assertEqual(normalize_whitespace(outputs[0]), normalize_whitespace(outputs[1]))
+
+    def test_unevaluated_attributes(self):
+        """Verify parity for attributes that were not evaluated, and for their values once loaded."""
+        sample_obj = PropertyClass()
+        outputs = []
+        for render_objects, render_value in (
+            (
+                lambda objects: render_to_string('django_dump_die/partials/_dump_objects.html', {'objects': objects}),
+                lambda context: render_to_string('django_dump_die/partials/_dump_object.html', context),
+            ),
+            (render_dump_objects, render_dump_context),
+        ):
+            render_state = dump_die.RenderState(lazy_session='session')
+            render_state.attribute_guard = AttributeGuard(denylist=['property'])
+            with patch.object(dump_die, 'add_lazy_value', return_value='token_0') as mocked_add:
+                with dump_die.render_scope(render_state):
+                    initial_output = render_objects([build_object_info(sample_obj)])
+
+            deferred_attribute = mocked_add.call_args_list[0][0][1]
+            with dump_die.render_scope(deferred_attribute.render_state(None, 'session')):
+                outputs.append((initial_output, render_value(deferred_attribute.expand())))
+
+        self.assertIn('data-load-token="token_0"', outputs[0][0])
+        self.assertIn('not evaluated', outputs[0][0])
+        self.assertNotIn('not evaluated', outputs[0][1])
+        self.assertEqual(normalize_whitespace(outputs[0][0]), normalize_whitespace(outputs[1][0]))
+        self.assertEqual(normalize_whitespace(outputs[0][1]), normalize_whitespace(outputs[1][1]))
+
+    def render_lazy(self, obj, render_objects, render_children):
+        """Render an object with lazy expansion, then expand its first deferred child.
+
+        :return: Tuple of (initial output, expanded output).
+        """
+        # Tokens are random, so replace them with predictable values.
+        tokens = (f'token_{index}' for index in itertools.count())
+        with patch.object(dump_die, 'add_lazy_value', side_effect=lambda session, node: next(tokens)) as mocked_add:
+            with dump_die.render_scope(dump_die.RenderState(lazy_depth=1, lazy_session='session')):
+                initial_output = render_objects([build_object_info(obj)])
+
+            deferred_node = mocked_add.call_args_list[0][0][1]
+            with dump_die.render_scope(deferred_node.render_state(1, 'session')):
+                expanded_output = render_children(deferred_node.expand())
+
+        return initial_output, expanded_output
+
+
+class HtmlRendererQueryParityTestCase(TestCase):
+    """Verify the Python renderer produces the same output as the template renderer, for queries."""
+
+    assertRenderParity = HtmlRendererParityTestCase.assertRenderParity
+
+    def test_queries(self):
+        """Verify parity for queries, including total count and generated SQL."""
+        User.objects.bulk_create([User(username=f'user_{index}') for index in range(30)])
+
+        self.assertRenderParity([build_object_info(User.objects.order_by('pk'))])
+        self.assertRenderParity([build_object_info(User.objects.order_by('pk'), root_index_start=25)])
+        self.assertRenderParity([build_object_info(User.objects.none())])
+
+
+@override_settings(DEBUG=True, DJANGO_DD_RENDERER='python')
+class HtmlRendererViewTestCase(IntegrationTestCase):
+    """Verify dd page output when using the Python renderer."""
+
+    def test_simple_type_page(self):
+        """Verify page renders dumped objects through the Python renderer."""
+        with patch(
+            'django_dump_die.views.dd_view.render_dump_objects',
+            wraps=render_dump_objects,
+        ) as mocked_render:
+            self.assertGetResponse(
+                'django_dump_die:simple-type-example',
+                expected_title='DD',
+                expected_header='Django DumpDie',
+                expected_content=[
+                    """
+                    <div class="dump-wrapper">
+                        <span class="dumped_object" title="Dumped Object">
+                            <span class="constant">SAMPLE_CONST</span>
+                        </span>:
+                        <span class="type" title="str">str</span>
+                        <code class="string">'Sample Constant Content'</code>
+                    </div>
+                    """,
+                ],
+            )
+            mocked_render.assert_called_once()
+
+    @override_settings(DJANGO_DD_RENDERER='unknown')
+    def test_invalid_renderer(self):
+        """Verify an unknown renderer value raises an error."""
+        with self.assertRaises(ValueError):
+            self.client.get(reverse('django_dump_die:simple-type-example'))
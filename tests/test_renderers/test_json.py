@@ -0,0 +1,168 @@
+"""
+Tests for the JSON renderer.
+"""
+
+# System Imports.
+import json
+from unittest.mock import patch
+
+# Third-Party Imports.
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.test.signals import template_rendered
+
+# Internal Imports.
+from django_dump_die.renderers import json_dump_objects
+from django_dump_die.templatetags import dump_die
+from django_dump_die.utils import AttributeGuard, generate_unique_from_obj
+from django_dump_die.views.dd_view import dd_view
+from tests.helpers import build_object_info
+
+
+class PropertyClass:
+    """Class with a property and a method."""
+
+    @property
+    def sample_property(self):
+        return 'property_value'
+
+    def sample_method(self, value):
+        """Sample method."""
+        return value
+
+
+class JsonRendererTestCase(SimpleTestCase):
+    """Verify data output by the JSON renderer."""
+
+    def render(self, *objects):
+        """Render object info tuples within a fresh render scope."""
+        with dump_die.render_scope():
+            return json_dump_objects(list(objects))
+
+    def test_simple_type(self):
+        """Verify simple values output their type and display value."""
+        output = self.render(build_object_info('test string', filename='views.py', linenumber=12))
+
+        self.assertEqual(output, [{
+            'name': 'sample_obj',
+            'filename': 'views.py',
+            'linenumber': 12,
+            'value': {'type': 'str', 'value': "'test string'"},
+        }])
+
+    def test_complex_type(self):
+        """Verify complex values output their unique, length and attributes."""
+        sample_list = ['A', {'key': 1}]
+        output = self.render(build_object_info(sample_list))[0]['value']
+
+        self.assertEqual(output, {
+            'type': 'list',
+            'unique': generate_unique_from_obj(sample_list),
+            'length': 2,
+            'attributes': [
+                {'name': '0', 'value': {'type': 'str', 'value': "'A'"}},
+                {'name': '1', 'value': {
+                    'type': 'dict',
+                    'unique': generate_unique_from_obj(sample_list[1]),
+                    'length': 1,
+                    'attributes': [{'name': "'key'", 'value': {'type': 'int', 'value': '1'}}],
+                }},
+            ],
+        })
+
+    def test_repeats_and_limits(self):
+        """Verify repeat dumps get root counts, and repeat or too deep values are skipped."""
+        sample_list = [[[1]]]
+        sample_list.append(sample_list[0])
+        unique = generate_unique_from_obj(sample_list)
+        child_unique = generate_unique_from_obj(sample_list[0])
+
+        with patch.object(dump_die, 'MAX_RECURSION_DEPTH', 2):
+            first, second = self.render(build_object_info(sample_list), build_object_info(sample_list))
+
+        self.assertEqual(first['value']['unique'], unique)
+        self.assertEqual(second['value']['unique'], f'{unique}_1')
+        self.assertEqual(first['value']['attributes'][0]['value']['attributes'][0]['value'], {
+            'type': 'list',
+            'unique': generate_unique_from_obj(sample_list[0][0]),
+            'skipped': 'limit',
+        })
+        self.assertEqual(first['value']['attributes'][1]['value'], {
+            'type': 'list',
+            'unique': child_unique,
+            'skipped': 'repeat',
+        })
+
+    def test_functions(self):
+        """Verify dumped functions output their docs, and object functions are output when enabled."""
+        output = self.render(build_object_info(len, function_doc='Sample doc.'))
+        self.assertEqual(output, [{'name': 'sample_obj', 'function_doc': 'Sample doc.'}])
+
+        with patch.object(dump_die, 'INCLUDE_FUNCTIONS', True):
+            output = self.render(build_object_info(PropertyClass()))[0]['value']
+        self.assertEqual(output['functions'], [
+            {'name': 'sample_method', 'params': 'value', 'doc': 'Sample method.', 'access_modifier': '+'},
+        ])
+
+    def test_unevaluated_attribute(self):
+        """Verify attributes that were not evaluated output the setting that prevented it."""
+        render_state = dump_die.RenderState()
+        render_state.attribute_guard = AttributeGuard(denylist=['property'])
+        with dump_die.render_scope(render_state):
+            output = json_dump_objects([build_object_info(PropertyClass())])[0]['value']
+
+        self.assertEqual(output['attributes'], [{
+            'name': 'sample_property',
+            'access_modifier': '+',
+            'value': {'type': 'property', 'unevaluated': 'DJANGO_DD_DESCRIPTOR_DENYLIST'},
+        }])
+
+
+@override_settings(DEBUG=True)
+class JsonRendererViewTestCase(SimpleTestCase):
+    """Verify dd page output in JSON format."""
+
+    def get_dd_response(self, **headers):
+        """Get the dd page response for a single dumped list."""
+        request = RequestFactory().get('/', **headers)
+        return dd_view(request, [build_object_info(['A', 1])])
+
+    def assertJsonResponse(self, response):
+        """Verify the response is the JSON output of the dumped list."""
+        self.assertEqual(response['Content-Type'], 'application/json')
+        content = json.loads(response.content)
+        self.assertEqual(content['query_count'], 0)
+        self.assertEqual(content['truncated_count'], 0)
+        self.assertEqual(content['objects'][0]['value']['type'], 'list')
+        self.assertEqual(content['objects'][0]['value']['length'], 2)
+
+    @override_settings(DJANGO_DD_OUTPUT_FORMAT='json')
+    def test_setting(self):
+        """Verify JSON is output when set, without rendering any templates."""
+        rendered_templates = []
+
+        def on_template_rendered(sender, template, **kwargs):
+            rendered_templates.append(template)
+
+        template_rendered.connect(on_template_rendered)
+        try:
+            response = self.get_dd_response()
+        finally:
+            template_rendered.disconnect(on_template_rendered)
+
+        self.assertJsonResponse(response)
+        self.assertEqual(rendered_templates, [])
+
+    def test_accept_header(self):
+        """Verify JSON is output when explicitly accepted, and HTML otherwise."""
+        self.assertJsonResponse(self.get_dd_response(HTTP_ACCEPT='application/json'))
+
+        for accept in ('*/*', 'text/html,application/json;q=0.9', ''):
+            with self.subTest(accept=accept):
+                response = self.get_dd_response(HTTP_ACCEPT=accept)
+                self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
+
+    @override_settings(DJANGO_DD_OUTPUT_FORMAT='unknown')
+    def test_invalid_format(self):
+        """Verify an unknown output format raises an error."""
+        with self.assertRaises(ValueError):
+            self.get_dd_response()
@@ -0,0 +1,91 @@
+"""
+Tests for the plain-text (and ANSI colored) renderer.
+"""
+
+# System Imports.
+from unittest.mock import patch
+
+# Third-Party Imports.
+from django.test import SimpleTestCase
+
+# Internal Imports.
+from django_dump_die.renderers import render_text_objects
+from django_dump_die.templatetags import dump_die
+from django_dump_die.utils import generate_unique_from_obj
+from tests.helpers import build_object_info
+
+
+class SampleClass:
+    """Class with a constant, an attribute and a method."""
+    SAMPLE_CONST = 'const'
+
+    def __init__(self):
+        self.sample_attr = None
+
+    def sample_method(self, value):
+        """Sample
+        multiline method doc.
+        """
+        return value
+
+
+class TextRendererTestCase(SimpleTestCase):
+    """Verify text output of dumped objects."""
+
+    def render(self, *objects, colorize=False):
+        """Render object info tuples within a fresh render scope."""
+        with dump_die.render_scope():
+            return render_text_objects(list(objects), colorize)
+
+    def test_simple_type(self):
+        """Verify simple values output on a single line, after the dump location."""
+        output = self.render(build_object_info('test string', filename='tasks.py', linenumber=12))
+        self.assertEqual(output, "File: tasks.py, Line: 12\nsample_obj: str 'test string'")
+
+    def test_complex_type(self):
+        """Verify complex values output their children as an indented tree, with repeats output as their unique."""
+        sample_list = ['A', {'key': 1}]
+        sample_list.append(sample_list[1])
+        output = self.render(build_object_info(sample_list))
+
+        self.assertEqual(output.split('\n'), [
+            f'sample_obj: list:3 [ {generate_unique_from_obj(sample_list)}',
+            "    0: str 'A'",
+            f'    1: dict:1 {{ {generate_unique_from_obj(sample_list[1])}',
+            "        'key': int 1",
+            '    }',
+            f'    2: dict {generate_unique_from_obj(sample_list[1])}',
+            ']',
+        ])
+
+    def test_class_instance(self):
+        """Verify class attributes output their access modifiers, and functions output when enabled."""
+        with patch.object(dump_die, 'INCLUDE_FUNCTIONS', True):
+            output = self.render(build_object_info(SampleClass()))
+
+        self.assertEqual(output.split('\n')[1:], [
+            "    + SAMPLE_CONST: str 'const'",
+            '    + sample_attr: null None',
+            '    Functions:',
+            '        + sample_method(value): Sample multiline method doc.',
+            '}',
+        ])
+
+    def test_depth_limit(self):
+        """Verify values past the max recursion depth are output as their unique only."""
+        sample_list = [[[1]]]
+        with patch.object(dump_die, 'MAX_RECURSION_DEPTH', 1):
+            output = self.render(build_object_info(sample_list))
+
+        self.assertEqual(output.split('\n')[1:], [f'    0: list {generate_unique_from_obj(sample_list[0])}', ']'])
+
+    def test_colorize(self):
+        """Verify colored output uses the dd.css colors for each css class."""
+        output = self.render(build_object_info('test string'), colorize=True)
+
+        self.assertEqual(
+            output,
+            '\033[38;2;147;161;161msample_obj\033[0m: '
+            '\033[38;2;133;153;0mstr\033[0m '
+            "\033[38;2;42;161;152m'test string'\033[0m",
+        )
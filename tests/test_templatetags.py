@@ -0,0 +1,425 @@
+"""
+Tests for DumpDie templatetag helper logic.
+"""
+
+# System Imports.
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Third-Party Imports.
+from django.contrib.auth.models import User
+from django.db import connection
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+# Internal Imports.
+from django_dump_die.inspection import build_dump_tree
+from django_dump_die.templatetags import dump_die
+from django_dump_die.utils import generate_unique_from_obj
+from django_dump_die.views.dd_view import dd_view
+from django_dump_die.views.example_helpers import ComplexClass, SimpleClass
+
+
+@patch.multiple(dump_die, INCLUDE_FUNCTIONS=True)
+@patch.dict(dump_die.member_metadata_cache, clear=True)
+class MemberMetadataCacheTestCase(SimpleTestCase):
+    """Verify function info is cached per class."""
+
+    def test_functions_match_uncached(self):
+        """Verify cached function output matches uncached function output."""
+        with patch.object(dump_die, 'MEMBER_CACHE_SIZE', 0):
+            _, uncached_functions = dump_die.get_obj_values(SimpleClass())
+
+        _, first_functions = dump_die.get_obj_values(SimpleClass())
+        _, second_functions = dump_die.get_obj_values(SimpleClass())
+
+        self.assertEqual(uncached_functions, first_functions)
+        self.assertEqual(uncached_functions, second_functions)
+
+    def test_instance_override_not_cached(self):
+        """Verify an instance-level callable does not reuse the class function info."""
+        dump_die.get_obj_values(SimpleClass())
+
+        def sample_class_func(some_param):
+            """Instance override doc string"""
+
+        instance = SimpleClass()
+        instance.sample_class_func = sample_class_func
+        _, functions = dump_die.get_obj_values(instance)
+
+        function = [entry for entry in functions if entry[0] == 'sample_class_func'][0]
+        self.assertEqual(function, ['sample_class_func', 'some_param', 'Instance override doc string', '+'])
+
+    def test_cache_is_bounded(self):
+        """Verify least recently used classes are discarded once the cache is full."""
+        with patch.object(dump_die, 'MEMBER_CACHE_SIZE', 2):
+            dump_die.get_obj_values(SimpleClass())
+            dump_die.get_obj_values(ComplexClass())
+            dump_die.get_obj_values(SimpleClass())
+            dump_die.get_obj_values([])
+
+        cached_classes = [cache_key[0] for cache_key in dump_die.member_metadata_cache]
+        self.assertEqual(cached_classes, [SimpleClass, list])
+
+    def test_cache_keyed_on_settings(self):
+        """Verify function info is cached separately for different settings."""
+        dump_die.get_obj_values(SimpleClass())
+        with patch.multiple(dump_die, INCLUDE_PRIVATE_METHODS=True, INCLUDE_MAGIC_METHODS=True):
+            _, functions = dump_die.get_obj_values(SimpleClass())
+
+        self.assertEqual(len(dump_die.member_metadata_cache), 2)
+        self.assertIn('__init__', [entry[0] for entry in functions])
+
+    def test_functions_skipped_when_excluded(self):
+        """Verify function info is not determined at all when functions are not output."""
+        with patch.object(dump_die, 'INCLUDE_FUNCTIONS', False):
+            with patch.object(dump_die, 'get_callable_params') as mocked_get_params:
+                _, functions = dump_die.get_obj_values(SimpleClass())
+
+        mocked_get_params.assert_not_called()
+        self.assertEqual(functions, [])
+
+
+@patch.multiple(dump_die, MAX_ITERABLE_LENGTH=20)
+class QueryEvaluationTestCase(TestCase):
+    """Verify dumped queries only fetch the rows that are displayed."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create([User(username=f'user_{index}') for index in range(50)])
+
+    def build_tree(self, obj, root_index_start=None, root_index_end=None):
+        """Build the node tree for a dumped object, returning the root node."""
+        object_info = (None, None, [], obj, None, root_index_start, root_index_end, None)
+        return build_dump_tree(object_info).node
+
+    def test_fetches_only_displayed_rows(self):
+        """Verify a query costs a count query and a single sliced row query."""
+        queryset = User.objects.order_by('pk')
+        with CaptureQueriesContext(connection) as captured:
+            node = self.build_tree(queryset)
+
+        self.assertEqual(len(captured.captured_queries), 2)
+        self.assertIn('COUNT(', captured.captured_queries[0]['sql'])
+        self.assertIn('LIMIT 20', captured.captured_queries[1]['sql'])
+        self.assertIsNone(queryset._result_cache)
+
+        self.assertEqual(node.type, 'QuerySet')
+        self.assertEqual(node.length, 50)
+        self.assertEqual(node.sql, str(queryset.query))
+        self.assertEqual([attribute.name for attribute in node.attributes], [str(index) for index in range(20)])
+
+    def test_index_range(self):
+        """Verify index range on a root query is applied when fetching rows."""
+        with CaptureQueriesContext(connection) as captured:
+            node = self.build_tree(User.objects.order_by('pk'), 30, 35)
+
+        self.assertIn('LIMIT 5 OFFSET 30', captured.captured_queries[1]['sql'])
+        self.assertEqual([attribute.name for attribute in node.attributes], ['30', '31', '32', '33', '34'])
+        self.assertEqual(node.attributes[0].node.type, 'User')
+
+    def test_count_unavailable(self):
+        """Verify negative index ranges are ignored with a note when the row count can't be determined."""
+        with patch('django.db.models.QuerySet.count', side_effect=Exception('Count failed')):
+            node = self.build_tree(User.objects.order_by('pk'), -5)
+            positive_node = self.build_tree(User.objects.order_by('pk'), 30, 35)
+
+        self.assertEqual(node.length, '?')
+        self.assertEqual(node.query_note, 'Row count unavailable. Negative index range ignored')
+        self.assertEqual([attribute.name for attribute in node.attributes], [str(index) for index in range(20)])
+
+        self.assertIsNone(positive_node.query_note)
+        self.assertEqual([attribute.name for attribute in positive_node.attributes], ['30', '31', '32', '33', '34'])
+
+    def test_evaluated_query(self):
+        """Verify an already evaluated query does not query again."""
+        queryset = User.objects.all()
+        list(queryset)
+
+        with self.assertNumQueries(0):
+            node = self.build_tree(queryset)
+
+        self.assertEqual(node.length, 50)
+        self.assertEqual(len(node.attributes), 20)
+
+    def test_empty_query(self):
+        """Verify a query that never generates SQL is still output."""
+        with self.assertNumQueries(0):
+            node = self.build_tree(User.objects.none())
+
+        self.assertEqual(node.length, 0)
+        self.assertIsNone(node.sql)
+        self.assertEqual(node.attributes, [])
+
+
+class RenderScopeTestCase(SimpleTestCase):
+    """Verify unique tracking is scoped to a single render."""
+
+    def generate_root_count(self, obj, original_obj=None):
+        """Generate the unique for a dumped root object, returning the root count."""
+        _, root_count = dump_die._generate_unique(obj, obj, original_obj)
+        return root_count
+
+    def test_scope_discarded(self):
+        """Verify tracking within a scope is separate from, and does not outlive, the scope."""
+        sample_obj = SimpleClass()
+
+        with dump_die.render_scope():
+            self.assertEqual(self.generate_root_count(sample_obj), '')
+            self.assertEqual(self.generate_root_count(sample_obj), '_1')
+            self.generate_root_count([1, 2], original_obj=[1, 2])
+            render_state = dump_die.render_state_var.get()
+            self.assertEqual(len(render_state.repeat_iteration_tracker), 2)
+            self.assertEqual(len(render_state.deepcopy_unique_map), 1)
+
+        # Verify a new scope starts counting over.
+        with dump_die.render_scope():
+            self.assertEqual(self.generate_root_count(sample_obj), '')
+
+        self.assertIsNone(dump_die.render_state_var.get())
+
+    def test_unscoped(self):
+        """Verify nothing is tracked between calls outside of a render scope."""
+        sample_obj = SimpleClass()
+
+        self.assertEqual(self.generate_root_count(sample_obj), '')
+        self.assertEqual(self.generate_root_count(sample_obj), '')
+        self.assertEqual(dump_die.dump_object(sample_obj, sample_obj)['root_count'], '')
+        self.assertEqual(dump_die.dump_object(sample_obj, sample_obj)['root_count'], '')
+
+    def test_shared_scope(self):
+        """Verify multiple renders can share the same state."""
+        sample_obj = SimpleClass()
+        render_state = dump_die.RenderState()
+
+        with dump_die.render_scope(render_state):
+            self.assertEqual(self.generate_root_count(sample_obj), '')
+        with dump_die.render_scope(render_state):
+            self.assertEqual(self.generate_root_count(sample_obj), '_1')
+
+    @patch.object(dump_die, 'UNIQUE_TRACKER_SIZE', 3)
+    def test_size_limit(self):
+        """Verify oldest roots are discarded once the size limit is reached."""
+        sample_objects = [SimpleClass() for _ in range(5)]
+        sample_lists = [[sample_obj] for sample_obj in sample_objects]
+
+        with dump_die.render_scope():
+            for sample_obj, sample_list in zip(sample_objects, sample_lists):
+                self.generate_root_count(sample_obj)
+                self.generate_root_count(sample_list, original_obj=list(sample_list))
+            render_state = dump_die.render_state_var.get()
+
+        self.assertEqual(len(render_state.repeat_iteration_tracker), 3)
+        self.assertEqual(len(render_state.deepcopy_unique_map), 3)
+        self.assertIn(generate_unique_from_obj(sample_objects[-1]), render_state.repeat_iteration_tracker)
+        self.assertNotIn(generate_unique_from_obj(sample_objects[0]), render_state.repeat_iteration_tracker)
+
+    def test_dump_template_tag(self):
+        """Verify repeat dumps within one template are distinguished, but not between renders of the template."""
+        template = Template('{% load dump_die %}{% dump sample_obj %}{% dump sample_obj %}')
+        sample_obj = SimpleClass()
+        unique = generate_unique_from_obj(sample_obj)
+
+        first_output = template.render(Context({'sample_obj': sample_obj}))
+        second_output = template.render(Context({'sample_obj': sample_obj}))
+
+        for output in (first_output, second_output):
+            self.assertIn(f'data-unique="{unique}"', output)
+            self.assertIn(f'data-unique="{unique}_1"', output)
+            self.assertNotIn(f'data-unique="{unique}_2"', output)
+
+    def test_dump_objects_template_tag(self):
+        """Verify repeat dumps within one dump_objects tag are distinguished, but not between renders of it."""
+        template = Template('{% load dump_die %}{% dump_objects objects %}')
+        sample_obj = SimpleClass()
+        unique = generate_unique_from_obj(sample_obj)
+        object_info = (None, None, [], sample_obj, None, None, None, None)
+
+        for _ in range(2):
+            output = template.render(Context({'objects': [object_info, object_info]}))
+            self.assertIn(f'data-unique="{unique}"', output)
+            self.assertIn(f'data-unique="{unique}_1"', output)
+            self.assertNotIn(f'data-unique="{unique}_2"', output)
+
+
+class DeepcopyUniqueMapTestCase(SimpleTestCase):
+    """Verify deepcopied values are mapped back to the uniques of their original values."""
+
+    def build_unique_map(self, obj):
+        """Deepcopy an object, returning the copy and its unique map."""
+        copied_obj = copy.deepcopy(obj)
+        root_unique_map = {}
+        dump_die._add_unique_map_entry(copied_obj, obj, root_unique_map)
+        return copied_obj, root_unique_map
+
+    def assertMapped(self, root_unique_map, copied_value, original_value):
+        """Verify a copied value is mapped to the unique of its original value."""
+        self.assertEqual(
+            root_unique_map[generate_unique_from_obj(copied_value)],
+            generate_unique_from_obj(original_value),
+        )
+
+    def test_children_matched(self):
+        """Verify children are matched by attribute, key, and index."""
+        sample_obj = SimpleNamespace(items={'first': [1], 'second': [[2]]})
+        copied_obj, root_unique_map = self.build_unique_map([sample_obj, sample_obj.items])
+
+        self.assertMapped(root_unique_map, copied_obj, [sample_obj, sample_obj.items])
+        self.assertMapped(root_unique_map, copied_obj[0], sample_obj)
+        self.assertMapped(root_unique_map, copied_obj[0].items, sample_obj.items)
+        self.assertMapped(root_unique_map, copied_obj[1]['first'], sample_obj.items['first'])
+        self.assertMapped(root_unique_map, copied_obj[1]['second'][0], sample_obj.items['second'][0])
+
+    def test_cyclic_references(self):
+        """Verify cyclic values are only visited once."""
+        sample_list = [[1]]
+        sample_list.append(sample_list)
+        copied_list, root_unique_map = self.build_unique_map(sample_list)
+
+        self.assertMapped(root_unique_map, copied_list, sample_list)
+        self.assertMapped(root_unique_map, copied_list[0], sample_list[0])
+
+    @patch.object(dump_die, 'MAX_RECURSION_DEPTH', 2)
+    def test_depth_limit(self):
+        """Verify values past the max recursion depth are not mapped, as they are never output."""
+        sample_list = [[[[1]]]]
+        copied_list, root_unique_map = self.build_unique_map(sample_list)
+
+        self.assertMapped(root_unique_map, copied_list[0][0], sample_list[0][0])
+        self.assertNotIn(generate_unique_from_obj(copied_list[0][0][0]), root_unique_map)
+
+
+class HashCountingClass:
+    """Class that counts each time it is hashed."""
+    hash_count = 0
+
+    def __hash__(self):
+        HashCountingClass.hash_count += 1
+        return 1
+
+
+class UniqueRegistryTestCase(SimpleTestCase):
+    """Verify uniques are based on object identity, rather than hashing."""
+
+    def get_skipped_reasons(self, obj):
+        """Build the node tree of a list, returning the skipped reason of each entry."""
+        with dump_die.render_scope():
+            node = build_dump_tree((None, None, None, obj, None, None, None, None)).node
+        return [attribute.node.skipped_reason for attribute in node.attributes]
+
+    def test_equal_objects_distinct(self):
+        """Verify equal but distinct objects are each output, while shared references are only output once."""
+        self.assertEqual(self.get_skipped_reasons([tuple([1, 2]), tuple([1, 2])]), [None, None])
+
+        shared_tuple = tuple([1, 2])
+        self.assertEqual(self.get_skipped_reasons([shared_tuple, shared_tuple]), [None, 'repeat'])
+
+    def test_objects_not_hashed(self):
+        """Verify objects are never hashed to determine their unique."""
+        HashCountingClass.hash_count = 0
+        self.get_skipped_reasons([HashCountingClass(), HashCountingClass()])
+
+        self.assertEqual(HashCountingClass.hash_count, 0)
+
+    def test_objects_kept_alive(self):
+        """Verify objects are kept alive for the render, so that discarded values never share a unique."""
+        unique_registry = dump_die.UniqueRegistry()
+
+        uniques = {unique_registry.get_unique(SimpleClass()) for _ in range(10)}
+
+        self.assertEqual(len(uniques), 10)
+
+    def test_unscoped_objects_kept_alive(self):
+        """Verify objects dumped outside of a render scope are still kept alive by a registry for the dump."""
+        sample_obj = SimpleClass()
+        unique_registries = []
+
+        def record_registry(*args):
+            unique_registries.append(dump_die.render_state_var.get().unique_registry)
+            return generate_unique(*args)
+
+        generate_unique = dump_die._generate_unique
+        with patch.object(dump_die, '_generate_unique', side_effect=record_registry):
+            dump_die.dump_object(sample_obj, sample_obj)
+
+        self.assertIs(unique_registries[0].entries[id(sample_obj)][0], sample_obj)
+        self.assertIsNone(dump_die.render_state_var.get())
+
+
+class RenderBudgetTestCase(SimpleTestCase):
+    """Verify output stops once a render budget limit is reached."""
+
+    def render(self, obj, render_budget):
+        """Render an object within a render scope using the given budget, returning the built node tree."""
+        render_state = dump_die.RenderState()
+        render_state.budget = render_budget
+        with dump_die.render_scope(render_state):
+            return build_dump_tree((None, None, None, obj, None, None, None, None)).node
+
+    def get_node_values(self, node):
+        """Get the simple values and skipped reasons of all direct children of a node."""
+        return [attribute.node.value or attribute.node.skipped_reason for attribute in node.attributes]
+
+    def test_node_limit(self):
+        """Verify values past the node limit are truncated, and counted."""
+        render_budget = dump_die.RenderBudget(max_nodes=4)
+        node = self.render([1, 2, 3, 4, 5, 6], render_budget)
+
+        self.assertEqual(self.get_node_values(node), ['1', '2', '3', 'truncated', 'truncated', 'truncated'])
+        self.assertEqual(render_budget.truncated_count, 3)
+        self.assertEqual(render_budget.exhausted_setting, 'DJANGO_DD_MAX_RENDER_NODES')
+
+    def test_byte_limit(self):
+        """Verify values past the byte limit are truncated."""
+        render_budget = dump_die.RenderBudget(max_bytes=25)
+        node = self.render(['a' * 10, 'b' * 10, 'c' * 10, 'd' * 10], render_budget)
+
+        self.assertEqual(self.get_node_values(node)[2:], ['truncated', 'truncated'])
+        self.assertEqual(render_budget.exhausted_setting, 'DJANGO_DD_MAX_RENDER_BYTES')
+
+    def test_time_limit(self):
+        """Verify values past the time limit are truncated."""
+        with patch.object(dump_die, 'time', SimpleNamespace(monotonic=lambda: 100)):
+            render_budget = dump_die.RenderBudget(max_time=500)
+
+        # Each clock check advances 0.2 seconds.
+        clock = SimpleNamespace(monotonic=iter([100, 100.2, 100.4, 100.6, 100.8]).__next__)
+        render_state = dump_die.RenderState()
+        render_state.budget = render_budget
+        with patch.object(dump_die, 'time', clock), dump_die.render_scope(render_state):
+            node = build_dump_tree((None, None, None, [1, 2, 3, 4], None, None, None, None)).node
+
+        self.assertEqual(self.get_node_values(node), ['1', '2', 'truncated', 'truncated'])
+        self.assertEqual(render_budget.exhausted_setting, 'DJANGO_DD_MAX_RENDER_TIME')
+
+    def test_unlimited(self):
+        """Verify nothing is truncated without limits."""
+        render_budget = dump_die.RenderBudget()
+        node = self.render([[1, 2], [3, 4]], render_budget)
+
+        self.assertEqual(self.get_node_values(node.attributes[1].node), ['3', '4'])
+        self.assertEqual(render_budget.node_count, 7)
+        self.assertEqual(render_budget.truncated_count, 0)
+        self.assertIsNone(render_budget.exhausted_setting)
+
+    def test_shared_between_threads(self):
+        """Verify a budget shared by several render threads counts every value."""
+        render_budget = dump_die.RenderBudget(max_nodes=1000)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda obj: self.render(obj, render_budget), [list(range(99))] * 8))
+
+        self.assertEqual(render_budget.node_count, 800)
+        self.assertEqual(render_budget.truncated_count, 0)
+
+    @patch.multiple(dump_die, MAX_RENDER_NODES=3, MAX_RENDER_BYTES=None, MAX_RENDER_TIME=None)
+    def test_page_report(self):
+        """Verify the dd page reports truncated output."""
+        object_info = (None, None, [{'css_class': 'dumped_name', 'value': 'sample'}], [1, 2, 3, 4], None, None, None, None)
+        with override_settings(DEBUG=True):
+            content = ' '.join(dd_view(RequestFactory().get('/'), [object_info]).content.decode().split())
+
+        self.assertEqual(content.count('>Truncated</span>'), 2)
+        self.assertIn('Output truncated by DJANGO_DD_MAX_RENDER_NODES. 2 values not output', content)
@@ -0,0 +1,650 @@
+"""
+Tests for DumpDie utility functions.
+"""
+
+# System Imports.
+import copy
+import datetime
+import inspect
+import json
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Third-Party Imports.
+from django.contrib.auth.models import Group, Permission, User
+from django.http import QueryDict
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.utils.functional import SimpleLazyObject, cached_property
+
+# Internal Imports.
+from django_dump_die import middleware, utils
+from django_dump_die.renderers import render_dump_objects
+from django_dump_die.templatetags import dump_die
+from django_dump_die.views.dd_view import dd_view
+from django_dump_die.views.example_helpers import SampleEnum, SimpleClass
+
+
+@patch.dict(utils.type_category_map, clear=True)
+class TypeCategoryTestCase(SimpleTestCase):
+    """Verify type classification, and its memoization."""
+
+    def test_categories(self):
+        """Verify objects are given the expected display kind and container shape."""
+        expected = (
+            (None, (utils.TYPE_SIMPLE, utils.SHAPE_OTHER)),
+            ('test string', (utils.TYPE_SIMPLE, utils.SHAPE_OTHER)),
+            (23, (utils.TYPE_SIMPLE, utils.SHAPE_OTHER)),
+            (datetime.date(2022, 8, 1), (utils.TYPE_INTERMEDIATE, utils.SHAPE_OTHER)),
+            (bytearray(b'test'), (utils.TYPE_INTERMEDIATE, utils.SHAPE_SEQUENCE)),
+            (User.objects.all(), (utils.TYPE_COMPLEX, utils.SHAPE_QUERY)),
+            ({'a': 1}, (utils.TYPE_COMPLEX, utils.SHAPE_DICT)),
+            (OrderedDict(a=1), (utils.TYPE_COMPLEX, utils.SHAPE_DICT)),
+            (QueryDict('a=1'), (utils.TYPE_COMPLEX, utils.SHAPE_DICT)),
+            ({1, 2}, (utils.TYPE_COMPLEX, utils.SHAPE_SET)),
+            (frozenset({1, 2}), (utils.TYPE_COMPLEX, utils.SHAPE_SET)),
+            ([1, 2], (utils.TYPE_COMPLEX, utils.SHAPE_SEQUENCE)),
+            ((1, 2), (utils.TYPE_COMPLEX, utils.SHAPE_SEQUENCE)),
+            (SampleEnum.RED, (utils.TYPE_COMPLEX, utils.SHAPE_ENUM)),
+            (SimpleClass(), (utils.TYPE_COMPLEX, utils.SHAPE_OTHER)),
+            (dict, (utils.TYPE_COMPLEX, utils.SHAPE_DICT)),
+            (SimpleClass, (utils.TYPE_COMPLEX, utils.SHAPE_OTHER)),
+        )
+        for obj, category in expected:
+            with self.subTest(obj=obj):
+                self.assertEqual(utils.get_type_category(obj), category)
+                # Verify the memoized answer matches.
+                self.assertEqual(utils.get_type_category(obj), category)
+
+    def test_determined_once_per_type(self):
+        """Verify category is only determined for the first object of each type."""
+        with patch.object(
+            utils,
+            '_determine_type_category',
+            wraps=utils._determine_type_category,
+        ) as mocked_determine:
+            for index in range(10):
+                utils.get_type_category(SimpleClass())
+                utils.get_type_category([index])
+                utils.get_type_category({'index': index})
+
+        self.assertEqual(mocked_determine.call_count, 3)
+        self.assertIn(SimpleClass, utils.type_category_map)
+        self.assertIn(list, utils.type_category_map)
+
+    def test_instance_attributes_ignored(self):
+        """Verify the memoized category of a type does not depend on the attributes of its first instance."""
+        dict_like_namespace = SimpleNamespace(items=[1], keys=[2], values=[3])
+        namespace = SimpleNamespace(name='sample_name')
+
+        self.assertEqual(utils.get_type_category(dict_like_namespace).shape, utils.SHAPE_OTHER)
+        self.assertEqual(utils.get_type_category(namespace).shape, utils.SHAPE_OTHER)
+
+        output = render_dump_objects([(None, None, None, namespace, None, None, None, None)])
+        self.assertNotIn('EXCEPTION', output)
+        self.assertIn('sample_name', output)
+
+    def test_custom_dir_not_memoized(self):
+        """Verify objects with a custom dir() are determined individually, by what they wrap."""
+        lazy_dict = SimpleLazyObject(lambda: {'a': 1})
+        lazy_instance = SimpleLazyObject(SimpleClass)
+
+        self.assertEqual(utils.get_type_category(lazy_dict).shape, utils.SHAPE_DICT)
+        self.assertEqual(utils.get_type_category(lazy_instance).shape, utils.SHAPE_OTHER)
+        self.assertNotIn(SimpleLazyObject, utils.type_category_map)
+
+
+class ModelMembersTestCase(TestCase):
+    """Verify model instance members are determined without database queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = Group.objects.create(name='sample_group')
+        cls.user = User.objects.create(username='sample_user')
+        cls.user.groups.add(cls.group)
+
+    def test_unloaded_relations_excluded(self):
+        """Verify unloaded relations are excluded, with foreign keys shown by PK value."""
+        permission = Permission.objects.first()
+
+        with self.assertNumQueries(0):
+            members = dict(utils.get_members(permission))
+
+        self.assertEqual(members['content_type_id'], permission.content_type_id)
+        self.assertEqual(members['codename'], permission.codename)
+        self.assertNotIn('content_type', members)
+        self.assertNotIn('group_set', members)
+        self.assertNotIn('user_set', members)
+
+    def test_loaded_relations_included(self):
+        """Verify relations that are already loaded are included."""
+        permission = Permission.objects.select_related('content_type').first()
+        user = User.objects.prefetch_related('groups').get(pk=self.user.pk)
+
+        with self.assertNumQueries(0):
+            permission_members = dict(utils.get_members(permission))
+            user_members = dict(utils.get_members(user))
+
+        self.assertEqual(permission_members['content_type'], permission.content_type)
+        self.assertEqual(list(user_members['groups']), [self.group])
+
+    def test_deferred_fields_excluded(self):
+        """Verify deferred fields are not loaded."""
+        user = User.objects.only('username').get(pk=self.user.pk)
+
+        with self.assertNumQueries(0):
+            members = dict(utils.get_members(user))
+
+        self.assertEqual(members['username'], 'sample_user')
+        self.assertNotIn('email', members)
+
+    def test_expand_model_relations(self):
+        """Verify all relations are included when expanding model relations."""
+        permission = Permission.objects.first()
+
+        with patch.object(utils, 'EXPAND_MODEL_RELATIONS', True):
+            members = dict(utils.get_members(permission))
+
+        self.assertIn('content_type', members)
+        self.assertIn('group_set', members)
+
+
+class QueryCounterTestCase(TestCase):
+    """Verify queries triggered by dumping are counted and reported."""
+
+    def test_query_counter(self):
+        """Verify queries are only counted within the context."""
+        with utils.QueryCounter() as query_counter:
+            list(User.objects.all())
+            Group.objects.count()
+        list(User.objects.all())
+
+        self.assertEqual(query_counter.count, 2)
+
+    def test_dd_view_reports_queries(self):
+        """Verify the dd page reports queries triggered by dumping."""
+        request = RequestFactory().get('/')
+        objects = [(None, None, [], Permission.objects.first(), None, None, None, None)]
+
+        response = dd_view(request, objects)
+        self.assertNotIn('Dump triggered', response.content.decode())
+
+        with patch.object(utils, 'EXPAND_MODEL_RELATIONS', True):
+            response = dd_view(request, objects)
+        self.assertIn('Dump triggered', response.content.decode())
+
+
+def dump(obj):
+    """Stand-in for dump(), with the same call depth down to get_dumped_object_name_and_location()."""
+    return utils.get_dumped_object_info(obj)
+
+
+@patch.dict(utils.call_site_text_cache, clear=True)
+@patch.dict(utils.object_name_cache, clear=True)
+class CallSiteCacheTestCase(SimpleTestCase):
+    """Verify dumped object names are resolved once per call site."""
+
+    def test_names_per_call_site(self):
+        """Verify each call site keeps its own name, including repeat calls from within a loop."""
+        sample_list = [1, 2]
+        sample_dict = {'a': 1}
+
+        names = []
+        for _ in range(3):
+            list_info = dump(sample_list)
+            dict_info = dump(sample_dict)
+            names.extend((list_info[2], dict_info[2]))
+
+        self.assertEqual(len(utils.call_site_text_cache), 2)
+        self.assertEqual(names[0], [{'css_class': 'dumped_name', 'value': 'sample_list'}])
+        self.assertEqual(names[1], [{'css_class': 'dumped_name', 'value': 'sample_dict'}])
+        self.assertEqual(names[0::2], [names[0]] * 3)
+        self.assertEqual(names[1::2], [names[1]] * 3)
+
+    @patch.object(utils, 'CALL_SITE_CACHE_SIZE', 2)
+    def test_cache_size(self):
+        """Verify call site caches only keep the most recently used entries."""
+        sample_list = [1, 2]
+        sample_dict = {'a': 1}
+        sample_set = {1, 2}
+
+        dump(sample_list)
+        dump(sample_dict)
+        dump(sample_list)
+        dump(sample_set)
+
+        self.assertEqual(len(utils.call_site_text_cache), 2)
+        self.assertEqual(len(utils.object_name_cache), 2)
+        self.assertEqual(
+            [cache_entry[2] for cache_entry in utils.call_site_text_cache.values()],
+            ['sample_list', 'sample_set'],
+        )
+
+    @patch.object(utils, 'CALL_SITE_CACHE_SIZE', 0)
+    def test_cache_disabled(self):
+        """Verify nothing is cached with a cache size of 0."""
+        sample_list = [1, 2]
+        list_info = dump(sample_list)
+
+        self.assertEqual(list_info[2], [{'css_class': 'dumped_name', 'value': 'sample_list'}])
+        self.assertEqual(len(utils.call_site_text_cache), 0)
+        self.assertEqual(len(utils.object_name_cache), 0)
+
+    def test_callable_names(self):
+        """Verify callables at a shared call site each still get their own signature."""
+        names = []
+        for sample_func in (lambda: None, lambda value: value):
+            func_info = dump(sample_func)
+            names.append(''.join(entry['value'] for entry in func_info[2]))
+
+        self.assertEqual(names, ['sample_func()', 'sample_func(value)'])
+
+    def test_source_checked_once_per_interval(self):
+        """Verify repeat dumps from a call site only check the source file once per interval."""
+        sample_list = [1, 2]
+        with patch.object(utils, '_get_mtime', wraps=utils._get_mtime) as mocked_get_mtime:
+            for _ in range(4):
+                dump(sample_list)
+            # Only the first, uncached dump checks the source file.
+            self.assertEqual(mocked_get_mtime.call_count, 1)
+
+            mocked_get_mtime.reset_mock()
+            with patch.object(utils, 'SOURCE_CHECK_INTERVAL', 0):
+                for _ in range(4):
+                    dump(sample_list)
+            # Once the interval has passed, each repeat dump checks the source file again.
+            self.assertEqual(mocked_get_mtime.call_count, 4)
+
+    @patch.dict(utils.call_index_cache, clear=True)
+    @patch.object(utils, 'SOURCE_CHECK_INTERVAL', 0)
+    def test_modified_source_invalidates(self):
+        """Verify cached names are resolved again, once the source file has been modified."""
+        sample_list = [1, 2]
+        original_get_mtime = utils._get_mtime
+        with patch.object(utils, '_index_dump_calls', wraps=utils._index_dump_calls) as mocked_index:
+            for _ in range(2):
+                dump(sample_list)
+            self.assertEqual(mocked_index.call_count, 1)
+
+            # Simulate the file being modified since the name was cached.
+            with patch.object(utils, '_get_mtime', side_effect=lambda filename: original_get_mtime(filename) + 1):
+                for _ in range(2):
+                    list_info = dump(sample_list)
+            self.assertEqual(mocked_index.call_count, 2)
+            self.assertEqual(list_info[2], [{'css_class': 'dumped_name', 'value': 'sample_list'}])
+
+
+class DumpCallIndexTestCase(SimpleTestCase):
+    """Verify dumped object names are extracted from parsed source."""
+
+    def get_indexed_text(self, source, module_globals=None):
+        """Index source, returning the dumped text of each call in source order."""
+        call_index = utils._index_dump_calls(source, module_globals)
+        calls = sorted({call for calls in call_index.values() for call in calls})
+        return [call[4] for call in calls]
+
+    def test_single_line_calls(self):
+        """Verify calls are indexed, with only the dumped object argument."""
+        source = (
+            "dump(sample_list)\n"
+            "dd(sample_list, index_range=(0, 5), deepcopy=True)\n"
+            "middleware.dump(sample_dict['key'])\n"
+            "dump(obj=sample_obj)\n"
+            "print(sample_list)\n"
+        )
+        self.assertEqual(
+            self.get_indexed_text(source, {'middleware': middleware}),
+            ['sample_list', 'sample_list', "sample_dict['key']", 'sample_obj'],
+        )
+
+    def test_other_dump_functions(self):
+        """Verify only names that refer to dump/dd are indexed, such as aliased imports, but not json.dump()."""
+        source = (
+            "json.dump(sample_list, file)\n"
+            "self.dump(sample_list)\n"
+            "dump_alias(sample_dict)\n"
+            "dd(sample_obj)\n"
+        )
+        module_globals = {'json': json, 'dump_alias': middleware.dump}
+        self.assertEqual(self.get_indexed_text(source, module_globals), ['sample_dict', 'sample_obj'])
+
+        # Verify the builtin names are not indexed when imported from elsewhere.
+        self.assertEqual(self.get_indexed_text(source, {'json': json, 'dd': json.dump}), [])
+
+    def test_multiple_calls_per_line(self):
+        """Verify multiple and nested calls on the same line are each indexed."""
+        self.assertEqual(self.get_indexed_text("dump(first); dump(second)\n"), ['first', 'second'])
+        self.assertEqual(self.get_indexed_text("dump(dd(sample_list))\n"), ['dd(sample_list)', 'sample_list'])
+
+    def test_multi_line_calls(self):
+        """Verify calls spanning multiple lines are indexed for each line, with whitespace collapsed."""
+        source = (
+            "dump(\n"
+            "    sample_func(\n"
+            "        'a', ')',\n"
+            "    ),\n"
+            "    deepcopy=True,\n"
+            ")\n"
+        )
+        call_index = utils._index_dump_calls(source)
+
+        self.assertEqual(sorted(call_index), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(call_index[3][0][4], "sample_func( 'a', ')', )")
+
+    def test_invalid_source(self):
+        """Verify source that cannot be parsed gives an empty index."""
+        self.assertEqual(utils._index_dump_calls("dump(sample_list\n"), {})
+
+    @patch.dict(utils.call_site_text_cache, clear=True)
+    @patch.dict(utils.object_name_cache, clear=True)
+    def test_ambiguous_call_falls_back(self):
+        """Verify multiple calls on a line fall back to parsing the line, when the executing call is unknown."""
+        sample_list = [1, 2]
+        with patch.object(utils, '_get_frame_position', return_value=None):
+            with patch.object(utils, '_parse_dumped_text', return_value='parsed') as mocked_parse:
+                first_info, second_info = dump([1]), dump(sample_list)
+
+        self.assertEqual(mocked_parse.call_count, 2)
+        self.assertEqual(second_info[2], [{'css_class': 'dumped_name', 'value': 'parsed'}])
+        self.assertEqual(first_info[2], second_info[2])
+
+    @patch.dict(utils.call_site_text_cache, clear=True)
+    @patch.dict(utils.object_name_cache, clear=True)
+    def test_dumped_names(self):
+        """Verify names of dumps called from source, including multiple calls on the same line."""
+        sample_list = [1, 2]
+        sample_dict = {'a': 1}
+
+        list_info, dict_info = dump(sample_list), dump(sample_dict)
+        nested_info = dump(
+            dump(sample_list),
+        )
+
+        self.assertEqual(list_info[2], [{'css_class': 'dumped_name', 'value': 'sample_list'}])
+        self.assertEqual(dict_info[2], [{'css_class': 'dumped_name', 'value': 'sample_dict'}])
+        self.assertEqual(
+            ''.join(entry['value'] for entry in nested_info[2]),
+            'dump(sample_list)',
+        )
+
+
+@patch.multiple(utils, MAX_RECURSION_DEPTH=3, MAX_ITERABLE_LENGTH=5)
+class SnapshotTestCase(SimpleTestCase):
+    """Verify snapshots only copy what is output."""
+
+    def test_depth_limit(self):
+        """Verify values are copied down to the max recursion depth, and kept as references past it."""
+        sample_list = [[[['past depth']]]]
+        snapshot = utils.snapshot_object(sample_list)
+
+        self.assertEqual(snapshot, sample_list)
+        self.assertIsNot(snapshot, sample_list)
+        self.assertIsNot(snapshot[0], sample_list[0])
+        self.assertIsNot(snapshot[0][0], sample_list[0][0])
+        self.assertIs(snapshot[0][0][0], sample_list[0][0][0])
+
+    def test_iterable_length_limit(self):
+        """Verify entries are copied up to the max iterable length, and kept as references past it.
+
+        Dict values are all output regardless of the max iterable length, so are all copied.
+        """
+        sample_list = [[index] for index in range(8)]
+        sample_dict = {index: [index] for index in range(8)}
+
+        list_snapshot = utils.snapshot_object(sample_list)
+        dict_snapshot = utils.snapshot_object(sample_dict)
+
+        self.assertEqual(list_snapshot, sample_list)
+        self.assertEqual(dict_snapshot, sample_dict)
+        for index in range(8):
+            self.assertEqual(list_snapshot[index] is sample_list[index], index >= 5)
+            self.assertIsNot(dict_snapshot[index], sample_dict[index])
+
+    def test_root_index_range(self):
+        """Verify root entries are copied within the root index range, even past the max iterable length."""
+        sample_list = [[index] for index in range(20)]
+
+        snapshot = utils.snapshot_object(sample_list, 10, 14)
+        negative_snapshot = utils.snapshot_object(sample_list, -3)
+
+        for index in range(20):
+            self.assertEqual(snapshot[index] is sample_list[index], not 10 <= index < 14)
+            self.assertEqual(negative_snapshot[index] is sample_list[index], index < 17)
+
+    def test_unchanged_tuple(self):
+        """Verify tuples with no copied entries are kept as-is, the same as a deepcopy."""
+        sample_tuple = ('A', 'B', 'C')
+        nested_tuple = ('A', ['B'])
+
+        snapshot = utils.snapshot_object([sample_tuple, nested_tuple])
+
+        self.assertIs(snapshot[0], sample_tuple)
+        self.assertIsNot(snapshot[1], nested_tuple)
+        self.assertIs(copy.deepcopy(sample_tuple), sample_tuple)
+
+    @patch.object(utils, 'DEEPCOPY_MODE', 'snapshot')
+    def test_mutated_past_limit(self):
+        """Verify values past the max iterable length, that are still output, show their state at dump time."""
+        sample_dict = {f'k{index}': f'v{index}' for index in range(30)}
+        sample_dict['nested'] = {'key': 'initial'}
+        sample_list = [[index] for index in range(20)]
+        dict_info = utils.get_dumped_object_info(sample_dict, deepcopy=True)
+        list_info = utils.get_dumped_object_info(sample_list, index_range=(15, 20), deepcopy=True)
+
+        sample_dict['k25'] = 'MUTATED'
+        sample_dict['nested']['key'] = 'MUTATED'
+        sample_list[18].append('MUTATED')
+
+        output = render_dump_objects([dict_info, list_info])
+        self.assertNotIn('MUTATED', output)
+        self.assertIn('v25', output)
+
+    def test_deeply_nested(self):
+        """Verify values nested past the recursion limit are still copied."""
+        sample_list = current_list = []
+        for _ in range(sys.getrecursionlimit() * 2):
+            current_list.append([])
+            current_list = current_list[0]
+
+        with patch.object(utils, 'MAX_RECURSION_DEPTH', None):
+            snapshot = utils.snapshot_object(sample_list)
+
+        current_snapshot, current_list = snapshot, sample_list
+        while current_list:
+            self.assertIsNot(current_snapshot, current_list)
+            current_snapshot, current_list = current_snapshot[0], current_list[0]
+
+    def test_preserves_state(self):
+        """Verify later changes to the original object do not affect the snapshot."""
+        sample_obj = SimpleClass()
+        sample_obj.items = ['initial']
+        sample_obj.sample_int = 1
+        sample_tuple = namedtuple('SampleTuple', ['first', 'second'])(sample_obj, {'key': 'initial'})
+
+        snapshot = utils.snapshot_object(sample_tuple)
+        sample_obj.items.append('appended')
+        sample_obj.sample_int = 2
+        sample_tuple.second['key'] = 'changed'
+
+        self.assertIs(type(snapshot), type(sample_tuple))
+        self.assertEqual(snapshot.first.items, ['initial'])
+        self.assertEqual(snapshot.first.sample_int, 1)
+        self.assertEqual(snapshot.second, {'key': 'initial'})
+
+    def test_shared_and_cyclic_references(self):
+        """Verify shared values are copied once, and cyclic references point to the copy."""
+        shared_list = [1]
+        cyclic_list = [shared_list, shared_list]
+        cyclic_list.append(cyclic_list)
+
+        snapshot = utils.snapshot_object(cyclic_list)
+
+        self.assertIs(snapshot[0], snapshot[1])
+        self.assertIsNot(snapshot[0], shared_list)
+        self.assertIs(snapshot[2], snapshot)
+
+    def test_uncopyable_values(self):
+        """Verify values that cannot be copied are kept as references, rather than raising an error."""
+        sample_obj = SimpleClass()
+        sample_obj.lock = threading.Lock()
+
+        snapshot = utils.snapshot_object(sample_obj)
+
+        self.assertIsNot(snapshot, sample_obj)
+        self.assertIs(snapshot.lock, sample_obj.lock)
+        with self.assertRaises(TypeError):
+            utils.get_dumped_object_info(sample_obj, deepcopy=True)
+        with patch.object(utils, 'DEEPCOPY_MODE', 'snapshot'):
+            object_info = utils.get_dumped_object_info(sample_obj, deepcopy=True)
+        self.assertIs(object_info[7], sample_obj)
+
+    def test_query_dict(self):
+        """Verify QueryDict values keep all values for each key."""
+        sample_query_dict = QueryDict('first=1&first=2&second=3')
+
+        snapshot = utils.snapshot_object(sample_query_dict)
+
+        self.assertEqual(snapshot.getlist('first'), ['1', '2'])
+        self.assertEqual(snapshot.getlist('second'), ['3'])
+
+    def test_output_matches_deepcopy(self):
+        """Verify a snapshot outputs the same as a full deepcopy."""
+        sample_obj = OrderedDict(first=[1, {'nested': (2, [3, [4, [5]]])}], second={'A', 'B'})
+        sample_list = [sample_obj, datetime.datetime(2022, 8, 1), [[index] for index in range(8)], sample_obj]
+
+        outputs = []
+        for copied_list in (copy.deepcopy(sample_list), utils.snapshot_object(sample_list)):
+            with dump_die.render_scope():
+                outputs.append(render_dump_objects([(None, None, [], copied_list, None, None, None, sample_list)]))
+
+        self.assertEqual(outputs[0], outputs[1])
+
+    @patch.object(utils, 'DEEPCOPY_MODE', 'unknown')
+    def test_invalid_mode(self):
+        """Verify an unknown deepcopy mode raises an error."""
+        with self.assertRaises(ValueError):
+            utils.get_dumped_object_info([1], deepcopy=True)
+
+
+class GuardedClass:
+    """Class with a mix of descriptor and non-descriptor attributes, for attribute guard tests."""
+    __slots__ = ('slot_value', 'property_calls', '__dict__')
+
+    class_value = 'class_value'
+
+    def __init__(self):
+        self.slot_value = 'slot_value'
+        self.instance_value = 'instance_value'
+        self.property_calls = 0
+
+    @property
+    def sample_property(self):
+        self.property_calls += 1
+        return 'property_value'
+
+    @cached_property
+    def sample_cached_property(self):
+        return 'cached_property_value'
+
+    def sample_method(self):
+        pass
+
+    @staticmethod
+    def sample_static_method():
+        pass
+
+    @classmethod
+    def sample_class_method(cls):
+        pass
+
+
+class AttributeGuardTestCase(SimpleTestCase):
+    """Verify attribute access guarding, for descriptor types and slow attributes."""
+
+    def get_guarded_members(self, obj, **kwargs):
+        """Get members of an object through a new attribute guard."""
+        return dict(utils.get_members(obj, utils.AttributeGuard(**kwargs)))
+
+    def test_no_limits(self):
+        """Verify members match inspect.getmembers() when nothing is excluded."""
+        obj = GuardedClass()
+        expected_members = inspect.getmembers(obj)
+        obj.property_calls = 0
+
+        self.assertEqual(list(self.get_guarded_members(obj).items()), expected_members)
+
+    def test_denylist(self):
+        """Verify attributes from denied descriptor types are not evaluated."""
+        obj = GuardedClass()
+        members = self.get_guarded_members(obj, denylist=['cached_property'])
+
+        self.assertIsInstance(members['sample_cached_property'], utils.UnevaluatedAttribute)
+        self.assertEqual(members['sample_cached_property'].setting, 'DJANGO_DD_DESCRIPTOR_DENYLIST')
+        self.assertNotIn('sample_cached_property', obj.__dict__)
+        self.assertEqual(members['sample_property'], 'property_value')
+
+        # Already computed values are read directly.
+        obj.sample_cached_property
+        members = self.get_guarded_members(obj, denylist=['cached_property'])
+        self.assertEqual(members['sample_cached_property'], 'cached_property_value')
+
+    def test_allowlist(self):
+        """Verify only attributes from allowed descriptor types are evaluated, along with all regular members."""
+        obj = GuardedClass()
+        members = self.get_guarded_members(obj, allowlist=['property'])
+
+        self.assertIsInstance(members['sample_cached_property'], utils.UnevaluatedAttribute)
+        self.assertEqual(members['sample_cached_property'].setting, 'DJANGO_DD_DESCRIPTOR_ALLOWLIST')
+        self.assertEqual(members['sample_property'], 'property_value')
+        self.assertEqual(members['slot_value'], 'slot_value')
+        self.assertEqual(members['instance_value'], 'instance_value')
+        self.assertEqual(members['class_value'], 'class_value')
+        self.assertTrue(callable(members['sample_method']))
+        self.assertTrue(callable(members['sample_static_method']))
+        self.assertTrue(callable(members['sample_class_method']))
+
+    def test_time_limit(self):
+        """Verify attributes over the time limit are not evaluated again for other instances of the same class."""
+        first_obj, second_obj = GuardedClass(), GuardedClass()
+        attribute_guard = utils.AttributeGuard(time_limit=50)
+
+        # Compute cached properties up front, so that the property is the only guarded read.
+        first_obj.sample_cached_property
+        second_obj.sample_cached_property
+
+        # Reading the property takes 100 milliseconds.
+        clock = iter([0, 0.1] + [0.1] * 100)
+        with patch.object(utils, 'time', SimpleNamespace(perf_counter=lambda: next(clock))):
+            first_members = dict(utils.get_members(first_obj, attribute_guard))
+            second_members = dict(utils.get_members(second_obj, attribute_guard))
+
+        self.assertEqual(first_members['sample_property'], 'property_value')
+        self.assertEqual(first_members['sample_cached_property'], 'cached_property_value')
+        self.assertEqual(attribute_guard.slow_attributes, {(GuardedClass, 'sample_property'): 100})
+
+        self.assertIsInstance(second_members['sample_property'], utils.UnevaluatedAttribute)
+        self.assertEqual(second_members['sample_property'].elapsed, 100)
+        self.assertEqual(second_members['sample_property'].setting, 'DJANGO_DD_ATTRIBUTE_TIME_LIMIT')
+        self.assertEqual(second_obj.property_calls, 0)
+        self.assertEqual(second_members['sample_cached_property'], 'cached_property_value')
+
+    def test_output(self):
+        """Verify unevaluated attributes are output as not evaluated, without a load link outside of a dd page."""
+        obj = GuardedClass()
+        with patch.multiple(
+            dump_die,
+            ATTRIBUTE_GUARD_ENABLED=True,
+            DESCRIPTOR_DENYLIST=['property'],
+        ):
+            with dump_die.render_scope():
+                output = render_dump_objects([
+                    (None, None, [{'css_class': 'dumped_name', 'value': 'obj'}], obj, None, None, None, None),
+                ])
+
+        self.assertIn('not evaluated', output)
+        self.assertIn('Not evaluated, due to DJANGO_DD_DESCRIPTOR_DENYLIST.', output)
+        self.assertNotIn('data-load-token', output)
+        self.assertNotIn('&#x27;property_value', output)
+        self.assertEqual(obj.property_calls, 0)
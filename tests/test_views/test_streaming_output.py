@@ -0,0 +1,120 @@
+"""
+Tests for streamed DD page output.
+"""
+
+# System Imports.
+import threading
+import warnings
+from unittest.mock import patch
+
+# Third-Party Imports.
+from django.contrib.auth.models import User
+from django.http import StreamingHttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+
+# Internal Imports.
+from django_dump_die.views.dd_view import _render_objects, dd_view
+from django_dump_die.views.example_helpers import SimpleClass
+from tests.helpers import build_object_info, normalize_whitespace
+
+
+class WaitingPropertyClass:
+    """Class with a property that waits for an event to be set, and records if it was set in time."""
+
+    def __init__(self, event):
+        self.event = event
+        self.event_set_results = []
+
+    @property
+    def waiting_value(self):
+        self.event_set_results.append(self.event.wait(timeout=5))
+        return 'waiting_value'
+
+
+@override_settings(DEBUG=True, DJANGO_DD_STREAM_OUTPUT=True)
+class StreamingOutputTestCase(TestCase):
+    """Verify the dd page is sent in parts, with each dumped object sent once rendered."""
+
+    def setUp(self):
+        self.sample_obj = SimpleClass()
+        self.sample_list = [1, [2, self.sample_obj]]
+        self.objects = [
+            build_object_info(self.sample_obj),
+            build_object_info(self.sample_list, 'sample_list'),
+            build_object_info(self.sample_obj),
+        ]
+
+    def get_content(self, response):
+        """Get the full page content of a response, streamed or not."""
+        if isinstance(response, StreamingHttpResponse):
+            return b''.join(response.streaming_content).decode()
+        return response.content.decode()
+
+    def test_matches_full_page(self):
+        """Verify streamed output is the same as the full page, for both renderers."""
+        for renderer in ('template', 'python'):
+            with self.subTest(renderer=renderer), override_settings(DJANGO_DD_RENDERER=renderer):
+                streamed_response = dd_view(RequestFactory().get('/'), self.objects)
+                with override_settings(DJANGO_DD_STREAM_OUTPUT=False):
+                    full_response = dd_view(RequestFactory().get('/'), self.objects)
+
+                self.assertIsInstance(streamed_response, StreamingHttpResponse)
+                self.assertNotIsInstance(full_response, StreamingHttpResponse)
+                self.assertEqual(
+                    normalize_whitespace(self.get_content(streamed_response)),
+                    normalize_whitespace(self.get_content(full_response)),
+                )
+
+    def test_objects_rendered_as_sent(self):
+        """Verify the page start is sent before any object is rendered, and each object is rendered once needed."""
+        with patch('django_dump_die.views.dd_view._render_objects', wraps=_render_objects) as mocked_render:
+            parts = iter(dd_view(RequestFactory().get('/'), self.objects).streaming_content)
+
+            first_part = next(parts).decode()
+            self.assertIn('<div class="dump-toolbar">', first_part)
+            self.assertNotIn('dump-wrapper', first_part)
+            self.assertEqual(mocked_render.call_count, 0)
+
+            self.assertIn('<span class="dumped_name">sample_obj</span>', next(parts).decode())
+            self.assertEqual(mocked_render.call_count, 1)
+
+            self.assertEqual(next(parts), b'<hr>')
+            self.assertIn('<span class="dumped_name">sample_list</span>', next(parts).decode())
+            self.assertEqual(mocked_render.call_count, 2)
+
+            remaining_parts = b''.join(parts).decode()
+            self.assertEqual(mocked_render.call_count, 3)
+            self.assertTrue(remaining_parts.rstrip().endswith('</html>'))
+
+    def test_query_count(self):
+        """Verify database queries triggered by all dumped objects are reported at the end of the page."""
+        User.objects.create(username='test_user')
+        objects = [build_object_info(User.objects.all()), build_object_info(User.objects.filter(pk__gt=0))]
+
+        content = self.get_content(dd_view(RequestFactory().get('/'), objects))
+
+        self.assertIn('Dump triggered 4 database queries', normalize_whitespace(content))
+
+    async def test_asgi_parts_sent_as_rendered(self):
+        """Verify ASGI requests are sent each part once rendered, rather than once the full page is rendered."""
+        event = threading.Event()
+        sample_obj = WaitingPropertyClass(event)
+        objects = [build_object_info(sample_obj), build_object_info(self.sample_list, 'sample_list')]
+
+        with warnings.catch_warnings():
+            # Django warns when an async response has to buffer a sync iterator in full.
+            warnings.simplefilter('error')
+
+            parts = dd_view(AsyncRequestFactory().get('/'), objects).__aiter__()
+            first_part = (await parts.__anext__()).decode()
+            self.assertIn('<div class="dump-toolbar">', first_part)
+            self.assertEqual(sample_obj.event_set_results, [])
+
+            # The object is only rendered once its part is needed, after the first part is already sent.
+            event.set()
+            remaining_parts = b''.join([part async for part in parts]).decode()
+
+        self.assertTrue(sample_obj.event_set_results)
+        self.assertTrue(all(sample_obj.event_set_results))
+        self.assertIn('<span class="dumped_name">sample_list</span>', remaining_parts)
+        self.assertTrue(remaining_parts.rstrip().endswith('</html>'))
@@ -0,0 +1,180 @@
+"""
+Tests for rendering DD page objects on background threads.
+"""
+
+# System Imports.
+import json
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Third-Party Imports.
+from django.contrib.auth.models import Group, User
+from django.test import RequestFactory, TransactionTestCase, override_settings
+
+# Internal Imports.
+from django_dump_die.views.dd_view import _render_objects, dd_view
+from tests.helpers import build_object_info, normalize_whitespace
+
+
+class SampleClass:
+    """Class with a mix of attribute types.
+
+    Has no sets, as a snapshot may list set entries in a different order than the original set.
+    """
+
+    def __init__(self):
+        self.sample_string = 'Sample String Content'
+        self.sample_list = ['A', 12, True]
+        self.sample_dict = {'first': 'A', 'second': [1, 2]}
+        self.sample_tuple = ('A', 12, None)
+        self.sample_nested = SimpleNamespace(sample_int=42)
+
+
+class QueryPropertyClass:
+    """Class with a property that queries the database, without holding any model instances or queries."""
+
+    @property
+    def user_count(self):
+        """Number of users in the database."""
+        return User.objects.count()
+
+
+@override_settings(DEBUG=True, DJANGO_DD_RENDER_THREADS=4)
+class ThreadedRenderTestCase(TransactionTestCase):
+    """Verify dumped objects rendered on background threads give the same page as rendering on the request thread."""
+
+    def setUp(self):
+        self.sample_obj = SampleClass()
+        self.sample_list = [1, [2, self.sample_obj]]
+        self.objects = [
+            build_object_info(self.sample_obj),
+            build_object_info(self.sample_list, 'sample_list'),
+            build_object_info(self.sample_obj),
+            build_object_info({'key': self.sample_list}, 'sample_dict'),
+        ]
+
+    def get_content(self, **headers):
+        """Get the dd page content for all objects, rendered with and without threads."""
+        threaded_content = dd_view(RequestFactory().get('/', **headers), self.objects).content.decode()
+        with override_settings(DJANGO_DD_RENDER_THREADS=None):
+            content = dd_view(RequestFactory().get('/', **headers), self.objects).content.decode()
+        return threaded_content, content
+
+    def test_matches_request_thread(self):
+        """Verify threaded output is the same as rendering on the request thread, including repeat dump counts."""
+        for renderer in ('template', 'python'):
+            with self.subTest(renderer=renderer), override_settings(DJANGO_DD_RENDERER=renderer):
+                threaded_content, content = self.get_content()
+
+                self.assertEqual(normalize_whitespace(threaded_content), normalize_whitespace(content))
+                self.assertIn('_1', threaded_content)
+
+        threaded_content, content = self.get_content(HTTP_ACCEPT='application/json')
+        self.assertEqual(json.loads(threaded_content), json.loads(content))
+
+    def test_rendered_on_background_threads(self):
+        """Verify objects are rendered off the request thread, with repeat dumps of an object on the same thread."""
+        render_threads = []
+        rendered_objects = []
+
+        def record_thread(objects, renderer):
+            render_threads.append((objects[0][2][0]['value'], threading.current_thread()))
+            rendered_objects.append(objects[0][3])
+            return _render_objects(objects, renderer)
+
+        with patch('django_dump_die.views.dd_view._render_objects', side_effect=record_thread):
+            dd_view(RequestFactory().get('/'), self.objects)
+
+        self.assertEqual(len(render_threads), 4)
+        self.assertNotIn(threading.current_thread(), [thread for _, thread in render_threads])
+        sample_obj_threads = {thread for name, thread in render_threads if name == 'sample_obj'}
+        self.assertEqual(len(sample_obj_threads), 1)
+
+        # Background threads only render snapshots, never the dumped objects themselves.
+        for rendered_object in rendered_objects:
+            self.assertNotIn(rendered_object, (self.sample_obj, self.sample_list))
+
+    def test_database_objects_on_request_thread(self):
+        """Verify objects that output queries are rendered on the request thread, and all others in the pool."""
+        render_threads = {}
+
+        def record_thread(objects, renderer):
+            render_threads[objects[0][2][0]['value']] = threading.current_thread()
+            return _render_objects(objects, renderer)
+
+        self.objects = [
+            build_object_info({'users': User.objects.all()}, 'sample_query'),
+            build_object_info(self.sample_obj),
+        ]
+        with patch('django_dump_die.views.dd_view._render_objects', side_effect=record_thread):
+            dd_view(RequestFactory().get('/'), self.objects)
+
+        self.assertEqual(render_threads['sample_query'], threading.current_thread())
+        self.assertNotEqual(render_threads['sample_obj'], threading.current_thread())
+
+    def test_queries_rendered_on_request_thread(self):
+        """Verify objects that query the database on a background thread are rendered again on the request thread."""
+        User.objects.create(username='test_user')
+        render_threads = []
+
+        def record_thread(objects, renderer):
+            render_threads.append((objects[0][2][0]['value'], threading.current_thread()))
+            return _render_objects(objects, renderer)
+
+        self.objects = [build_object_info(QueryPropertyClass(), 'query_obj'), build_object_info(self.sample_obj)]
+        with patch('django_dump_die.views.dd_view._render_objects', side_effect=record_thread):
+            dd_view(RequestFactory().get('/'), self.objects)
+
+        # First rendered in the pool, then discarded and rendered again on the request thread.
+        query_obj_threads = [thread for name, thread in render_threads if name == 'query_obj']
+        self.assertEqual(len(query_obj_threads), 2)
+        self.assertNotEqual(query_obj_threads[0], threading.current_thread())
+        self.assertEqual(query_obj_threads[1], threading.current_thread())
+
+        threaded_content, content = self.get_content()
+        self.assertEqual(normalize_whitespace(threaded_content), normalize_whitespace(content))
+        self.assertIn('Dump triggered 1 database query', normalize_whitespace(threaded_content))
+        self.assertNotIn('Database queries are not available', threaded_content)
+
+        threaded_content, content = self.get_content(HTTP_ACCEPT='application/json')
+        self.assertEqual(json.loads(threaded_content), json.loads(content))
+
+    def test_models_rendered_in_pool(self):
+        """Verify model instances that output without any queries are still rendered on background threads."""
+        render_threads = {}
+
+        def record_thread(objects, renderer):
+            render_threads[objects[0][2][0]['value']] = threading.current_thread()
+            return _render_objects(objects, renderer)
+
+        self.objects = [
+            build_object_info(User.objects.create(username='test_user'), 'sample_user'),
+            build_object_info(self.sample_obj),
+        ]
+        with patch('django_dump_die.views.dd_view._render_objects', side_effect=record_thread):
+            dd_view(RequestFactory().get('/'), self.objects)
+
+        self.assertNotEqual(render_threads['sample_user'], threading.current_thread())
+
+        threaded_content, content = self.get_content()
+        self.assertEqual(normalize_whitespace(threaded_content), normalize_whitespace(content))
+        self.assertIn('test_user', threaded_content)
+
+    def test_query_count(self):
+        """Verify database queries of objects rendered on the request thread are reported."""
+        User.objects.create(username='test_user')
+        Group.objects.create(name='test_group')
+        self.objects = [build_object_info(User.objects.all()), build_object_info(Group.objects.all())]
+
+        threaded_content, content = self.get_content()
+
+        self.assertIn('Dump triggered 4 database queries', normalize_whitespace(threaded_content))
+        self.assertIn('test_user', threaded_content)
+        self.assertIn('test_group', threaded_content)
+
+    @override_settings(DJANGO_DD_RENDER_THREADS=0)
+    def test_invalid_threads(self):
+        """Verify an invalid thread count raises an error."""
+        with self.assertRaises(ValueError):
+            dd_view(RequestFactory().get('/'), self.objects)